@@ -0,0 +1,252 @@
+"""Benchmark the run lifecycle on seeded synthetic IRs.
+
+Times ``validate_ir_json``, CP-SAT model build versus solve, ``RunStore``
+create/update/get and the HTTP flow against the stub provider for knapsack,
+assignment, scheduling and set-cover models at several sizes, and prints one
+JSON document. Store it with ``--output`` and check later runs against it with
+``--compare``; the exit status is 1 when any benchmark regresses.
+
+Run with ``PYTHONPATH=src python benchmarks/bench_lifecycle.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import ortools
+
+from ir_generators import GENERATORS, generate_ir
+from optiforge.core.columnar import ir_to_columnar
+from optiforge.core.models import OptimizationModelIR, ProblemSpec, SolverOptions
+from optiforge.core.solver import build_cp_model, solve_cp_model
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+DEFAULT_SIZES = [10, 50, 200]
+
+
+def _timed(function: Callable[[], Any], repeat: int) -> tuple[list[float], Any]:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+    return samples, result
+
+
+def _record(samples: list[float], function: Callable[..., Any], *args: Any) -> Any:
+    started = time.perf_counter()
+    result = function(*args)
+    samples.append(time.perf_counter() - started)
+    return result
+
+
+def _entry(
+    benchmark: str, problem: str, size: int, samples: list[float], **extra: Any
+) -> dict[str, Any]:
+    return {
+        "benchmark": benchmark,
+        "problem": problem,
+        "size": size,
+        "seconds": round(statistics.median(samples), 6),
+        "min_seconds": round(min(samples), 6),
+        **extra,
+    }
+
+
+def bench_model(
+    problem: str, size: int, data: dict[str, Any], args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    samples, ir = _timed(lambda: validate_ir_json(data), args.repeat)
+    shape = {
+        "variables": len(ir.variables),
+        "constraints": len(ir.constraints),
+        "terms": sum(len(constraint.terms) for constraint in ir.constraints),
+    }
+    entries = [_entry("validate_ir_json", problem, size, samples, **shape)]
+    columnar = ir_to_columnar(ir)
+    samples, model = _timed(lambda: build_cp_model(columnar), args.repeat)
+    entries.append(_entry("model_build", problem, size, samples, **shape))
+    options = SolverOptions(num_search_workers=1, random_seed=args.seed)
+    samples, result = _timed(
+        lambda: solve_cp_model(model, columnar.var_names, args.solve_seconds, options),
+        args.repeat,
+    )
+    entries.append(_entry("solve", problem, size, samples, status=result.status, **shape))
+    entries.extend(bench_store(problem, size, ir, result, args))
+    return entries
+
+
+def bench_store(
+    problem: str, size: int, ir: OptimizationModelIR, result: Any, args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    spec = ProblemSpec(text=f"{problem} benchmark")
+    timings: dict[str, list[float]] = {"create": [], "update_ir": [], "update": [], "get": []}
+    with tempfile.TemporaryDirectory() as directory:
+        store = RunStore(f"sqlite:///{Path(directory) / 'bench.db'}")
+        try:
+            for _ in range(args.repeat):
+                run_id = _record(timings["create"], store.create_run, spec, "stub", "stub-model")
+                _record(timings["update_ir"], store.update_run_ir, run_id, ir, "stub", "stub")
+                _record(timings["update"], store.update_run_solution, run_id, result, "solved")
+                _record(timings["get"], store.get_run, run_id)
+        finally:
+            store.close()
+    return [
+        _entry(f"store_{operation}", problem, size, samples)
+        for operation, samples in timings.items()
+    ]
+
+
+def bench_http(
+    irs: list[tuple[str, int, dict[str, Any]]], args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["OPTIFORGE_DATABASE_URL"] = f"sqlite:///{Path(directory) / 'http.db'}"
+        os.environ["OPTIFORGE_PROVIDER"] = "stub"
+        os.environ["OPTIFORGE_SOLVER_MAX_SECONDS"] = str(args.solve_seconds)
+        os.environ["OPTIFORGE_SOLUTION_CACHE_ENABLED"] = "false"
+        os.environ["OPTIFORGE_PROVIDER_CACHE_ENABLED"] = "false"
+        os.environ["OPTIFORGE_LOG_LEVEL"] = "WARNING"
+        from optiforge.api import main
+
+        entries = []
+        with TestClient(main.app) as client:
+            _stub_flow(client, args)
+            samples, _ = _timed(lambda: _stub_flow(client, args), args.repeat)
+            entries.append(_entry("http_stub_flow", "stub", 2, samples))
+            for problem, size, data in irs:
+                samples, _ = _timed(lambda: _ir_flow(client, data, args), args.repeat)
+                entries.append(_entry("http_ir_flow", problem, size, samples))
+        return entries
+
+
+def _stub_flow(client: Any, args: argparse.Namespace) -> None:
+    run_id = _ok(client.post("/api/runs", json={"text": "stub benchmark"}))["id"]
+    _ok(client.post(f"/api/runs/{run_id}/generate"))
+    job = _ok(client.post(f"/api/runs/{run_id}/solve", json=_solve_body(args)))
+    _wait_for_job(client, job["id"])
+    _ok(client.get(f"/api/runs/{run_id}"))
+
+
+def _ir_flow(client: Any, data: dict[str, Any], args: argparse.Namespace) -> None:
+    item = {"ir": data, "solve": True, **_solve_body(args)}
+    result = _ok(client.post("/api/runs/batch", json={"items": [item]}))["items"][0]
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    _wait_for_job(client, result["job"]["id"])
+    _ok(client.get(f"/api/runs/{result['run_id']}"))
+
+
+def _solve_body(args: argparse.Namespace) -> dict[str, Any]:
+    return {"options": {"num_search_workers": 1, "random_seed": args.seed}}
+
+
+def _ok(response: Any) -> dict[str, Any]:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text}")
+    return response.json()
+
+
+def _wait_for_job(client: Any, job_id: str) -> None:
+    while True:
+        job = _ok(client.get(f"/api/jobs/{job_id}"))
+        if job["status"] not in {"queued", "running"}:
+            return
+        time.sleep(0.01)
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float,
+    min_seconds: float,
+) -> list[dict[str, Any]]:
+    reference = {_key(entry): entry for entry in baseline}
+    rows = []
+    for entry in results:
+        previous = reference.get(_key(entry))
+        if previous is None:
+            continue
+        ratio = entry["seconds"] / previous["seconds"] if previous["seconds"] else None
+        slower = entry["seconds"] - previous["seconds"]
+        rows.append(
+            {
+                "benchmark": entry["benchmark"],
+                "problem": entry["problem"],
+                "size": entry["size"],
+                "baseline_seconds": previous["seconds"],
+                "seconds": entry["seconds"],
+                "ratio": None if ratio is None else round(ratio, 3),
+                "regression": slower > min_seconds and (ratio is None or ratio > 1 + tolerance),
+            }
+        )
+    return rows
+
+
+def _key(entry: dict[str, Any]) -> tuple[str, str, int]:
+    return entry["benchmark"], entry["problem"], entry["size"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--problems", nargs="+", choices=sorted(GENERATORS), default=None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--solve-seconds", type=int, default=2)
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="baseline JSON from a previous --output")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    args = parser.parse_args()
+    problems = args.problems or sorted(GENERATORS)
+    irs = [
+        (problem, size, generate_ir(problem, size, args.seed))
+        for problem in problems
+        for size in args.sizes
+    ]
+    results = []
+    for problem, size, data in irs:
+        results.extend(bench_model(problem, size, data, args))
+    if not args.skip_http:
+        results.extend(bench_http(irs, args))
+    report: dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ortools": ortools.__version__,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "solve_seconds": args.solve_seconds,
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare is None:
+        print(json.dumps(report, indent=2))
+        return
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    rows = compare(results, baseline["results"], args.tolerance, args.min_seconds)
+    print(json.dumps({"meta": report["meta"], "comparison": rows}, indent=2))
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Time CP-SAT model construction for synthetic sparse models.
+
+Run with ``PYTHONPATH=src python benchmarks/bench_model_build.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from array import array
+
+from ortools.sat.python import cp_model
+
+from optiforge.core.columnar import OPERATORS, ColumnarIR, columnar_to_ir
+from optiforge.core.solver import build_cp_model
+
+TERMS_PER_ROW = 10
+
+
+def synthetic_model(nonzeros: int, seed: int) -> ColumnarIR:
+    rng = random.Random(seed)
+    rows = max(1, nonzeros // TERMS_PER_ROW)
+    variables = max(TERMS_PER_ROW, nonzeros // TERMS_PER_ROW)
+    col_indices = array("q")
+    coefficients = array("q")
+    row_offsets = array("q", [0])
+    for _ in range(rows):
+        col_indices.extend(rng.sample(range(variables), TERMS_PER_ROW))
+        coefficients.extend([rng.randint(1, 20) for _ in range(TERMS_PER_ROW)])
+        row_offsets.append(len(col_indices))
+    return ColumnarIR(
+        version="1.0",
+        name=f"synthetic_{nonzeros}",
+        description=None,
+        var_names=[f"x{index}" for index in range(variables)],
+        lower_bounds=array("q", [0] * variables),
+        upper_bounds=array("q", [10] * variables),
+        row_offsets=row_offsets,
+        col_indices=col_indices,
+        coefficients=coefficients,
+        rhs=array("q", [rng.randint(20, 200) for _ in range(rows)]),
+        operators=array("b", [rng.randrange(len(OPERATORS)) for _ in range(rows)]),
+        objective_sense="maximize",
+        objective_indices=array("q", range(variables)),
+        objective_coefficients=array("q", [rng.randint(1, 9) for _ in range(variables)]),
+        objective_constant=0,
+    )
+
+
+def legacy_build(ir: ColumnarIR) -> cp_model.CpModel:
+    model = cp_model.CpModel()
+    pydantic_ir = columnar_to_ir(ir)
+    variables = {}
+    for variable in pydantic_ir.variables:
+        variables[variable.name] = model.NewIntVar(
+            variable.lower_bound, variable.upper_bound, variable.name
+        )
+    for constraint in pydantic_ir.constraints:
+        expr = sum(term.coeff * variables[term.var] for term in constraint.terms)
+        if constraint.operator == "<=":
+            model.Add(expr <= constraint.rhs)
+        if constraint.operator == ">=":
+            model.Add(expr >= constraint.rhs)
+        if constraint.operator == "=":
+            model.Add(expr == constraint.rhs)
+    model.Maximize(sum(term.coeff * variables[term.var] for term in pydantic_ir.objective.terms))
+    return model
+
+
+def _timed(function, ir: ColumnarIR) -> float:
+    started = time.perf_counter()
+    function(ir)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--legacy-max-nonzeros", type=int, default=100_000)
+    args = parser.parse_args()
+    for size in args.sizes:
+        ir = synthetic_model(size, args.seed)
+        entry = {
+            "nonzeros": ir.num_nonzeros,
+            "variables": ir.num_variables,
+            "constraints": ir.num_constraints,
+            "build_seconds": round(_timed(build_cp_model, ir), 4),
+            "legacy_build_seconds": None,
+        }
+        if size <= args.legacy_max_nonzeros:
+            entry["legacy_build_seconds"] = round(_timed(legacy_build, ir), 4)
+        print(json.dumps(entry), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Seeded synthetic IR generators for benchmarks.
+
+Each generator takes a size and a seed and returns an IR dict in the JSON form
+accepted by ``validate_ir_json``; the same (problem, size, seed) always yields
+the same IR.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from typing import Any
+
+IRGenerator = Callable[[int, random.Random], dict[str, Any]]
+
+
+def knapsack(size: int, rng: random.Random) -> dict[str, Any]:
+    dimensions = 1 + size // 250
+    names = [f"take_{index}" for index in range(size)]
+    constraints = []
+    for _ in range(dimensions):
+        weights = [rng.randint(1, 50) for _ in names]
+        constraints.append(_row(names, weights, "<=", sum(weights) // 2))
+    values = [rng.randint(1, 100) for _ in names]
+    return _ir(
+        f"knapsack_{size}",
+        [_variable(name, 0, 1) for name in names],
+        constraints,
+        "maximize",
+        names,
+        values,
+    )
+
+
+def assignment(size: int, rng: random.Random) -> dict[str, Any]:
+    names = [[f"assign_{worker}_{task}" for task in range(size)] for worker in range(size)]
+    constraints = []
+    for worker in range(size):
+        constraints.append(_row(names[worker], [1] * size, "=", 1))
+    for task in range(size):
+        column = [names[worker][task] for worker in range(size)]
+        constraints.append(_row(column, [1] * size, "=", 1))
+    flat = [name for row in names for name in row]
+    costs = [rng.randint(1, 100) for _ in flat]
+    return _ir(
+        f"assignment_{size}",
+        [_variable(name, 0, 1) for name in flat],
+        constraints,
+        "minimize",
+        flat,
+        costs,
+    )
+
+
+def scheduling(size: int, rng: random.Random) -> dict[str, Any]:
+    machines = max(2, size // 10)
+    durations = [rng.randint(1, 20) for _ in range(size)]
+    names = [[f"run_{job}_{machine}" for machine in range(machines)] for job in range(size)]
+    variables = [_variable(name, 0, 1) for row in names for name in row]
+    variables.append(_variable("makespan", 0, sum(durations)))
+    constraints = [_row(names[job], [1] * machines, "=", 1) for job in range(size)]
+    for machine in range(machines):
+        column = [names[job][machine] for job in range(size)]
+        constraints.append(_row(column + ["makespan"], durations + [-1], "<=", 0))
+    return _ir(f"scheduling_{size}", variables, constraints, "minimize", ["makespan"], [1])
+
+
+def set_cover(size: int, rng: random.Random) -> dict[str, Any]:
+    sets = max(2, size // 2)
+    names = [f"pick_{index}" for index in range(sets)]
+    members: list[set[int]] = [set() for _ in range(size)]
+    per_set = max(1, size // 20)
+    for index in range(sets):
+        for element in rng.sample(range(size), min(size, per_set)):
+            members[element].add(index)
+    for element in range(size):
+        if not members[element]:
+            members[element].add(rng.randrange(sets))
+    constraints = [
+        _row([names[index] for index in sorted(covering)], [1] * len(covering), ">=", 1)
+        for covering in members
+    ]
+    costs = [rng.randint(1, 20) for _ in names]
+    return _ir(
+        f"set_cover_{size}",
+        [_variable(name, 0, 1) for name in names],
+        constraints,
+        "minimize",
+        names,
+        costs,
+    )
+
+
+GENERATORS: dict[str, IRGenerator] = {
+    "knapsack": knapsack,
+    "assignment": assignment,
+    "scheduling": scheduling,
+    "set_cover": set_cover,
+}
+
+
+def generate_ir(problem: str, size: int, seed: int = 7) -> dict[str, Any]:
+    if problem not in GENERATORS:
+        raise ValueError(f"unknown problem: {problem}")
+    return GENERATORS[problem](size, random.Random(f"{problem}:{size}:{seed}"))
+
+
+def _variable(name: str, lower: int, upper: int) -> dict[str, Any]:
+    return {"name": name, "type": "int", "lower_bound": lower, "upper_bound": upper}
+
+
+def _row(names: list[str], coeffs: list[int], operator: str, rhs: int) -> dict[str, Any]:
+    terms = [{"var": name, "coeff": coeff} for name, coeff in zip(names, coeffs)]
+    return {"type": "linear", "terms": terms, "operator": operator, "rhs": rhs}
+
+
+def _ir(
+    name: str,
+    variables: list[dict[str, Any]],
+    constraints: list[dict[str, Any]],
+    sense: str,
+    objective_names: list[str],
+    objective_coeffs: list[int],
+) -> dict[str, Any]:
+    terms = [
+        {"var": var, "coeff": coeff} for var, coeff in zip(objective_names, objective_coeffs)
+    ]
+    return {
+        "version": "1.0",
+        "name": name,
+        "description": f"Synthetic {name.rsplit('_', 1)[0]} benchmark model",
+        "variables": variables,
+        "constraints": constraints,
+        "objective": {"sense": sense, "terms": terms, "constant": 0},
+    }
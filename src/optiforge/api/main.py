@@ -1,24 +1,144 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import functools
 import logging
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
+from optiforge.core.batch import run_batch
+from optiforge.core.cache import SolutionCache
 from optiforge.core.config import get_settings
-from optiforge.core.models import ProblemSpec, RunRecord
-from optiforge.core.service import create_run, generate_ir, solve_run
-from optiforge.core.storage import RunStore
+from optiforge.core.ir_cache import IRCache
+from optiforge.core.jobs import SolveJobQueue
+from optiforge.core.metrics import MetricsRegistry
+from optiforge.core.models import (
+    BatchRequest,
+    BatchResponse,
+    ProblemSpec,
+    RunPage,
+    RunRecord,
+    RunStatus,
+    SolveJob,
+    SolveRequest,
+    Sweep,
+    SweepRequest,
+    SweepScenarioPage,
+    TableRowPage,
+    TableSummary,
+)
+from optiforge.core.provider import ProviderRegistry
+from optiforge.core.service import create_run, generate_ir_async
+from optiforge.core.solver_pool import SolverPool, new_solver_pool
+from optiforge.core.storage import RunConflictError, RunStore
+from optiforge.core.sweeps import SweepRunner
+from optiforge.core.tables import TableStore
 
 logging.basicConfig(level=get_settings().log_level)
 
-app = FastAPI(title="OptiForge")
+_STREAM_POLL_SECONDS = 0.25
+_STREAM_KEEPALIVE_SECONDS = 15.0
+_UPLOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    get_job_queue().start()
+    get_sweep_runner().start()
+    yield
+    get_sweep_runner().shutdown()
+    get_job_queue().shutdown()
+    get_solver_pool().shutdown(wait=True, cancel_futures=True)
+    get_provider_registry().close()
+    await get_provider_registry().aclose()
+    cache = get_solution_cache()
+    if cache is not None:
+        cache.close()
+    get_table_store().close()
+    get_store().close()
+
+
+app = FastAPI(title="OptiForge", lifespan=lifespan)
 
 
 @functools.lru_cache(maxsize=1)
 def get_store() -> RunStore:
     settings = get_settings()
-    return RunStore(settings.database_url)
+    return RunStore(
+        settings.database_url,
+        settings.database_busy_timeout_ms,
+        settings.ir_columnar_min_terms,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_table_store() -> TableStore:
+    settings = get_settings()
+    return TableStore(
+        settings.database_url,
+        settings.database_busy_timeout_ms,
+        settings.table_chunk_rows,
+        settings.table_sample_rows,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_provider_registry() -> ProviderRegistry:
+    return ProviderRegistry(get_settings())
+
+
+@functools.lru_cache(maxsize=1)
+def get_ir_cache() -> IRCache | None:
+    settings = get_settings()
+    if not settings.provider_cache_enabled:
+        return None
+    return IRCache(settings.provider_cache_max_entries, settings.provider_cache_ttl_seconds)
+
+
+@functools.lru_cache(maxsize=1)
+def get_solution_cache() -> SolutionCache | None:
+    settings = get_settings()
+    if not settings.solution_cache_enabled:
+        return None
+    return SolutionCache(
+        settings.database_url,
+        settings.solution_cache_max_entries,
+        settings.solution_cache_max_age_seconds,
+        settings.database_busy_timeout_ms,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_metrics() -> MetricsRegistry | None:
+    if not get_settings().metrics_enabled:
+        return None
+    return MetricsRegistry()
+
+
+@functools.lru_cache(maxsize=1)
+def get_solver_pool() -> SolverPool:
+    return new_solver_pool(get_settings())
+
+
+@functools.lru_cache(maxsize=1)
+def get_job_queue() -> SolveJobQueue:
+    settings = get_settings()
+    return SolveJobQueue(
+        settings, get_store(), get_solution_cache(), get_metrics(), get_solver_pool()
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_sweep_runner() -> SweepRunner:
+    return SweepRunner(get_settings(), get_store(), get_solver_pool())
 
 
 @app.get("/health")
@@ -26,44 +146,285 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def metrics_endpoint() -> Response:
+    metrics = get_metrics()
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="metrics are disabled")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/api/runs", response_model=RunRecord)
-def create_run_endpoint(problem_spec: ProblemSpec) -> RunRecord:
+def create_run_endpoint(problem_spec: ProblemSpec) -> Response:
+    settings = get_settings()
+    store = get_store()
+    try:
+        return _json_response(create_run(problem_spec, settings, store, get_table_store()))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.post("/api/runs/batch", response_model=BatchResponse)
+async def batch_runs_endpoint(request: BatchRequest) -> Response:
     settings = get_settings()
+    try:
+        items = await run_batch(
+            request.items,
+            settings,
+            get_store(),
+            get_job_queue(),
+            get_provider_registry(),
+            get_ir_cache(),
+            get_metrics(),
+            get_table_store(),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _json_response(BatchResponse.model_construct(items=items))
+
+
+@app.get("/api/runs", response_model=RunPage)
+def list_runs_endpoint(
+    status: RunStatus | None = None,
+    provider: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    view: Literal["summary", "full"] = "summary",
+) -> Response:
     store = get_store()
     try:
-        return create_run(problem_spec, settings, store)
+        items, next_cursor = store.list_runs(
+            status=status,
+            provider_name=provider,
+            created_after=_utc_iso(created_after),
+            created_before=_utc_iso(created_before),
+            limit=limit,
+            cursor=cursor,
+            full=view == "full",
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _json_response(RunPage.model_construct(items=items, next_cursor=next_cursor))
 
 
 @app.post("/api/runs/{run_id}/generate", response_model=RunRecord)
-def generate_run_endpoint(run_id: str) -> RunRecord:
+async def generate_run_endpoint(run_id: str) -> Response:
     settings = get_settings()
     store = get_store()
     try:
-        return generate_ir(run_id, settings, store)
+        run = await generate_ir_async(
+            run_id,
+            settings,
+            store,
+            get_provider_registry(),
+            get_ir_cache(),
+            get_metrics(),
+            get_table_store(),
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RunConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _json_response(run)
 
 
-@app.post("/api/runs/{run_id}/solve", response_model=RunRecord)
-def solve_run_endpoint(run_id: str) -> RunRecord:
-    settings = get_settings()
-    store = get_store()
+@app.post("/api/runs/{run_id}/solve", response_model=SolveJob, status_code=202)
+def solve_run_endpoint(run_id: str, request: SolveRequest | None = None) -> SolveJob:
+    queue = get_job_queue()
+    options = None
+    warm_start = None
+    if request is not None:
+        options = request.options
+        warm_start = request.warm_start
     try:
-        return solve_run(run_id, settings, store)
+        return queue.submit(run_id, options, warm_start)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.get("/api/runs/{run_id}/solve/stream")
+async def stream_solve_endpoint(
+    run_id: str, last_event_id: int = Header(default=0)
+) -> StreamingResponse:
+    store = get_store()
+    try:
+        job = await asyncio.to_thread(store.latest_job, run_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        _incumbent_events(store, run_id, job.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _incumbent_events(
+    store: RunStore, run_id: str, job_id: str, last_id: int
+) -> AsyncIterator[str]:
+    last_sent = time.monotonic()
+    while True:
+        job = await asyncio.to_thread(store.get_job, job_id)
+        incumbents = await asyncio.to_thread(store.list_incumbents, run_id, job_id, last_id)
+        for event_id, incumbent in incumbents:
+            last_id = event_id
+            yield _sse_event("incumbent", incumbent.model_dump_json(exclude={"variables"}), last_id)
+        if incumbents:
+            last_sent = time.monotonic()
+        if job.status not in {"queued", "running"}:
+            yield _sse_event("done", job.model_dump_json())
+            return
+        if time.monotonic() - last_sent >= _STREAM_KEEPALIVE_SECONDS:
+            last_sent = time.monotonic()
+            yield ": keepalive\n\n"
+        await asyncio.sleep(_STREAM_POLL_SECONDS)
+
+
+def _sse_event(event: str, data: str, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
 @app.get("/api/runs/{run_id}", response_model=RunRecord)
-def get_run_endpoint(run_id: str) -> RunRecord:
+def get_run_endpoint(run_id: str, fields: str | None = None) -> Response:
     store = get_store()
+    selected = None
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+    try:
+        run = store.get_run(run_id, selected)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _json_response(run, include=run.model_fields_set)
+
+
+@app.post("/api/runs/{run_id}/sweeps", response_model=Sweep, status_code=202)
+def create_sweep_endpoint(run_id: str, request: SweepRequest) -> Sweep:
+    runner = get_sweep_runner()
+    try:
+        return runner.submit(run_id, request)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/api/sweeps/{sweep_id}", response_model=Sweep)
+def get_sweep_endpoint(sweep_id: str) -> Sweep:
+    runner = get_sweep_runner()
+    try:
+        return runner.get(sweep_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.get("/api/sweeps/{sweep_id}/scenarios", response_model=SweepScenarioPage)
+def list_sweep_scenarios_endpoint(
+    sweep_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    include_variables: bool = False,
+) -> Response:
+    runner = get_sweep_runner()
+    try:
+        items = runner.scenarios(sweep_id, offset, limit, include_variables)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    next_offset = None
+    if len(items) == limit:
+        next_offset = items[-1].index + 1
+    page = SweepScenarioPage.model_construct(items=items, next_offset=next_offset)
+    return _json_response(page)
+
+
+@app.post("/api/tables", response_model=TableSummary)
+async def upload_table_endpoint(
+    request: Request, format: Literal["csv", "parquet"] = "csv"
+) -> TableSummary:
+    limit = get_settings().table_upload_max_bytes
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"table uploads are limited to {limit} bytes")
+    store = get_table_store()
+    with tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_BYTES) as spool:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise HTTPException(
+                    status_code=413, detail=f"table uploads are limited to {limit} bytes"
+                )
+            await asyncio.to_thread(spool.write, chunk)
+        spool.seek(0)
+        ingest = store.ingest_parquet if format == "parquet" else store.ingest_csv
+        try:
+            return await asyncio.to_thread(ingest, spool)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/api/tables/{table_hash}", response_model=TableSummary)
+def get_table_endpoint(table_hash: str) -> TableSummary:
+    store = get_table_store()
+    try:
+        return store.get_summary(table_hash)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.get("/api/tables/{table_hash}/rows", response_model=TableRowPage)
+def list_table_rows_endpoint(
+    table_hash: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+) -> Response:
+    store = get_table_store()
+    try:
+        columns, rows = store.read_rows(table_hash, offset, limit)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    next_offset = None
+    if len(rows) == limit:
+        next_offset = offset + limit
+    page = TableRowPage.model_construct(columns=columns, rows=rows, next_offset=next_offset)
+    return _json_response(page)
+
+
+@app.get("/api/jobs/{job_id}", response_model=SolveJob)
+def get_job_endpoint(job_id: str) -> SolveJob:
+    queue = get_job_queue()
     try:
-        return store.get_run(run_id)
+        return queue.get(job_id)
     except KeyError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.post("/api/jobs/{job_id}/cancel", response_model=SolveJob)
+def cancel_job_endpoint(job_id: str) -> SolveJob:
+    queue = get_job_queue()
+    try:
+        return queue.cancel(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+def _utc_iso(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _json_response(model: BaseModel, include: set[str] | None = None) -> Response:
+    return Response(content=model.model_dump_json(include=include), media_type="application/json")
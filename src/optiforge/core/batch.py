@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from optiforge.core.columnar import ir_to_columnar
+from optiforge.core.config import Settings
+from optiforge.core.ir_cache import IRCache
+from optiforge.core.jobs import SolveJobQueue
+from optiforge.core.metrics import MetricsRegistry
+from optiforge.core.models import (
+    BatchItem,
+    BatchItemResult,
+    OptimizationModelIR,
+    ProblemSpec,
+)
+from optiforge.core.provider import ProviderRegistry
+from optiforge.core.service import generate_ir_async, resolve_table_refs
+from optiforge.core.storage import RunStore
+from optiforge.core.tables import TableStore
+from optiforge.core.validation import validate_ir_json
+
+
+async def run_batch(
+    items: list[BatchItem],
+    settings: Settings,
+    store: RunStore,
+    queue: SolveJobQueue,
+    providers: ProviderRegistry,
+    ir_cache: IRCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    tables: TableStore | None = None,
+) -> list[BatchItemResult]:
+    if len(items) > settings.batch_max_items:
+        raise ValueError(f"batch exceeds {settings.batch_max_items} items")
+    results: list[dict[str, Any]] = [{"index": index} for index in range(len(items))]
+    irs = await asyncio.to_thread(_validate_irs, items, results)
+    specs = await asyncio.to_thread(_resolve_specs, items, irs, results, tables)
+    created = [index for index, result in enumerate(results) if "error" not in result]
+    entries = [(specs[index], irs[index], items[index].options) for index in created]
+    run_ids = await asyncio.to_thread(
+        store.create_runs, entries, settings.provider, settings.provider_model
+    )
+    for index, run_id in zip(created, run_ids):
+        results[index]["run_id"] = run_id
+        results[index]["status"] = "created" if irs[index] is None else "ir_generated"
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    async def generate(index: int) -> None:
+        async with semaphore:
+            try:
+                run = await generate_ir_async(
+                    results[index]["run_id"],
+                    settings,
+                    store,
+                    providers,
+                    ir_cache,
+                    metrics,
+                    tables,
+                )
+            except Exception as exc:
+                results[index].update(status="error", error=str(exc) or type(exc).__name__)
+                return
+        results[index]["status"] = run.status
+
+    await asyncio.gather(*[generate(index) for index in created if irs[index] is None])
+    solvable = [
+        index
+        for index in created
+        if items[index].solve and results[index]["status"] == "ir_generated"
+    ]
+    jobs = await asyncio.to_thread(
+        queue.submit_many,
+        [
+            (results[index]["run_id"], items[index].warm_start, items[index].options)
+            for index in solvable
+        ],
+    )
+    for index, job in zip(solvable, jobs):
+        results[index]["job"] = job
+    return [BatchItemResult(**result) for result in results]
+
+
+def _validate_irs(
+    items: list[BatchItem], results: list[dict[str, Any]]
+) -> list[OptimizationModelIR | None]:
+    irs: list[OptimizationModelIR | None] = []
+    for item, result in zip(items, results):
+        if item.ir is None:
+            irs.append(None)
+            continue
+        try:
+            ir = validate_ir_json(item.ir)
+            ir_to_columnar(ir)
+        except ValueError as exc:
+            result.update(status=None, error=str(exc))
+            irs.append(None)
+            continue
+        irs.append(ir)
+    return irs
+
+
+def _resolve_specs(
+    items: list[BatchItem],
+    irs: list[OptimizationModelIR | None],
+    results: list[dict[str, Any]],
+    tables: TableStore | None,
+) -> list[ProblemSpec | None]:
+    specs: list[ProblemSpec | None] = []
+    for item, ir, result in zip(items, irs, results):
+        if "error" in result:
+            specs.append(None)
+            continue
+        try:
+            specs.append(resolve_table_refs(_problem_spec(item, ir), tables))
+        except ValueError as exc:
+            result.update(status=None, error=str(exc))
+            specs.append(None)
+    return specs
+
+
+def _problem_spec(item: BatchItem, ir: OptimizationModelIR | None) -> ProblemSpec:
+    if item.problem_spec is not None:
+        return item.problem_spec
+    return ProblemSpec(text=ir.description or ir.name)
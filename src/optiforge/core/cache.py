@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any
+
+from optiforge.core.models import LinearTerm, OptimizationModelIR, SolveResult
+from optiforge.core.storage import SqliteDatabase
+
+
+class SolutionCache:
+    def __init__(
+        self,
+        database_url: str,
+        max_entries: int,
+        max_age_seconds: int,
+        busy_timeout_ms: int = 5000,
+    ) -> None:
+        self._db = SqliteDatabase(database_url, busy_timeout_ms)
+        self._max_entries = max_entries
+        self._max_age_seconds = max_age_seconds
+        self._init_db()
+
+    def get(self, key: str) -> SolveResult | None:
+        now = time.time()
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "SELECT result_json, created_at FROM solution_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            if now - row["created_at"] > self._max_age_seconds:
+                conn.execute("DELETE FROM solution_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE solution_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        return SolveResult.model_validate_json(row["result_json"])
+
+    def put(self, key: str, result: SolveResult) -> None:
+        if result.status != "optimal":
+            return
+        now = time.time()
+        with self._db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO solution_cache (key, result_json, created_at, last_used_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (key, result.model_dump_json(), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "DELETE FROM solution_cache WHERE created_at < ?", (now - self._max_age_seconds,)
+        )
+        conn.execute(
+            """
+            DELETE FROM solution_cache WHERE key IN (
+                SELECT key FROM solution_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self._max_entries,),
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _init_db(self) -> None:
+        with self._db.transaction() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS solution_cache (
+                    key TEXT PRIMARY KEY,
+                    result_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS solution_cache_last_used ON solution_cache (last_used_at)"
+            )
+
+
+def canonical_ir(ir: OptimizationModelIR) -> dict[str, Any]:
+    variables = sorted(
+        [[variable.name, variable.lower_bound, variable.upper_bound] for variable in ir.variables]
+    )
+    constraints = [
+        [_canonical_terms(constraint.terms), constraint.operator, constraint.rhs]
+        for constraint in ir.constraints
+    ]
+    constraints.sort(key=_sort_key)
+    return {
+        "variables": variables,
+        "constraints": constraints,
+        "objective": [
+            ir.objective.sense,
+            _canonical_terms(ir.objective.terms),
+            ir.objective.constant,
+        ],
+    }
+
+
+def solve_cache_key(ir: OptimizationModelIR, params: dict[str, Any]) -> str:
+    payload = {"ir": canonical_ir(ir), "params": params}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _canonical_terms(terms: list[LinearTerm]) -> list[list[Any]]:
+    merged: dict[str, int] = {}
+    for term in terms:
+        merged[term.var] = merged.get(term.var, 0) + term.coeff
+    return sorted([[var, coeff] for var, coeff in merged.items() if coeff != 0])
+
+
+def _sort_key(item: Any) -> str:
+    return json.dumps(item, separators=(",", ":"))
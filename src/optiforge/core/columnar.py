@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any
+
+from optiforge.core.models import (
+    Constraint,
+    LinearTerm,
+    Objective,
+    OptimizationModelIR,
+    Variable,
+)
+
+OPERATORS = ("<=", ">=", "=")
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+
+_STRUCTURE_FIELDS = ("row_offsets", "col_indices", "operators", "objective_indices")
+_MAGIC = b"OFIRC1"
+_HEADER = struct.Struct("<6sI")
+_ARRAY_FIELDS = (
+    "lower_bounds",
+    "upper_bounds",
+    "row_offsets",
+    "col_indices",
+    "coefficients",
+    "rhs",
+    "operators",
+    "objective_indices",
+    "objective_coefficients",
+)
+
+
+@dataclasses.dataclass
+class ColumnarIR:
+    version: str
+    name: str
+    description: str | None
+    var_names: list[str]
+    lower_bounds: array
+    upper_bounds: array
+    row_offsets: array
+    col_indices: array
+    coefficients: array
+    rhs: array
+    operators: array
+    objective_sense: str
+    objective_indices: array
+    objective_coefficients: array
+    objective_constant: int
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.var_names)
+
+    @property
+    def num_constraints(self) -> int:
+        return len(self.rhs)
+
+    @property
+    def num_nonzeros(self) -> int:
+        return len(self.col_indices)
+
+    def row(self, index: int) -> tuple[array, array]:
+        start = self.row_offsets[index]
+        end = self.row_offsets[index + 1]
+        return self.col_indices[start:end], self.coefficients[start:end]
+
+
+def ir_to_columnar(ir: OptimizationModelIR) -> ColumnarIR:
+    var_names = [variable.name for variable in ir.variables]
+    index = {name: position for position, name in enumerate(var_names)}
+    row_offsets = array("q", [0])
+    col_indices = array("q")
+    coefficients = array("q")
+    try:
+        for constraint in ir.constraints:
+            col_indices.extend([index[term.var] for term in constraint.terms])
+            coefficients.extend([term.coeff for term in constraint.terms])
+            row_offsets.append(len(col_indices))
+        return ColumnarIR(
+            version=ir.version,
+            name=ir.name,
+            description=ir.description,
+            var_names=var_names,
+            lower_bounds=array("q", [variable.lower_bound for variable in ir.variables]),
+            upper_bounds=array("q", [variable.upper_bound for variable in ir.variables]),
+            row_offsets=row_offsets,
+            col_indices=col_indices,
+            coefficients=coefficients,
+            rhs=array("q", [constraint.rhs for constraint in ir.constraints]),
+            operators=array("b", [OPERATOR_CODES[c.operator] for c in ir.constraints]),
+            objective_sense=ir.objective.sense,
+            objective_indices=array("q", [index[term.var] for term in ir.objective.terms]),
+            objective_coefficients=array("q", [term.coeff for term in ir.objective.terms]),
+            objective_constant=ir.objective.constant,
+        )
+    except OverflowError as exc:
+        raise ValueError("IR integers must fit in 64 bits for columnar encoding") from exc
+
+
+def columnar_to_ir(columnar: ColumnarIR) -> OptimizationModelIR:
+    names = columnar.var_names
+    variables = [
+        Variable.model_construct(name=name, type="int", lower_bound=lower, upper_bound=upper)
+        for name, lower, upper in zip(names, columnar.lower_bounds, columnar.upper_bounds)
+    ]
+    constraints = []
+    for row_index in range(columnar.num_constraints):
+        indices, coefficients = columnar.row(row_index)
+        constraints.append(
+            Constraint.model_construct(
+                type="linear",
+                terms=_terms(names, indices, coefficients),
+                operator=OPERATORS[columnar.operators[row_index]],
+                rhs=columnar.rhs[row_index],
+            )
+        )
+    objective = Objective.model_construct(
+        sense=columnar.objective_sense,
+        terms=_terms(names, columnar.objective_indices, columnar.objective_coefficients),
+        constant=columnar.objective_constant,
+    )
+    return OptimizationModelIR.model_construct(
+        version=columnar.version,
+        name=columnar.name,
+        description=columnar.description,
+        variables=variables,
+        constraints=constraints,
+        objective=objective,
+    )
+
+
+def encode_columnar(columnar: ColumnarIR) -> bytes:
+    header: dict[str, Any] = {
+        "version": columnar.version,
+        "name": columnar.name,
+        "description": columnar.description,
+        "var_names": columnar.var_names,
+        "objective_sense": columnar.objective_sense,
+        "objective_constant": columnar.objective_constant,
+        "arrays": [],
+    }
+    chunks = []
+    for field in _ARRAY_FIELDS:
+        values = little_endian(getattr(columnar, field))
+        header["arrays"].append([field, values.typecode, len(values)])
+        chunks.append(values.tobytes())
+    header_bytes = json.dumps(header, ensure_ascii=True, separators=(",", ":")).encode("utf-8")
+    body = zlib.compress(header_bytes + b"".join(chunks), 1)
+    return _HEADER.pack(_MAGIC, len(header_bytes)) + body
+
+
+def decode_columnar(data: bytes) -> ColumnarIR:
+    magic, header_length = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("not a columnar IR payload")
+    body = zlib.decompress(data[_HEADER.size :])
+    header = json.loads(body[:header_length])
+    offset = header_length
+    arrays = {}
+    for field, typecode, length in header["arrays"]:
+        values = array(typecode)
+        size = values.itemsize * length
+        values.frombytes(body[offset : offset + size])
+        arrays[field] = little_endian(values)
+        offset += size
+    return ColumnarIR(
+        version=header["version"],
+        name=header["name"],
+        description=header["description"],
+        var_names=header["var_names"],
+        objective_sense=header["objective_sense"],
+        objective_constant=header["objective_constant"],
+        **arrays,
+    )
+
+
+def structure_hash(columnar: ColumnarIR) -> str:
+    header = {
+        "var_names": columnar.var_names,
+        "objective_sense": columnar.objective_sense,
+        "lengths": [len(getattr(columnar, field)) for field in _STRUCTURE_FIELDS],
+    }
+    digest = hashlib.sha256(json.dumps(header, separators=(",", ":")).encode("utf-8"))
+    for field in _STRUCTURE_FIELDS:
+        values = getattr(columnar, field)
+        digest.update(little_endian(array("q", values)).tobytes())
+    return digest.hexdigest()
+
+
+def _terms(names: list[str], indices: array, coefficients: array) -> list[LinearTerm]:
+    return [
+        LinearTerm.model_construct(var=names[index], coeff=coeff)
+        for index, coeff in zip(indices, coefficients)
+    ]
+
+
+def little_endian(values: array) -> array:
+    if sys.byteorder == "little":
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
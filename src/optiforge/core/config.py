@@ -12,12 +12,47 @@ class Settings(BaseSettings):
 
     app_name: str = "OptiForge"
     database_url: str = "sqlite:///data/optiforge.db"
+    database_busy_timeout_ms: int = 5000
+    ir_columnar_min_terms: int = 10000
     provider: Literal["openai", "stub"] = "stub"
     provider_model: str = "stub-model"
     provider_base_url: str = "https://api.openai.com"
     provider_api_key: SecretStr | None = None
+    provider_connect_timeout_seconds: float = 5.0
+    provider_read_timeout_seconds: float = 60.0
+    provider_max_connections: int = 20
+    provider_max_keepalive_connections: int = 10
+    provider_keepalive_expiry_seconds: float = 30.0
+    provider_http2: bool = True
+    provider_max_retries: int = 3
+    provider_retry_backoff_seconds: float = 0.5
+    provider_retry_max_backoff_seconds: float = 30.0
+    provider_stream: bool = True
+    provider_cache_enabled: bool = True
+    provider_cache_max_entries: int = 1024
+    provider_cache_ttl_seconds: int = 3600
     log_level: str = "INFO"
+    metrics_enabled: bool = True
     solver_max_seconds: int = 5
+    solver_max_search_workers: int = 8
+    solver_incumbent_persist_seconds: float = 1.0
+    solver_presolve: bool = True
+    solver_decompose: bool = False
+    solver_workers: int = 2
+    solver_job_lease_seconds: float = 30.0
+    solver_memory_limit_mb: int = 4096
+    solver_kill_grace_seconds: float = 30.0
+    solver_max_tasks_per_worker: int = 100
+    sweep_max_scenarios: int = 10000
+    sweep_chunk_size: int = 16
+    batch_max_items: int = 1000
+    batch_concurrency: int = 8
+    table_upload_max_bytes: int = 2 * 1024 * 1024 * 1024
+    table_chunk_rows: int = 65536
+    table_sample_rows: int = 20
+    solution_cache_enabled: bool = True
+    solution_cache_max_entries: int = 10000
+    solution_cache_max_age_seconds: int = 7 * 24 * 3600
 
 
 @functools.lru_cache(maxsize=1)
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from array import array
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from optiforge.core.columnar import ColumnarIR
+from optiforge.core.metrics import Profile
+from optiforge.core.models import Incumbent, SolveResult, SolverOptions
+from optiforge.core.solver import IncumbentCallback, solve_ir
+
+Component = tuple[list[int], list[int]]
+
+_MAX_BLOCKS = 64
+_MAX_REPORTED_BLOCKS = 50
+_DEFAULT_SEARCH_WORKERS = 8
+_FALLBACK_SHARE = 0.25
+_MIN_FALLBACK_SECONDS = 0.1
+
+
+def find_components(ir: ColumnarIR) -> list[Component]:
+    parent = list(range(ir.num_variables))
+
+    def find(col: int) -> int:
+        while parent[col] != col:
+            parent[col] = parent[parent[col]]
+            col = parent[col]
+        return col
+
+    offsets = ir.row_offsets
+    cols = ir.col_indices
+    for row in range(ir.num_constraints):
+        start = offsets[row]
+        end = offsets[row + 1]
+        if start == end:
+            continue
+        root = find(cols[start])
+        for position in range(start + 1, end):
+            other = find(cols[position])
+            if other != root:
+                parent[other] = root
+    groups: dict[int, Component] = {}
+    for col in range(ir.num_variables):
+        groups.setdefault(find(col), ([], []))[0].append(col)
+    for row in range(ir.num_constraints):
+        start = offsets[row]
+        key = -1 if start == offsets[row + 1] else find(cols[start])
+        groups.setdefault(key, ([], []))[1].append(row)
+    return list(groups.values())
+
+
+def plan_blocks(components: list[Component], max_blocks: int = _MAX_BLOCKS) -> list[Component]:
+    ordered = sorted(components, key=_component_size, reverse=True)
+    if len(ordered) <= max_blocks:
+        return ordered
+    loads = [(0, index) for index in range(max_blocks)]
+    blocks: list[Component] = [([], []) for _ in range(max_blocks)]
+    for cols, rows in ordered:
+        load, index = heapq.heappop(loads)
+        blocks[index][0].extend(cols)
+        blocks[index][1].extend(rows)
+        heapq.heappush(loads, (load + len(cols) + len(rows), index))
+    for cols, rows in blocks:
+        cols.sort()
+        rows.sort()
+    return sorted(blocks, key=_component_size, reverse=True)
+
+
+def split_blocks(ir: ColumnarIR, blocks: list[Component]) -> list[ColumnarIR]:
+    owner = [0] * ir.num_variables
+    position = [0] * ir.num_variables
+    for index, (cols, _) in enumerate(blocks):
+        for offset, col in enumerate(cols):
+            owner[col] = index
+            position[col] = offset
+    objectives: list[tuple[array, array]] = [(array("q"), array("q")) for _ in blocks]
+    for col, coeff in zip(ir.objective_indices, ir.objective_coefficients):
+        indices, coefficients = objectives[owner[col]]
+        indices.append(position[col])
+        coefficients.append(coeff)
+    parts = []
+    for index, (cols, rows) in enumerate(blocks):
+        row_offsets = array("q", [0])
+        col_indices = array("q")
+        coefficients = array("q")
+        for row in rows:
+            row_cols, row_coefficients = ir.row(row)
+            col_indices.extend([position[col] for col in row_cols])
+            coefficients.extend(row_coefficients)
+            row_offsets.append(len(col_indices))
+        parts.append(
+            ColumnarIR(
+                version=ir.version,
+                name=f"{ir.name}[{index}]",
+                description=ir.description,
+                var_names=[ir.var_names[col] for col in cols],
+                lower_bounds=array("q", [ir.lower_bounds[col] for col in cols]),
+                upper_bounds=array("q", [ir.upper_bounds[col] for col in cols]),
+                row_offsets=row_offsets,
+                col_indices=col_indices,
+                coefficients=coefficients,
+                rhs=array("q", [ir.rhs[row] for row in rows]),
+                operators=array("b", [ir.operators[row] for row in rows]),
+                objective_sense=ir.objective_sense,
+                objective_indices=objectives[index][0],
+                objective_coefficients=objectives[index][1],
+                objective_constant=0,
+            )
+        )
+    return parts
+
+
+def solve_decomposed(
+    ir: ColumnarIR,
+    max_seconds: int,
+    options: SolverOptions | None = None,
+    on_incumbent: IncumbentCallback | None = None,
+    hint: dict[str, int] | None = None,
+    profile: Profile | None = None,
+) -> SolveResult | None:
+    profile = profile or Profile()
+    with profile.stage("decompose"):
+        components = find_components(ir)
+        if len(components) < 2:
+            return None
+        parts = split_blocks(ir, plan_blocks(components))
+    requested = options or SolverOptions()
+    search_workers = requested.num_search_workers or _DEFAULT_SEARCH_WORKERS
+    parallelism = min(len(parts), search_workers)
+    part_options = requested.model_copy(
+        update={"num_search_workers": max(1, search_workers // parallelism)}
+    )
+    combined = None
+    if on_incumbent is not None:
+        combined = _CombinedIncumbents(len(parts), ir.objective_constant, on_incumbent)
+    deadline = time.monotonic() + max_seconds
+    budgets = _WaveBudgets(len(parts), parallelism, deadline - max_seconds * _FALLBACK_SHARE)
+
+    def solve_part(index: int) -> tuple[SolveResult, Profile]:
+        part_profile = Profile()
+        listener = None if combined is None else combined.listener(index)
+        budget = budgets.next()
+        result = solve_ir(parts[index], budget, part_options, listener, hint, part_profile)
+        return result, part_profile
+
+    with profile.stage("solve"):
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            outcomes = list(executor.map(solve_part, range(len(parts))))
+    results = [outcome[0] for outcome in outcomes]
+    decomposition = {
+        "components": len(components),
+        "blocks": len(parts),
+        "parallelism": parallelism,
+        "search_workers_per_block": part_options.num_search_workers,
+        "fallback": False,
+        "block_stats": [
+            _block_stats(part, outcome)
+            for part, outcome in zip(parts[:_MAX_REPORTED_BLOCKS], outcomes)
+        ],
+    }
+    statuses = {result.status for result in results}
+    remaining = deadline - time.monotonic()
+    if (
+        "unknown" in statuses
+        and "infeasible" not in statuses
+        and remaining >= _MIN_FALLBACK_SECONDS
+    ):
+        decomposition["fallback"] = True
+        fallback_hint = {**(hint or {}), **_merge_values_of(results)}
+        fallback_profile = Profile()
+        with profile.stage("fallback"):
+            result = solve_ir(
+                ir, remaining, requested, on_incumbent, fallback_hint, fallback_profile
+            )
+        profile.solver = fallback_profile.solver
+        profile.decomposition = decomposition
+        return result
+    result = _merge_results(ir, results)
+    profile.solver = _merge_stats(result, outcomes)
+    profile.decomposition = decomposition
+    return result
+
+
+class _WaveBudgets:
+    def __init__(self, blocks: int, parallelism: int, deadline: float) -> None:
+        self._lock = threading.Lock()
+        self._left = blocks
+        self._parallelism = parallelism
+        self._deadline = deadline
+
+    def next(self) -> float:
+        with self._lock:
+            waves = math.ceil(self._left / self._parallelism)
+            self._left -= 1
+        remaining = max(0.0, self._deadline - time.monotonic())
+        return remaining / waves
+
+
+class _CombinedIncumbents:
+    def __init__(self, parts: int, constant: int, on_incumbent: IncumbentCallback) -> None:
+        self._lock = threading.Lock()
+        self._constant = constant
+        self._on_incumbent = on_incumbent
+        self._latest: list[tuple[Incumbent, dict[str, int]] | None] = [None] * parts
+        self._started = time.monotonic()
+
+    def listener(self, index: int) -> IncumbentCallback:
+        def listener(incumbent: Incumbent, values: Callable[[], dict[str, int]]) -> None:
+            snapshot = values()
+            with self._lock:
+                self._latest[index] = (incumbent, snapshot)
+                if any(entry is None for entry in self._latest):
+                    return
+                entries = [entry for entry in self._latest if entry is not None]
+                merged = Incumbent(
+                    objective_value=self._constant
+                    + sum(entry[0].objective_value for entry in entries),
+                    best_bound=self._constant + sum(entry[0].best_bound for entry in entries),
+                    wall_time_seconds=time.monotonic() - self._started,
+                )
+                self._on_incumbent(merged, lambda: _merge_values(entries))
+
+        return listener
+
+
+def _merge_values(entries: list[tuple[Incumbent, dict[str, int]]]) -> dict[str, int]:
+    values: dict[str, int] = {}
+    for _, snapshot in entries:
+        values.update(snapshot)
+    return values
+
+
+def _merge_values_of(results: list[SolveResult]) -> dict[str, int]:
+    values: dict[str, int] = {}
+    for result in results:
+        values.update(result.variables)
+    return values
+
+
+def _merge_results(ir: ColumnarIR, results: list[SolveResult]) -> SolveResult:
+    statuses = {result.status for result in results}
+    if "infeasible" in statuses:
+        return SolveResult(status="infeasible", objective_value=None, variables={})
+    if "unknown" in statuses:
+        return SolveResult(status="unknown", objective_value=None, variables={})
+    variables: dict[str, int] = {}
+    objective = ir.objective_constant
+    for result in results:
+        variables.update(result.variables)
+        objective += result.objective_value or 0
+    status = "optimal" if statuses == {"optimal"} else "feasible"
+    ordered = {name: variables[name] for name in ir.var_names}
+    return SolveResult(status=status, objective_value=objective, variables=ordered)
+
+
+def _merge_stats(
+    result: SolveResult, outcomes: list[tuple[SolveResult, Profile]]
+) -> dict[str, Any]:
+    stats = [part_profile.solver or {} for _, part_profile in outcomes]
+    merged: dict[str, Any] = {
+        "status": result.status,
+        "branches": sum(item.get("branches", 0) for item in stats),
+        "conflicts": sum(item.get("conflicts", 0) for item in stats),
+        "wall_time_seconds": max(item.get("wall_time_seconds", 0.0) for item in stats),
+        "gap": None,
+    }
+    if result.objective_value is None or any(item.get("gap") is None for item in stats):
+        return merged
+    spread = sum(
+        item["gap"] * max(1.0, abs(part.objective_value or 0))
+        for item, (part, _) in zip(stats, outcomes)
+    )
+    merged["gap"] = spread / max(1.0, abs(result.objective_value))
+    return merged
+
+
+def _block_stats(part: ColumnarIR, outcome: tuple[SolveResult, Profile]) -> dict[str, Any]:
+    result, part_profile = outcome
+    solver = part_profile.solver or {}
+    return {
+        "variables": part.num_variables,
+        "constraints": part.num_constraints,
+        "status": result.status,
+        "objective_value": result.objective_value,
+        "wall_time_seconds": solver.get("wall_time_seconds"),
+        "branches": solver.get("branches"),
+        "conflicts": solver.get("conflicts"),
+    }
+
+
+def _component_size(component: Component) -> int:
+    return len(component[0]) + len(component[1])
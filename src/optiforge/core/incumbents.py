@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+
+from optiforge.core.models import Incumbent
+from optiforge.core.storage import RunStore
+
+logger = logging.getLogger(__name__)
+
+
+class IncumbentRecorder:
+    def __init__(
+        self,
+        store: RunStore,
+        run_id: str,
+        job_id: str | None = None,
+        persist_seconds: float = 1.0,
+    ) -> None:
+        self._store = store
+        self._run_id = run_id
+        self._job_id = job_id
+        self._persist_seconds = persist_seconds
+        self._pending: list[Incumbent] = []
+        self._values: Callable[[], dict[str, int]] | None = None
+        self._last_flush = float("-inf")
+
+    def start(self) -> None:
+        self._store.clear_incumbents(self._run_id)
+
+    def __call__(self, incumbent: Incumbent, values: Callable[[], dict[str, int]]) -> None:
+        self._pending.append(incumbent)
+        self._values = values
+        if time.monotonic() - self._last_flush < self._persist_seconds:
+            return
+        self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        best = self._pending[-1].model_copy(update={"variables": self._values()})
+        try:
+            self._store.record_incumbents(self._run_id, self._job_id, self._pending, best)
+        except sqlite3.Error:
+            logger.exception("failed to persist incumbents for run %s", self._run_id)
+            return
+        self._pending = []
+        self._values = None
+        self._last_flush = time.monotonic()
+
+
+@dataclasses.dataclass(frozen=True)
+class IncumbentSink:
+    database_url: str
+    busy_timeout_ms: int
+    run_id: str
+    job_id: str | None
+    persist_seconds: float
+
+    def open(self) -> tuple[RunStore, IncumbentRecorder]:
+        store = RunStore(self.database_url, self.busy_timeout_ms)
+        recorder = IncumbentRecorder(store, self.run_id, self.job_id, self.persist_seconds)
+        return store, recorder
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from optiforge.core.models import OptimizationModelIR, ProblemSpec
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: OptimizationModelIR | None = None
+        self.error: BaseException | None = None
+
+
+class IRCache:
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, OptimizationModelIR]] = OrderedDict()
+        self._in_flight: dict[str, _Flight] = {}
+        self._async_in_flight: dict[str, asyncio.Future[OptimizationModelIR]] = {}
+
+    def get(self, key: str) -> OptimizationModelIR | None:
+        with self._lock:
+            return self._get_locked(key)
+
+    def put(self, key: str, ir: OptimizationModelIR) -> None:
+        with self._lock:
+            self._put_locked(key, ir)
+
+    def get_or_generate(
+        self, key: str, generate: Callable[[], OptimizationModelIR]
+    ) -> tuple[OptimizationModelIR, bool]:
+        with self._lock:
+            cached = self._get_locked(key)
+            if cached is not None:
+                return cached, True
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+        if not leader:
+            return _wait_for(flight), True
+        try:
+            result = generate()
+        except BaseException as exc:
+            self._land(key, flight, None, exc)
+            raise
+        self._land(key, flight, result, None)
+        return result, False
+
+    async def get_or_generate_async(
+        self, key: str, generate: Callable[[], Awaitable[OptimizationModelIR]]
+    ) -> tuple[OptimizationModelIR, bool]:
+        while True:
+            with self._lock:
+                cached = self._get_locked(key)
+                if cached is not None:
+                    return cached, True
+                flight = self._async_in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = asyncio.get_running_loop().create_future()
+                    self._async_in_flight[key] = flight
+            if leader:
+                break
+            try:
+                return await asyncio.shield(flight), True
+            except asyncio.CancelledError:
+                if not flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        try:
+            result = await generate()
+        except BaseException as exc:
+            self._land_async(key, flight, None, exc)
+            raise
+        self._land_async(key, flight, result, None)
+        return result, False
+
+    def _land_async(
+        self,
+        key: str,
+        flight: asyncio.Future[OptimizationModelIR],
+        result: OptimizationModelIR | None,
+        error: BaseException | None,
+    ) -> None:
+        with self._lock:
+            if result is not None:
+                self._put_locked(key, result)
+            self._async_in_flight.pop(key, None)
+        if isinstance(error, asyncio.CancelledError):
+            flight.cancel()
+            return
+        if error is not None:
+            flight.set_exception(error)
+            flight.exception()
+            return
+        flight.set_result(result)
+
+    def _land(
+        self,
+        key: str,
+        flight: _Flight,
+        result: OptimizationModelIR | None,
+        error: BaseException | None,
+    ) -> None:
+        with self._lock:
+            if result is not None:
+                self._put_locked(key, result)
+            self._in_flight.pop(key, None)
+        flight.result = result
+        flight.error = error
+        flight.done.set()
+
+    def _put_locked(self, key: str, ir: OptimizationModelIR) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, ir)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_locked(self, key: str) -> OptimizationModelIR | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, ir = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return ir
+
+
+def ir_cache_key(provider: str, model: str, spec: ProblemSpec) -> str:
+    payload = {"provider": provider, "model": model, "spec": spec.model_dump()}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _wait_for(flight: _Flight) -> OptimizationModelIR:
+    flight.done.wait()
+    if flight.error is not None:
+        raise flight.error
+    return flight.result
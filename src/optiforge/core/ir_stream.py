@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic import ValidationError as PydanticValidationError
+
+from optiforge.core.models import Constraint, LinearTerm, Objective, OptimizationModelIR, Variable
+
+_SCHEMA_VERSION = "1.0"
+_REQUIRED_FIELDS = ("version", "name", "variables", "constraints", "objective")
+_ARRAY_FIELDS = {"variables", "constraints"}
+_FIELDS = {"version", "name", "description", "variables", "constraints", "objective"}
+_NON_SPACE = re.compile(r"\S")
+_STRING_SPECIALS = re.compile(r'["\\]')
+_BRACKET = re.compile(r'(?:[^"{}\[\]]|"[^"\\]*(?:\\.[^"\\]*)*")*+(["{}\[\]])')
+_SCALAR_END = re.compile(r"[\s,}\]]")
+
+
+class IRStreamParser:
+    def __init__(self) -> None:
+        self._fences = _FenceFilter()
+        self._state = "start"
+        self._key = ""
+        self._reader: _ValueReader | None = None
+        self._fields: dict[str, Any] = {}
+        self._names: set[str] = set()
+        self._variables: list[Variable] = []
+        self._constraints: list[Constraint] = []
+        self._variables_closed = False
+        self._unresolved: dict[str, str] = {}
+
+    def feed(self, chunk: str) -> None:
+        self._consume(self._fences.feed(chunk))
+
+    def finish(self) -> OptimizationModelIR:
+        self._consume(self._fences.flush())
+        if self._state != "done":
+            raise ValueError("IR stream ended before the model was complete")
+        for field in _REQUIRED_FIELDS:
+            if field not in self._fields:
+                raise ValueError(f"IR stream validation failed: missing {field}")
+        self._resolve_references()
+        return OptimizationModelIR.model_construct(**self._fields)
+
+    def _consume(self, text: str) -> None:
+        pos = 0
+        while pos < len(text):
+            pos = self._step(text, pos)
+
+    def _step(self, text: str, pos: int) -> int:
+        if self._reader is not None:
+            end = self._reader.read(text, pos)
+            if end is None:
+                return len(text)
+            self._complete(self._reader.value())
+            self._reader = None
+            return end
+        match = _NON_SPACE.search(text, pos)
+        if match is None:
+            return len(text)
+        pos = match.start()
+        char = text[pos]
+        if self._state == "start":
+            if char != "{":
+                raise ValueError("IR stream must contain a JSON object")
+            self._state = "first_key"
+            return pos + 1
+        if self._state in ("first_key", "key"):
+            if char == "}" and self._state == "first_key":
+                self._state = "done"
+                return pos + 1
+            if char != '"':
+                raise ValueError("invalid IR JSON: expected an object key")
+            self._reader = _ValueReader(char)
+            return pos
+        if self._state == "colon":
+            if char != ":":
+                raise ValueError(f"invalid IR JSON: expected ':' after {self._key}")
+            self._state = "value"
+            return pos + 1
+        if self._state == "value":
+            if self._key not in _ARRAY_FIELDS:
+                self._reader = _ValueReader(char)
+                return pos
+            if char != "[":
+                raise ValueError(f"IR stream validation failed at {self._key}: expected an array")
+            self._state = "first_element"
+            return pos + 1
+        if self._state in ("first_element", "element"):
+            if char == "]" and self._state == "first_element":
+                self._close_array()
+                return pos + 1
+            self._reader = _ValueReader(char)
+            return pos
+        if self._state == "after_element":
+            if char == "]":
+                self._close_array()
+                return pos + 1
+            if char != ",":
+                raise ValueError(f"invalid IR JSON: expected ',' or ']' in {self._key}")
+            self._state = "element"
+            return pos + 1
+        if self._state == "after_value":
+            if char == "}":
+                self._state = "done"
+                return pos + 1
+            if char != ",":
+                raise ValueError("invalid IR JSON: expected ',' or '}'")
+            self._state = "key"
+            return pos + 1
+        raise ValueError("invalid IR JSON: unexpected data after the model")
+
+    def _complete(self, raw: str) -> None:
+        location = self._location()
+        if self._state in ("first_key", "key"):
+            self._accept_key(_loads(raw, location))
+            return
+        if self._state == "value":
+            self._accept_field(raw)
+            self._state = "after_value"
+            return
+        if self._key == "variables":
+            self._accept_variable(raw, location)
+        if self._key == "constraints":
+            self._accept_constraint(raw, location)
+        self._state = "after_element"
+
+    def _location(self) -> str:
+        if self._state in ("first_element", "element"):
+            items = self._variables if self._key == "variables" else self._constraints
+            return f"{self._key}[{len(items)}]"
+        if self._state == "value":
+            return self._key
+        return "object key"
+
+    def _accept_key(self, key: str) -> None:
+        if key not in _FIELDS:
+            raise ValueError(f"IR stream validation failed: unexpected field {key}")
+        if key in self._fields or (key == "variables" and self._variables_closed):
+            raise ValueError(f"IR stream validation failed: duplicate field {key}")
+        self._key = key
+        self._state = "colon"
+
+    def _accept_field(self, raw: str) -> None:
+        key = self._key
+        if key == "objective":
+            objective = _validated(Objective, raw, key)
+            self._check_terms(objective.terms, key)
+            self._fields[key] = objective
+            return
+        value = _loads(raw, key)
+        if key == "version" and value != _SCHEMA_VERSION:
+            raise ValueError(f"IR stream validation failed at version: expected {_SCHEMA_VERSION}")
+        if key == "name" and (not isinstance(value, str) or not value):
+            raise ValueError("IR stream validation failed at name: expected a non-empty string")
+        if key == "description" and not isinstance(value, str):
+            raise ValueError("IR stream validation failed at description: expected a string")
+        self._fields[key] = value
+
+    def _accept_variable(self, raw: str, location: str) -> None:
+        variable = _validated(Variable, raw, location)
+        if variable.name in self._names:
+            raise ValueError(
+                f"IR stream validation failed at {location}: duplicate variable {variable.name}"
+            )
+        self._names.add(variable.name)
+        self._variables.append(variable)
+
+    def _accept_constraint(self, raw: str, location: str) -> None:
+        constraint = _validated(Constraint, raw, location)
+        self._check_terms(constraint.terms, location)
+        self._constraints.append(constraint)
+
+    def _check_terms(self, terms: list[LinearTerm], location: str) -> None:
+        for term in terms:
+            if term.var in self._names:
+                continue
+            if self._variables_closed:
+                raise ValueError(
+                    f"IR stream validation failed at {location}: unknown variable: {term.var}"
+                )
+            self._unresolved.setdefault(term.var, location)
+
+    def _close_array(self) -> None:
+        if self._key == "variables":
+            if not self._variables:
+                raise ValueError("IR stream validation failed at variables: expected at least one")
+            self._variables_closed = True
+            self._fields["variables"] = self._variables
+            self._resolve_references()
+        if self._key == "constraints":
+            self._fields["constraints"] = self._constraints
+        self._state = "after_value"
+
+    def _resolve_references(self) -> None:
+        for name, location in self._unresolved.items():
+            if name not in self._names:
+                raise ValueError(
+                    f"IR stream validation failed at {location}: unknown variable: {name}"
+                )
+        self._unresolved.clear()
+
+
+def parse_ir_chunks(chunks: Iterable[str]) -> OptimizationModelIR:
+    parser = IRStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
+
+
+class _ValueReader:
+    def __init__(self, first: str) -> None:
+        self._scalar = first not in '{["'
+        self._in_string = first == '"'
+        self._depth = 0
+        self._escape = self._in_string
+        self._parts: list[str] = []
+
+    def read(self, text: str, pos: int) -> int | None:
+        start = pos
+        if self._scalar:
+            match = _SCALAR_END.search(text, pos)
+            if match is None:
+                self._parts.append(text[start:])
+                return None
+            self._parts.append(text[start : match.start()])
+            return match.start()
+        size = len(text)
+        while pos < size:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+            if self._in_string:
+                match = _STRING_SPECIALS.search(text, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    self._parts.append(text[start:pos])
+                    return pos
+                continue
+            match = _BRACKET.match(text, pos)
+            if match is None:
+                break
+            token = match.group(1)
+            pos = match.end()
+            if token == '"':
+                self._in_string = True
+                continue
+            if token in "{[":
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth == 0:
+                self._parts.append(text[start:pos])
+                return pos
+        self._parts.append(text[start:])
+        return None
+
+    def value(self) -> str:
+        return "".join(self._parts)
+
+
+class _FenceFilter:
+    def __init__(self) -> None:
+        self._held = ""
+        self._line_start = True
+        self._skipping = False
+
+    def feed(self, text: str) -> str:
+        out: list[str] = []
+        pos = 0
+        while pos < len(text):
+            if self._skipping or not self._line_start:
+                end = text.find("\n", pos)
+                if end < 0:
+                    if not self._skipping:
+                        out.append(text[pos:])
+                    break
+                if not self._skipping:
+                    out.append(text[pos : end + 1])
+                self._skipping = False
+                self._line_start = True
+                pos = end + 1
+                continue
+            char = text[pos]
+            if char == "`":
+                self._held += char
+                pos += 1
+                if self._held == "```":
+                    self._held = ""
+                    self._skipping = True
+                continue
+            if self._held:
+                out.append(self.flush())
+                self._line_start = False
+                continue
+            out.append(char)
+            pos += 1
+            if not char.isspace():
+                self._line_start = False
+        return "".join(out)
+
+    def flush(self) -> str:
+        held = self._held
+        self._held = ""
+        return held
+
+
+def _loads(raw: str, location: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid IR JSON at {location}: {exc}") from exc
+
+
+def _validated(model: type[BaseModel], raw: str, location: str) -> Any:
+    try:
+        return model.model_validate_json(raw)
+    except PydanticValidationError as exc:
+        raise ValueError(f"IR stream validation failed at {location}: {exc}") from exc
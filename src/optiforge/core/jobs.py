@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import Future
+from typing import Any
+
+from optiforge.core.cache import SolutionCache, solve_cache_key
+from optiforge.core.config import Settings
+from optiforge.core.columnar import decode_columnar, encode_columnar, ir_to_columnar
+from optiforge.core.incumbents import IncumbentSink
+from optiforge.core.metrics import MetricsRegistry, Profile
+from optiforge.core.models import SolveJob, SolveResult, SolverOptions
+from optiforge.core.presolve import solve_model
+from optiforge.core.service import (
+    effective_solver_options,
+    load_solvable_run,
+    lookup_solution,
+    observe_profile,
+    record_error,
+    record_solution,
+    resolve_warm_start,
+    solver_params,
+)
+from optiforge.core.solver_pool import SolverPool, new_solver_pool
+from optiforge.core.storage import RunConflictError, RunStore
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 1.0
+
+
+class SolveJobQueue:
+    def __init__(
+        self,
+        settings: Settings,
+        store: RunStore,
+        cache: SolutionCache | None = None,
+        metrics: MetricsRegistry | None = None,
+        pool: SolverPool | None = None,
+    ) -> None:
+        if settings.solver_workers < 1:
+            raise ValueError("solver_workers must be at least 1")
+        self._settings = settings
+        self._store = store
+        self._cache = cache
+        self._metrics = metrics
+        self._pool = pool
+        self._owner = new_lease_owner()
+        self._lease_seconds = settings.solver_job_lease_seconds
+        self._next_renewal = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._executor: SolverPool | None = None
+        self._dispatcher: threading.Thread | None = None
+        self._in_flight: dict[str, Future] = {}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            self._executor = self._pool or new_solver_pool(self._settings)
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="optiforge-solve-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            dispatcher = self._dispatcher
+            executor = self._executor
+            self._dispatcher = None
+            self._executor = None
+        if dispatcher is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        dispatcher.join()
+        if executor is not None and executor is not self._pool:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            in_flight = list(self._in_flight.values())
+        for future in in_flight:
+            future.cancel()
+        self._stopping.clear()
+
+    def submit(
+        self,
+        run_id: str,
+        options: SolverOptions | None = None,
+        warm_start: str | None = None,
+    ) -> SolveJob:
+        load_solvable_run(run_id, self._store)
+        job = self._store.create_job(run_id, warm_start, options)
+        self.start()
+        self._wakeup.set()
+        return job
+
+    def submit_many(
+        self, entries: Sequence[tuple[str, str | None, SolverOptions | None]]
+    ) -> list[SolveJob]:
+        if not entries:
+            return []
+        jobs = self._store.create_jobs(entries)
+        self.start()
+        self._wakeup.set()
+        return jobs
+
+    def get(self, job_id: str) -> SolveJob:
+        return self._store.get_job(job_id)
+
+    def cancel(self, job_id: str) -> SolveJob:
+        job = self._store.cancel_job(job_id)
+        with self._lock:
+            future = self._in_flight.get(job_id)
+            executor = self._executor
+        if future is not None and executor is not None:
+            executor.terminate(future)
+        return job
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=_POLL_SECONDS)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self._renew_leases()
+                self._fill_slots()
+            except Exception:
+                logger.exception("solve dispatcher failed to schedule jobs")
+
+    def _renew_leases(self) -> None:
+        now = time.monotonic()
+        if now < self._next_renewal:
+            return
+        self._next_renewal = now + self._lease_seconds / 3
+        with self._lock:
+            in_flight = dict(self._in_flight)
+            executor = self._executor
+        held = self._store.renew_job_leases(self._owner, in_flight, self._lease_seconds)
+        for job_id, future in in_flight.items():
+            if job_id in held or executor is None:
+                continue
+            logger.info("no longer holds the lease on solve job %s", job_id)
+            executor.terminate(future)
+
+    def _fill_slots(self) -> None:
+        while self._has_free_slot():
+            job = self._store.claim_next_job(self._owner, self._lease_seconds)
+            if job is None:
+                return
+            try:
+                self._launch(job)
+            except Exception as exc:
+                logger.exception("failed to launch solve job %s", job.id)
+                self._handle_failure(job, exc, Profile())
+
+    def _has_free_slot(self) -> bool:
+        with self._lock:
+            return len(self._in_flight) < self._settings.solver_workers
+
+    def _launch(self, job: SolveJob) -> None:
+        profile = Profile()
+        try:
+            with profile.stage("load"):
+                run = load_solvable_run(job.run_id, self._store)
+        except (KeyError, ValueError) as exc:
+            self._store.finish_job(job.id, "failed", str(exc), self._owner)
+            observe_profile(self._metrics, "solve", profile, "error")
+            return
+        options = effective_solver_options(job.solver_options, self._settings)
+        with profile.stage("cache_lookup"):
+            cache_key = solve_cache_key(run.ir, solver_params(options))
+            cached = lookup_solution(self._cache, cache_key)
+        if cached is not None:
+            try:
+                record_solution(
+                    job.run_id,
+                    cached,
+                    self._store,
+                    cache_key=cache_key,
+                    cache_hit=True,
+                    options=options,
+                    profile=profile,
+                    expected_version=run.version,
+                )
+            except RunConflictError as exc:
+                self._handle_failure(job, exc, profile, run.version)
+                return
+            self._store.finish_job(job.id, "succeeded", owner=self._owner)
+            observe_profile(self._metrics, "solve", profile, "cache_hit")
+            return
+        with self._lock:
+            executor = self._executor
+        if executor is None:
+            return
+        with profile.stage("warm_start"):
+            hint, warm_details = resolve_warm_start(run, job.warm_start, self._store)
+        with profile.stage("encode"):
+            ir_blob = encode_columnar(ir_to_columnar(run.ir))
+        sink = IncumbentSink(
+            self._settings.database_url,
+            self._settings.database_busy_timeout_ms,
+            job.run_id,
+            job.id,
+            self._settings.solver_incumbent_persist_seconds,
+        )
+        try:
+            future = executor.submit(
+                _solve_in_worker,
+                ir_blob,
+                options.max_seconds,
+                options.model_dump(),
+                sink,
+                hint,
+                self._settings.solver_presolve,
+                self._settings.solver_decompose,
+                timeout=options.max_seconds + self._settings.solver_kill_grace_seconds,
+            )
+        except RuntimeError as exc:
+            self._handle_failure(job, exc, profile, run.version)
+            return
+        with self._lock:
+            self._in_flight[job.id] = future
+        future.add_done_callback(
+            functools.partial(
+                self._on_done, job, run.version, cache_key, options, warm_details, profile
+            )
+        )
+
+    def _on_done(
+        self,
+        job: SolveJob,
+        version: int,
+        cache_key: str,
+        options: SolverOptions,
+        warm_details: dict[str, Any] | None,
+        profile: Profile,
+        future: Future,
+    ) -> None:
+        with self._lock:
+            self._in_flight.pop(job.id, None)
+        self._wakeup.set()
+        if future.cancelled():
+            return
+        if not self._store.holds_job_lease(job.id, self._owner):
+            return
+        try:
+            payload = future.result()
+            result = SolveResult.model_validate(payload["result"])
+        except Exception as exc:
+            self._handle_failure(job, exc, profile, version)
+            return
+        profile.merge(payload.get("profile"))
+        if self._cache is not None:
+            self._cache.put(cache_key, result)
+        try:
+            record_solution(
+                job.run_id,
+                result,
+                self._store,
+                cache_key=cache_key,
+                options=options,
+                warm_start=warm_details,
+                presolve=payload["presolve"],
+                profile=profile,
+                expected_version=version,
+            )
+        except RunConflictError as exc:
+            self._handle_failure(job, exc, profile, version)
+            return
+        self._store.finish_job(job.id, "succeeded", owner=self._owner)
+        observe_profile(self._metrics, "solve", profile, "success")
+
+    def _handle_failure(
+        self, job: SolveJob, exc: Exception, profile: Profile, version: int | None = None
+    ) -> None:
+        message = str(exc) or exc.__class__.__name__
+        record_error(self._store, job.run_id, message, version)
+        self._store.finish_job(job.id, "failed", message, self._owner)
+        observe_profile(self._metrics, "solve", profile, "error")
+
+
+def new_lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _solve_in_worker(
+    ir_blob: bytes,
+    max_seconds: int,
+    options: dict[str, Any] | None = None,
+    sink: IncumbentSink | None = None,
+    hint: dict[str, int] | None = None,
+    presolve: bool = True,
+    decompose: bool = False,
+) -> dict[str, Any]:
+    profile = Profile()
+    with profile.stage("decode"):
+        ir = decode_columnar(ir_blob)
+    solver_options = None
+    if options is not None:
+        solver_options = SolverOptions.model_construct(**options)
+    if sink is None:
+        result, stats = solve_model(
+            ir, max_seconds, solver_options, None, hint, presolve, profile, decompose
+        )
+        return {"result": result.model_dump(), "presolve": stats, "profile": profile.to_dict()}
+    store, recorder = sink.open()
+    try:
+        recorder.start()
+        result, stats = solve_model(
+            ir, max_seconds, solver_options, recorder, hint, presolve, profile, decompose
+        )
+        recorder.flush()
+    finally:
+        store.close()
+    return {"result": result.model_dump(), "presolve": stats, "profile": profile.to_dict()}
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import math
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+DURATION_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+GAP_BUCKETS = (0.0, 0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Profile:
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        self.solver: dict[str, Any] | None = None
+        self.decomposition: dict[str, Any] | None = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, data: dict[str, Any] | None) -> None:
+        if not data:
+            return
+        for name, seconds in data.get("stages", {}).items():
+            self.add(name, seconds)
+        if data.get("solver") is not None:
+            self.solver = data["solver"]
+        if data.get("decomposition") is not None:
+            self.decomposition = data["decomposition"]
+
+    def to_dict(self) -> dict[str, Any]:
+        stages = {name: round(seconds, 6) for name, seconds in self.stages.items()}
+        return {"stages": stages, "solver": self.solver, "decomposition": self.decomposition}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self._histograms: dict[str, tuple[tuple[float, ...], dict[tuple, list[float]]]] = {}
+        self._help: dict[str, str] = {}
+
+    def inc(self, name: str, help_text: str, value: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(name, help_text)
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(
+        self,
+        name: str,
+        help_text: str,
+        value: float,
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+        **labels: str,
+    ) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(name, help_text)
+            bounds, series = self._histograms.setdefault(name, (buckets, {}))
+            state = series.get(key)
+            if state is None:
+                state = [0.0] * (len(bounds) + 2)
+                series[key] = state
+            state[bisect.bisect_left(bounds, value)] += 1
+            state[-1] += value
+
+    def observe_profile(self, operation: str, profile: Profile, outcome: str) -> None:
+        self.inc(
+            "optiforge_operations_total",
+            "Completed generate and solve operations by outcome.",
+            operation=operation,
+            outcome=outcome,
+        )
+        for stage, seconds in profile.stages.items():
+            self.observe(
+                "optiforge_stage_duration_seconds",
+                "Wall time spent in each stage of generate and solve.",
+                seconds,
+                operation=operation,
+                stage=stage,
+            )
+        self.observe(
+            "optiforge_operation_duration_seconds",
+            "Total wall time of generate and solve operations.",
+            sum(profile.stages.values()),
+            operation=operation,
+        )
+        if profile.solver is not None:
+            self.observe_solver(profile.solver)
+
+    def observe_solver(self, stats: dict[str, Any]) -> None:
+        self.inc(
+            "optiforge_solver_solves_total",
+            "CP-SAT solves by final status.",
+            status=str(stats.get("status", "unknown")),
+        )
+        self.inc(
+            "optiforge_solver_branches_total",
+            "CP-SAT search branches explored.",
+            float(stats.get("branches", 0)),
+        )
+        self.inc(
+            "optiforge_solver_conflicts_total",
+            "CP-SAT conflicts encountered.",
+            float(stats.get("conflicts", 0)),
+        )
+        self.observe(
+            "optiforge_solver_wall_time_seconds",
+            "CP-SAT wall time per solve.",
+            float(stats.get("wall_time_seconds", 0.0)),
+        )
+        if stats.get("gap") is not None:
+            self.observe(
+                "optiforge_solver_relative_gap",
+                "Relative gap between objective and best bound at the end of a solve.",
+                float(stats["gap"]),
+                GAP_BUCKETS,
+            )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+            for name in sorted(self._histograms):
+                bounds, series = self._histograms[name]
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in sorted(series.items()):
+                    cumulative = 0.0
+                    for bound, count in zip(bounds, state):
+                        cumulative += count
+                        le = (("le", _number(bound)),)
+                        lines.append(f"{name}_bucket{_labels(key + le)} {_number(cumulative)}")
+                    total = cumulative + state[len(bounds)]
+                    inf = (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_labels(key + inf)} {_number(total)}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(state[-1])}")
+                    lines.append(f"{name}_count{_labels(key)} {_number(total)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: tuple[tuple[str, str], ...]) -> str:
+    if not key:
+        return ""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in key]
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
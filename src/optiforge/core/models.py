@@ -5,7 +5,7 @@ from typing import Any, Literal
 from pydantic import BaseModel, ConfigDict, Field, StrictFloat, StrictInt, StrictStr, model_validator
 
 
-CellValue = StrictInt | StrictFloat | StrictStr
+CellValue = StrictInt | StrictFloat | StrictStr | None
 
 
 class TableSpec(BaseModel):
@@ -28,11 +28,48 @@ class TableSpec(BaseModel):
         return self
 
 
+class TableColumn(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: StrictStr
+    type: Literal["int", "float", "str"]
+    min: StrictInt | StrictFloat | None = None
+    max: StrictInt | StrictFloat | None = None
+
+
+class TableSummary(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    hash: StrictStr
+    columns: list[TableColumn]
+    row_count: StrictInt
+    size_bytes: StrictInt
+    sample: list[list[CellValue]] = Field(default_factory=list)
+    created_at: StrictStr
+
+
+class TableRef(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: StrictStr = Field(min_length=1)
+    hash: StrictStr = Field(pattern=r"^[0-9a-f]{64}$")
+    summary: TableSummary | None = None
+
+
+class TableRowPage(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    columns: list[StrictStr]
+    rows: list[list[CellValue]]
+    next_offset: StrictInt | None = None
+
+
 class ProblemSpec(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     text: StrictStr = Field(min_length=1)
     tables: list[TableSpec] = Field(default_factory=list)
+    table_refs: list[TableRef] = Field(default_factory=list)
 
 
 class LinearTerm(BaseModel):
@@ -85,21 +122,16 @@ class OptimizationModelIR(BaseModel):
     objective: Objective
 
     @model_validator(mode="after")
-    def validate_variables(self) -> "OptimizationModelIR":
-        names = [variable.name for variable in self.variables]
-        if len(set(names)) != len(names):
+    def validate_references(self) -> "OptimizationModelIR":
+        names = {variable.name for variable in self.variables}
+        if len(names) != len(self.variables):
             raise ValueError("variable names must be unique")
-        return self
-
-    @model_validator(mode="after")
-    def validate_terms(self) -> "OptimizationModelIR":
-        name_set = {variable.name for variable in self.variables}
         for constraint in self.constraints:
             for term in constraint.terms:
-                if term.var not in name_set:
+                if term.var not in names:
                     raise ValueError(f"constraint term references unknown variable: {term.var}")
         for term in self.objective.terms:
-            if term.var not in name_set:
+            if term.var not in names:
                 raise ValueError(f"objective term references unknown variable: {term.var}")
         return self
 
@@ -112,6 +144,34 @@ class SolveResult(BaseModel):
     variables: dict[StrictStr, StrictInt]
 
 
+class Incumbent(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    objective_value: StrictInt
+    best_bound: float
+    wall_time_seconds: float
+    variables: dict[StrictStr, StrictInt] | None = None
+
+
+class SolverOptions(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    max_seconds: StrictInt | None = Field(default=None, ge=1)
+    num_search_workers: StrictInt | None = Field(default=None, ge=1)
+    relative_gap_limit: float | None = Field(default=None, ge=0)
+    absolute_gap_limit: float | None = Field(default=None, ge=0)
+    random_seed: StrictInt | None = Field(default=None, ge=0, le=2**31 - 1)
+    linearization_level: StrictInt | None = Field(default=None, ge=0, le=2)
+    symmetry_level: StrictInt | None = Field(default=None, ge=0, le=4)
+
+
+class SolveRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    options: SolverOptions | None = None
+    warm_start: StrictStr | None = Field(default=None, min_length=1)
+
+
 class AuditEvent(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -129,6 +189,8 @@ class AuditLog(BaseModel):
 
 RunStatus = Literal["created", "ir_generated", "solved", "infeasible", "error"]
 
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
 
 class RunRecord(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -143,4 +205,133 @@ class RunRecord(BaseModel):
     audit: AuditLog
     error: StrictStr | None = None
     provider_name: StrictStr | None = None
-    provider_model: StrictStr | None = None
\ No newline at end of file
+    provider_model: StrictStr | None = None
+    solver_options: SolverOptions | None = None
+    incumbent: Incumbent | None = None
+    version: StrictInt = 0
+
+
+class RunSummary(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: StrictStr
+    status: RunStatus
+    created_at: StrictStr
+    updated_at: StrictStr
+    error: StrictStr | None = None
+    provider_name: StrictStr | None = None
+    provider_model: StrictStr | None = None
+
+
+class RunPage(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    items: list[RunSummary | RunRecord]
+    next_cursor: StrictStr | None = None
+
+
+class SolveJob(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: StrictStr
+    run_id: StrictStr
+    status: JobStatus
+    created_at: StrictStr
+    updated_at: StrictStr
+    error: StrictStr | None = None
+    warm_start: StrictStr | None = None
+    solver_options: SolverOptions | None = None
+
+
+class BatchItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    problem_spec: ProblemSpec | None = None
+    ir: dict[str, Any] | None = None
+    solve: bool = True
+    options: SolverOptions | None = None
+    warm_start: StrictStr | None = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def validate_source(self) -> "BatchItem":
+        if self.problem_spec is None and self.ir is None:
+            raise ValueError("batch items need a problem_spec or an ir")
+        return self
+
+
+class BatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    items: list[BatchItem] = Field(min_length=1)
+
+
+class BatchItemResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    index: StrictInt
+    run_id: StrictStr | None = None
+    status: RunStatus | None = None
+    job: SolveJob | None = None
+    error: StrictStr | None = None
+
+
+class BatchResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    items: list[BatchItemResult]
+
+
+SweepStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class SweepParameter(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["rhs", "lower_bound", "upper_bound", "objective_coeff"]
+    target: StrictStr | StrictInt
+    values: list[StrictInt] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "SweepParameter":
+        if self.kind == "rhs" and not isinstance(self.target, int):
+            raise ValueError("rhs sweeps target a constraint index")
+        if self.kind != "rhs" and not isinstance(self.target, str):
+            raise ValueError(f"{self.kind} sweeps target a variable name")
+        return self
+
+
+class SweepRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    parameters: list[SweepParameter] = Field(min_length=1)
+    options: SolverOptions | None = None
+
+
+class Sweep(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: StrictStr
+    run_id: StrictStr
+    status: SweepStatus
+    created_at: StrictStr
+    updated_at: StrictStr
+    scenario_count: StrictInt
+    completed: StrictInt = 0
+    error: StrictStr | None = None
+
+
+class SweepScenario(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    index: StrictInt
+    values: list[StrictInt]
+    status: Literal["optimal", "feasible", "infeasible", "unknown"]
+    objective_value: StrictInt | None = None
+    variables: dict[StrictStr, StrictInt] | None = None
+
+
+class SweepScenarioPage(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    items: list[SweepScenario]
+    next_offset: StrictInt | None = None
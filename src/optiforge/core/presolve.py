@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import dataclasses
+from array import array
+from typing import Any
+
+from optiforge.core.columnar import OPERATOR_CODES, OPERATORS, ColumnarIR, ir_to_columnar
+from optiforge.core.decompose import solve_decomposed
+from optiforge.core.metrics import Profile
+from optiforge.core.models import OptimizationModelIR, SolveResult, SolverOptions
+from optiforge.core.solver import IncumbentCallback, solve_ir
+
+_LESS_EQUAL = OPERATOR_CODES["<="]
+_GREATER_EQUAL = OPERATOR_CODES[">="]
+_EQUAL = OPERATOR_CODES["="]
+_MAX_ROUNDS = 8
+
+
+class PresolveInfeasible(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class PresolveResult:
+    original: ColumnarIR
+    columnar: ColumnarIR | None
+    fixed_values: dict[str, int]
+    stats: dict[str, Any]
+
+    @property
+    def infeasible(self) -> bool:
+        return self.columnar is None
+
+    def postsolve(self, result: SolveResult) -> SolveResult:
+        if result.status not in {"optimal", "feasible"}:
+            return result
+        values = {**result.variables, **self.fixed_values}
+        variables = {name: values[name] for name in self.original.var_names}
+        objective = self.original.objective_constant
+        for index, coeff in zip(
+            self.original.objective_indices, self.original.objective_coefficients
+        ):
+            objective += coeff * variables[self.original.var_names[index]]
+        return SolveResult(status=result.status, objective_value=objective, variables=variables)
+
+
+def presolve_ir(ir: ColumnarIR) -> PresolveResult:
+    state = _State(ir)
+    try:
+        state.run()
+    except PresolveInfeasible as exc:
+        state.stats["infeasible"] = True
+        state.stats["reason"] = str(exc)
+        return PresolveResult(ir, None, {}, state.stats)
+    columnar, fixed_values = state.reduced()
+    state.stats.update(
+        rows_after=columnar.num_constraints,
+        variables_after=columnar.num_variables,
+        nonzeros_after=columnar.num_nonzeros,
+    )
+    return PresolveResult(ir, columnar, fixed_values, state.stats)
+
+
+def solve_model(
+    ir: OptimizationModelIR | ColumnarIR,
+    max_seconds: int,
+    options: SolverOptions | None = None,
+    on_incumbent: IncumbentCallback | None = None,
+    hint: dict[str, int] | None = None,
+    presolve: bool = True,
+    profile: Profile | None = None,
+    decompose: bool = False,
+) -> tuple[SolveResult, dict[str, Any] | None]:
+    profile = profile or Profile()
+    if not presolve:
+        return _solve(ir, max_seconds, options, on_incumbent, hint, profile, decompose), None
+    with profile.stage("presolve"):
+        if not isinstance(ir, ColumnarIR):
+            ir = ir_to_columnar(ir)
+        reduction = presolve_ir(ir)
+    if reduction.columnar is None:
+        infeasible = SolveResult(status="infeasible", objective_value=None, variables={})
+        return infeasible, reduction.stats
+    listener = on_incumbent
+    if on_incumbent is not None and reduction.fixed_values:
+        listener = _with_fixed_values(on_incumbent, reduction.fixed_values)
+    result = _solve(
+        reduction.columnar, max_seconds, options, listener, hint, profile, decompose
+    )
+    with profile.stage("postsolve"):
+        return reduction.postsolve(result), reduction.stats
+
+
+def _solve(
+    ir: OptimizationModelIR | ColumnarIR,
+    max_seconds: int,
+    options: SolverOptions | None,
+    on_incumbent: IncumbentCallback | None,
+    hint: dict[str, int] | None,
+    profile: Profile,
+    decompose: bool,
+) -> SolveResult:
+    if decompose:
+        if not isinstance(ir, ColumnarIR):
+            ir = ir_to_columnar(ir)
+        result = solve_decomposed(ir, max_seconds, options, on_incumbent, hint, profile)
+        if result is not None:
+            return result
+    return solve_ir(ir, max_seconds, options, on_incumbent, hint, profile)
+
+
+def _with_fixed_values(
+    on_incumbent: IncumbentCallback, fixed_values: dict[str, int]
+) -> IncumbentCallback:
+    def listener(incumbent, values):
+        on_incumbent(incumbent, lambda: {**values(), **fixed_values})
+
+    return listener
+
+
+class _State:
+    def __init__(self, ir: ColumnarIR) -> None:
+        self.ir = ir
+        self.lower = list(ir.lower_bounds)
+        self.upper = list(ir.upper_bounds)
+        self.operators = list(ir.operators)
+        self.rhs = list(ir.rhs)
+        self.active = [True] * ir.num_constraints
+        self.stats: dict[str, Any] = {
+            "rows_before": ir.num_constraints,
+            "variables_before": ir.num_variables,
+            "nonzeros_before": ir.num_nonzeros,
+            "rounds": 0,
+            "merged_terms": 0,
+            "dropped_zero_terms": 0,
+            "substituted_terms": 0,
+            "empty_rows": 0,
+            "singleton_rows": 0,
+            "redundant_rows": 0,
+            "duplicate_rows": 0,
+            "tightened_bounds": 0,
+            "removed_variables": 0,
+            "infeasible": False,
+        }
+        self.rows = [self._merge(*ir.row(index)) for index in range(ir.num_constraints)]
+        self.objective = self._merge(ir.objective_indices, ir.objective_coefficients)
+
+    def _merge(self, indices: array, coefficients: array) -> dict[int, int]:
+        merged: dict[int, int] = {}
+        for index, coeff in zip(indices, coefficients):
+            if index in merged:
+                self.stats["merged_terms"] += 1
+            merged[index] = merged.get(index, 0) + coeff
+        for index in [index for index, coeff in merged.items() if coeff == 0]:
+            del merged[index]
+            self.stats["dropped_zero_terms"] += 1
+        return merged
+
+    def run(self) -> None:
+        self._check_bounds()
+        for _ in range(_MAX_ROUNDS):
+            self.stats["rounds"] += 1
+            changed = False
+            for index, row in enumerate(self.rows):
+                if self.active[index] and self._reduce_row(index, row):
+                    changed = True
+            self._check_bounds()
+            if self._drop_duplicate_rows():
+                changed = True
+            if not changed:
+                return
+
+    def _reduce_row(self, index: int, row: dict[int, int]) -> bool:
+        changed = False
+        for col in [col for col in row if self.lower[col] == self.upper[col]]:
+            self.rhs[index] -= row.pop(col) * self.lower[col]
+            self.stats["substituted_terms"] += 1
+            changed = True
+        code = self.operators[index]
+        rhs = self.rhs[index]
+        if not row:
+            if not _satisfied(code, 0, rhs):
+                message = f"constraint {index} reduces to 0 {OPERATORS[code]} {rhs}"
+                raise PresolveInfeasible(message)
+            self.active[index] = False
+            self.stats["empty_rows"] += 1
+            return True
+        if len(row) == 1:
+            col, coeff = next(iter(row.items()))
+            self._tighten(col, coeff, code, rhs, index)
+            self.active[index] = False
+            self.stats["singleton_rows"] += 1
+            return True
+        minimum = sum(c * (self.lower[v] if c > 0 else self.upper[v]) for v, c in row.items())
+        maximum = sum(c * (self.upper[v] if c > 0 else self.lower[v]) for v, c in row.items())
+        if _violated(code, minimum, maximum, rhs):
+            raise PresolveInfeasible(f"constraint {index} cannot be satisfied within bounds")
+        if _implied(code, minimum, maximum, rhs):
+            self.active[index] = False
+            self.stats["redundant_rows"] += 1
+            return True
+        return changed
+
+    def _tighten(self, col: int, coeff: int, code: int, rhs: int, index: int) -> None:
+        lower = self.lower[col]
+        upper = self.upper[col]
+        if code == _EQUAL:
+            if rhs % coeff:
+                raise PresolveInfeasible(f"constraint {index} has no integer solution")
+            lower = max(lower, rhs // coeff)
+            upper = min(upper, rhs // coeff)
+        floor = rhs // coeff
+        ceil = -(-rhs // coeff)
+        if code == _LESS_EQUAL and coeff > 0:
+            upper = min(upper, floor)
+        if code == _LESS_EQUAL and coeff < 0:
+            lower = max(lower, ceil)
+        if code == _GREATER_EQUAL and coeff > 0:
+            lower = max(lower, ceil)
+        if code == _GREATER_EQUAL and coeff < 0:
+            upper = min(upper, floor)
+        if (lower, upper) != (self.lower[col], self.upper[col]):
+            self.stats["tightened_bounds"] += 1
+        self.lower[col] = lower
+        self.upper[col] = upper
+
+    def _check_bounds(self) -> None:
+        for col, (lower, upper) in enumerate(zip(self.lower, self.upper)):
+            if lower > upper:
+                name = self.ir.var_names[col]
+                raise PresolveInfeasible(f"variable {name} has empty domain [{lower}, {upper}]")
+
+    def _drop_duplicate_rows(self) -> bool:
+        kept: dict[tuple[Any, ...], int] = {}
+        changed = False
+        for index, row in enumerate(self.rows):
+            if not self.active[index]:
+                continue
+            key = (self.operators[index], tuple(sorted(row.items())))
+            if key not in kept:
+                kept[key] = index
+                continue
+            first = kept[key]
+            code = self.operators[index]
+            if code == _EQUAL and self.rhs[first] != self.rhs[index]:
+                raise PresolveInfeasible(f"constraints {first} and {index} are contradictory")
+            if code == _LESS_EQUAL:
+                self.rhs[first] = min(self.rhs[first], self.rhs[index])
+            if code == _GREATER_EQUAL:
+                self.rhs[first] = max(self.rhs[first], self.rhs[index])
+            self.active[index] = False
+            self.stats["duplicate_rows"] += 1
+            changed = True
+        return changed
+
+    def reduced(self) -> tuple[ColumnarIR, dict[str, int]]:
+        used = set()
+        for index, row in enumerate(self.rows):
+            if self.active[index]:
+                used.update(row)
+        names = self.ir.var_names
+        fixed_values = {}
+        constant = self.ir.objective_constant
+        positions: dict[int, int] = {}
+        for col in range(self.ir.num_variables):
+            if col in used:
+                positions[col] = len(positions)
+                continue
+            value = self._best_value(col)
+            fixed_values[names[col]] = value
+            constant += self.objective.get(col, 0) * value
+        self.stats["removed_variables"] = len(fixed_values)
+        row_offsets = array("q", [0])
+        col_indices = array("q")
+        coefficients = array("q")
+        rhs = array("q")
+        operators = array("b")
+        for index, row in enumerate(self.rows):
+            if not self.active[index]:
+                continue
+            col_indices.extend([positions[col] for col in row])
+            coefficients.extend(row.values())
+            row_offsets.append(len(col_indices))
+            rhs.append(self.rhs[index])
+            operators.append(self.operators[index])
+        kept = list(positions)
+        objective = [
+            (positions[col], coeff) for col, coeff in self.objective.items() if col in used
+        ]
+        columnar = ColumnarIR(
+            version=self.ir.version,
+            name=self.ir.name,
+            description=self.ir.description,
+            var_names=[names[col] for col in kept],
+            lower_bounds=array("q", [self.lower[col] for col in kept]),
+            upper_bounds=array("q", [self.upper[col] for col in kept]),
+            row_offsets=row_offsets,
+            col_indices=col_indices,
+            coefficients=coefficients,
+            rhs=rhs,
+            operators=operators,
+            objective_sense=self.ir.objective_sense,
+            objective_indices=array("q", [index for index, _ in objective]),
+            objective_coefficients=array("q", [coeff for _, coeff in objective]),
+            objective_constant=constant,
+        )
+        return columnar, fixed_values
+
+    def _best_value(self, col: int) -> int:
+        coeff = self.objective.get(col, 0)
+        if self.ir.objective_sense == "maximize":
+            coeff = -coeff
+        if coeff > 0:
+            return self.lower[col]
+        if coeff < 0:
+            return self.upper[col]
+        return min(max(0, self.lower[col]), self.upper[col])
+
+
+def _satisfied(code: int, value: int, rhs: int) -> bool:
+    if code == _LESS_EQUAL:
+        return value <= rhs
+    if code == _GREATER_EQUAL:
+        return value >= rhs
+    return value == rhs
+
+
+def _violated(code: int, minimum: int, maximum: int, rhs: int) -> bool:
+    if code == _LESS_EQUAL:
+        return minimum > rhs
+    if code == _GREATER_EQUAL:
+        return maximum < rhs
+    return rhs < minimum or rhs > maximum
+
+
+def _implied(code: int, minimum: int, maximum: int, rhs: int) -> bool:
+    if code == _LESS_EQUAL:
+        return maximum <= rhs
+    if code == _GREATER_EQUAL:
+        return minimum >= rhs
+    return minimum == maximum == rhs
@@ -1,52 +1,180 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import json
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
 from typing import Any, Protocol
 
 import httpx
 
-from optiforge.core.models import ProblemSpec
+from optiforge.core.config import Settings
+from optiforge.core.ir_stream import IRStreamParser
+from optiforge.core.models import OptimizationModelIR, ProblemSpec
 
 
 class ChatProvider(Protocol):
-    def generate_ir(self, spec: ProblemSpec) -> dict[str, Any]:
+    def generate_ir(self, spec: ProblemSpec) -> dict[str, Any] | OptimizationModelIR:
+        ...
+
+
+class AsyncChatProvider(Protocol):
+    async def generate_ir(self, spec: ProblemSpec) -> dict[str, Any] | OptimizationModelIR:
         ...
 
 
 class OpenAIChatProvider:
-    def __init__(self, base_url: str, api_key: str | None, model: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None,
+        model: str,
+        client: httpx.Client | None = None,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 0.5,
+        retry_max_backoff_seconds: float = 30.0,
+        stream: bool = False,
+    ) -> None:
         if not api_key:
             raise ValueError("provider_api_key is required for the openai provider")
         self._base_url = base_url.rstrip("/")
         self._api_key = api_key
         self._model = model
-        self._client = httpx.Client(timeout=30.0)
+        self._client = client or httpx.Client(timeout=30.0)
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._stream = stream
 
-    def generate_ir(self, spec: ProblemSpec) -> dict[str, Any]:
-        payload = {
-            "model": self._model,
-            "messages": _build_messages(spec),
-            "temperature": 0.0,
-        }
-        response = self._client.post(
-            f"{self._base_url}/v1/chat/completions",
-            headers={"Authorization": f"Bearer {self._api_key}"},
-            json=payload,
+    def _retry_delay(self, response: httpx.Response | None, attempt: int) -> float:
+        return _retry_delay(
+            response, attempt, self._retry_backoff_seconds, self._retry_max_backoff_seconds
         )
-        if response.status_code >= 400:
-            raise ValueError(f"provider error: {response.status_code}")
-        data = response.json()
-        choices = data.get("choices")
-        if not choices:
-            raise ValueError("provider response missing choices")
-        message = choices[0].get("message")
-        if not message:
-            raise ValueError("provider response missing message")
-        content = message.get("content")
-        if not content:
-            raise ValueError("provider response missing content")
-        cleaned = _extract_json(content)
-        return json.loads(cleaned)
+
+    def generate_ir(self, spec: ProblemSpec) -> dict[str, Any] | OptimizationModelIR:
+        payload = _completion_payload(self._model, spec)
+        if self._stream:
+            return self._stream_with_retry({**payload, "stream": True})
+        response = self._post_with_retry(payload)
+        return _parse_completion(response)
+
+    def _stream_with_retry(self, payload: dict[str, Any]) -> OptimizationModelIR:
+        attempt = 0
+        while True:
+            try:
+                with self._client.stream(
+                    "POST",
+                    f"{self._base_url}/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    json=payload,
+                ) as response:
+                    if not _is_retryable(response) or attempt >= self._max_retries:
+                        return _parse_stream(response, response.iter_lines())
+                    delay = self._retry_delay(response, attempt)
+            except httpx.TransportError:
+                if attempt >= self._max_retries:
+                    raise
+                delay = self._retry_delay(None, attempt)
+            time.sleep(delay)
+            attempt += 1
+
+    def _post_with_retry(self, payload: dict[str, Any]) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._client.post(
+                    f"{self._base_url}/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    json=payload,
+                )
+            except httpx.TransportError:
+                if attempt >= self._max_retries:
+                    raise
+                time.sleep(self._retry_delay(None, attempt))
+                attempt += 1
+                continue
+            if not _is_retryable(response) or attempt >= self._max_retries:
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+
+
+class AsyncOpenAIChatProvider:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None,
+        model: str,
+        client: httpx.AsyncClient | None = None,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 0.5,
+        retry_max_backoff_seconds: float = 30.0,
+        stream: bool = False,
+    ) -> None:
+        if not api_key:
+            raise ValueError("provider_api_key is required for the openai provider")
+        self._base_url = base_url.rstrip("/")
+        self._api_key = api_key
+        self._model = model
+        self._client = client or httpx.AsyncClient(timeout=30.0)
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._stream = stream
+
+    def _retry_delay(self, response: httpx.Response | None, attempt: int) -> float:
+        return _retry_delay(
+            response, attempt, self._retry_backoff_seconds, self._retry_max_backoff_seconds
+        )
+
+    async def generate_ir(self, spec: ProblemSpec) -> dict[str, Any] | OptimizationModelIR:
+        payload = _completion_payload(self._model, spec)
+        if self._stream:
+            return await self._stream_with_retry({**payload, "stream": True})
+        response = await self._post_with_retry(payload)
+        return _parse_completion(response)
+
+    async def _stream_with_retry(self, payload: dict[str, Any]) -> OptimizationModelIR:
+        attempt = 0
+        while True:
+            try:
+                async with self._client.stream(
+                    "POST",
+                    f"{self._base_url}/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    json=payload,
+                ) as response:
+                    if not _is_retryable(response) or attempt >= self._max_retries:
+                        return await _parse_stream_async(response, response.aiter_lines())
+                    delay = self._retry_delay(response, attempt)
+            except httpx.TransportError:
+                if attempt >= self._max_retries:
+                    raise
+                delay = self._retry_delay(None, attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _post_with_retry(self, payload: dict[str, Any]) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.post(
+                    f"{self._base_url}/v1/chat/completions",
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    json=payload,
+                )
+            except httpx.TransportError:
+                if attempt >= self._max_retries:
+                    raise
+                await asyncio.sleep(self._retry_delay(None, attempt))
+                attempt += 1
+                continue
+            if not _is_retryable(response) or attempt >= self._max_retries:
+                return response
+            await asyncio.sleep(self._retry_delay(response, attempt))
+            attempt += 1
 
 
 class StubProvider:
@@ -82,6 +210,112 @@ class StubProvider:
         }
 
 
+class AsyncStubProvider:
+    def __init__(self) -> None:
+        self._stub = StubProvider()
+
+    async def generate_ir(self, spec: ProblemSpec) -> dict[str, Any]:
+        return self._stub.generate_ir(spec)
+
+
+class ProviderRegistry:
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._provider: ChatProvider | None = None
+        self._async_provider: AsyncChatProvider | None = None
+
+    def get(self) -> ChatProvider:
+        with self._lock:
+            if self._provider is None:
+                self._provider = self._build()
+            return self._provider
+
+    def get_async(self) -> AsyncChatProvider:
+        with self._lock:
+            if self._async_provider is None:
+                self._async_provider = self._build_async()
+            return self._async_provider
+
+    def close(self) -> None:
+        with self._lock:
+            client = self._client
+            self._client = None
+            self._provider = None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            client = self._async_client
+            self._async_client = None
+            self._async_provider = None
+        if client is not None:
+            await client.aclose()
+
+    def _build(self) -> ChatProvider:
+        settings = self._settings
+        if settings.provider != "openai":
+            return get_provider(
+                settings.provider, settings.provider_base_url, None, settings.provider_model
+            )
+        if self._client is None:
+            self._client = build_http_client(settings)
+        return OpenAIChatProvider(
+            base_url=settings.provider_base_url,
+            api_key=_api_key(settings),
+            model=settings.provider_model,
+            client=self._client,
+            max_retries=settings.provider_max_retries,
+            retry_backoff_seconds=settings.provider_retry_backoff_seconds,
+            retry_max_backoff_seconds=settings.provider_retry_max_backoff_seconds,
+            stream=settings.provider_stream,
+        )
+
+    def _build_async(self) -> AsyncChatProvider:
+        settings = self._settings
+        if settings.provider != "openai":
+            return get_async_provider(
+                settings.provider, settings.provider_base_url, None, settings.provider_model
+            )
+        if self._async_client is None:
+            self._async_client = build_async_http_client(settings)
+        return AsyncOpenAIChatProvider(
+            base_url=settings.provider_base_url,
+            api_key=_api_key(settings),
+            model=settings.provider_model,
+            client=self._async_client,
+            max_retries=settings.provider_max_retries,
+            retry_backoff_seconds=settings.provider_retry_backoff_seconds,
+            retry_max_backoff_seconds=settings.provider_retry_max_backoff_seconds,
+            stream=settings.provider_stream,
+        )
+
+
+def build_http_client(settings: Settings) -> httpx.Client:
+    return httpx.Client(**_client_options(settings))
+
+
+def build_async_http_client(settings: Settings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(**_client_options(settings))
+
+
+def _client_options(settings: Settings) -> dict[str, Any]:
+    timeout = httpx.Timeout(
+        settings.provider_read_timeout_seconds,
+        connect=settings.provider_connect_timeout_seconds,
+    )
+    limits = httpx.Limits(
+        max_connections=settings.provider_max_connections,
+        max_keepalive_connections=settings.provider_max_keepalive_connections,
+        keepalive_expiry=settings.provider_keepalive_expiry_seconds,
+    )
+    http2 = settings.provider_http2 and importlib.util.find_spec("h2") is not None
+    return {"timeout": timeout, "limits": limits, "http2": http2}
+
+
 def get_provider(provider: str, base_url: str, api_key: str | None, model: str) -> ChatProvider:
     if provider == "stub":
         return StubProvider()
@@ -90,6 +324,97 @@ def get_provider(provider: str, base_url: str, api_key: str | None, model: str)
     raise ValueError(f"unknown provider: {provider}")
 
 
+def get_async_provider(
+    provider: str, base_url: str, api_key: str | None, model: str
+) -> AsyncChatProvider:
+    if provider == "stub":
+        return AsyncStubProvider()
+    if provider == "openai":
+        return AsyncOpenAIChatProvider(base_url=base_url, api_key=api_key, model=model)
+    raise ValueError(f"unknown provider: {provider}")
+
+
+def _api_key(settings: Settings) -> str | None:
+    if not settings.provider_api_key:
+        return None
+    return settings.provider_api_key.get_secret_value()
+
+
+def _completion_payload(model: str, spec: ProblemSpec) -> dict[str, Any]:
+    return {
+        "model": model,
+        "messages": _build_messages(spec),
+        "temperature": 0.0,
+    }
+
+
+def _parse_completion(response: httpx.Response) -> dict[str, Any]:
+    _raise_for_status(response)
+    data = response.json()
+    choices = data.get("choices")
+    if not choices:
+        raise ValueError("provider response missing choices")
+    message = choices[0].get("message")
+    if not message:
+        raise ValueError("provider response missing message")
+    content = message.get("content")
+    if not content:
+        raise ValueError("provider response missing content")
+    cleaned = _extract_json(content)
+    return json.loads(cleaned)
+
+
+def _parse_stream(response: httpx.Response, lines: Iterator[str]) -> OptimizationModelIR:
+    _raise_for_status(response)
+    completion = _StreamedCompletion()
+    for line in lines:
+        if completion.feed_line(line):
+            break
+    return completion.finish()
+
+
+async def _parse_stream_async(
+    response: httpx.Response, lines: AsyncIterator[str]
+) -> OptimizationModelIR:
+    _raise_for_status(response)
+    completion = _StreamedCompletion()
+    async for line in lines:
+        if completion.feed_line(line):
+            break
+    return completion.finish()
+
+
+class _StreamedCompletion:
+    def __init__(self) -> None:
+        self._parser = IRStreamParser()
+        self._received = False
+
+    def feed_line(self, line: str) -> bool:
+        if not line.startswith("data:"):
+            return False
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return True
+        choices = json.loads(data).get("choices")
+        if not choices:
+            return False
+        content = (choices[0].get("delta") or {}).get("content")
+        if content:
+            self._received = True
+            self._parser.feed(content)
+        return False
+
+    def finish(self) -> OptimizationModelIR:
+        if not self._received:
+            raise ValueError("provider response missing content")
+        return self._parser.finish()
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    if response.status_code >= 400:
+        raise ValueError(f"provider error: {response.status_code}")
+
+
 def _build_messages(spec: ProblemSpec) -> list[dict[str, str]]:
     instruction = (
         "Return ONLY valid JSON matching the OptimizationModelIR schema. "
@@ -109,4 +434,22 @@ def _extract_json(content: str) -> str:
         if line.strip().startswith("```"):
             continue
         lines.append(line)
-    return "\n".join(lines).strip()
\ No newline at end of file
+    return "\n".join(lines).strip()
+
+
+def _is_retryable(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _retry_delay(
+    response: httpx.Response | None,
+    attempt: int,
+    backoff_seconds: float,
+    max_backoff_seconds: float,
+) -> float:
+    delay = backoff_seconds * (2**attempt)
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+    return min(delay, max_backoff_seconds)
@@ -1,50 +1,342 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from typing import Any
+
+from optiforge.core.cache import SolutionCache, solve_cache_key
 from optiforge.core.config import Settings
-from optiforge.core.models import ProblemSpec, RunRecord
-from optiforge.core.provider import get_provider
-from optiforge.core.solver import solve_ir
-from optiforge.core.storage import RunStore
+from optiforge.core.incumbents import IncumbentRecorder
+from optiforge.core.ir_cache import IRCache, ir_cache_key
+from optiforge.core.metrics import MetricsRegistry, Profile
+from optiforge.core.models import (
+    OptimizationModelIR,
+    ProblemSpec,
+    RunRecord,
+    SolveResult,
+    SolverOptions,
+)
+from optiforge.core.provider import ProviderRegistry
+from optiforge.core.presolve import solve_model
+from optiforge.core.solver import build_hint
+from optiforge.core.storage import RunConflictError, RunStore
+from optiforge.core.tables import TableStore
 from optiforge.core.validation import validate_ir_json
 
 
-def create_run(problem_spec: ProblemSpec, settings: Settings, store: RunStore) -> RunRecord:
+def create_run(
+    problem_spec: ProblemSpec,
+    settings: Settings,
+    store: RunStore,
+    tables: TableStore | None = None,
+) -> RunRecord:
+    problem_spec = resolve_table_refs(problem_spec, tables)
     run_id = store.create_run(problem_spec, settings.provider, settings.provider_model)
     return store.get_run(run_id)
 
 
-def generate_ir(run_id: str, settings: Settings, store: RunStore) -> RunRecord:
-    run = store.get_run(run_id)
-    api_key = None
-    if settings.provider_api_key:
-        api_key = settings.provider_api_key.get_secret_value()
-    provider = get_provider(
-        settings.provider,
-        settings.provider_base_url,
-        api_key,
-        settings.provider_model,
+def resolve_table_refs(problem_spec: ProblemSpec, tables: TableStore | None) -> ProblemSpec:
+    if not problem_spec.table_refs:
+        return problem_spec
+    if tables is None:
+        raise ValueError("table references require the table store")
+    missing = tables.missing(ref.hash for ref in problem_spec.table_refs)
+    if missing:
+        raise ValueError(f"unknown tables: {', '.join(missing)}")
+    refs = [ref.model_copy(update={"summary": None}) for ref in problem_spec.table_refs]
+    return problem_spec.model_copy(update={"table_refs": refs})
+
+
+def attach_table_summaries(problem_spec: ProblemSpec, tables: TableStore | None) -> ProblemSpec:
+    if not problem_spec.table_refs or tables is None:
+        return problem_spec
+    refs = [
+        ref.model_copy(update={"summary": tables.get_summary(ref.hash)})
+        for ref in problem_spec.table_refs
+    ]
+    return problem_spec.model_copy(update={"table_refs": refs})
+
+
+def generate_ir(
+    run_id: str,
+    settings: Settings,
+    store: RunStore,
+    providers: ProviderRegistry,
+    ir_cache: IRCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    tables: TableStore | None = None,
+) -> RunRecord:
+    profile = Profile()
+    with profile.stage("load"):
+        run = store.get_run(run_id)
+    cache_key = ir_cache_key(settings.provider, settings.provider_model, run.problem_spec)
+    try:
+        spec = attach_table_summaries(run.problem_spec, tables)
+        ir, cache_hit = _generate_validated_ir(
+            spec, settings, ir_cache, cache_key, providers, profile
+        )
+    except Exception as exc:
+        record_error(store, run_id, str(exc), run.version)
+        observe_profile(metrics, "generate", profile, "error")
+        raise
+    details = {"ir_cache_hit": cache_hit, "timings": profile.to_dict()["stages"]}
+    with profile.stage("persist"):
+        run = store.update_run_ir(
+            run_id, ir, settings.provider, settings.provider_model, details, run.version
+        )
+    observe_profile(metrics, "generate", profile, "cache_hit" if cache_hit else "success")
+    return run
+
+
+def _generate_validated_ir(
+    spec: ProblemSpec,
+    settings: Settings,
+    ir_cache: IRCache | None,
+    cache_key: str,
+    providers: ProviderRegistry,
+    profile: Profile,
+) -> tuple[OptimizationModelIR, bool]:
+    def generate() -> OptimizationModelIR:
+        provider = providers.get()
+        with profile.stage("provider"):
+            ir_data = provider.generate_ir(spec)
+        if isinstance(ir_data, OptimizationModelIR):
+            return ir_data
+        with profile.stage("validation"):
+            return validate_ir_json(ir_data)
+
+    if ir_cache is None:
+        return generate(), False
+    return ir_cache.get_or_generate(cache_key, generate)
+
+
+async def generate_ir_async(
+    run_id: str,
+    settings: Settings,
+    store: RunStore,
+    providers: ProviderRegistry,
+    ir_cache: IRCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    tables: TableStore | None = None,
+) -> RunRecord:
+    profile = Profile()
+    with profile.stage("load"):
+        run = await asyncio.to_thread(store.get_run, run_id)
+    cache_key = ir_cache_key(settings.provider, settings.provider_model, run.problem_spec)
+    try:
+        spec = await asyncio.to_thread(attach_table_summaries, run.problem_spec, tables)
+        ir, cache_hit = await _generate_validated_ir_async(
+            spec, settings, ir_cache, cache_key, providers, profile
+        )
+    except Exception as exc:
+        await asyncio.to_thread(record_error, store, run_id, str(exc), run.version)
+        observe_profile(metrics, "generate", profile, "error")
+        raise
+    details = {"ir_cache_hit": cache_hit, "timings": profile.to_dict()["stages"]}
+    with profile.stage("persist"):
+        run = await asyncio.to_thread(
+            store.update_run_ir,
+            run_id,
+            ir,
+            settings.provider,
+            settings.provider_model,
+            details,
+            run.version,
+        )
+    observe_profile(metrics, "generate", profile, "cache_hit" if cache_hit else "success")
+    return run
+
+
+async def _generate_validated_ir_async(
+    spec: ProblemSpec,
+    settings: Settings,
+    ir_cache: IRCache | None,
+    cache_key: str,
+    providers: ProviderRegistry,
+    profile: Profile,
+) -> tuple[OptimizationModelIR, bool]:
+    async def generate() -> OptimizationModelIR:
+        provider = providers.get_async()
+        with profile.stage("provider"):
+            ir_data = await provider.generate_ir(spec)
+        if isinstance(ir_data, OptimizationModelIR):
+            return ir_data
+        with profile.stage("validation"):
+            return await asyncio.to_thread(validate_ir_json, ir_data)
+
+    if ir_cache is None:
+        return await generate(), False
+    return await ir_cache.get_or_generate_async(cache_key, generate)
+
+
+def solve_run(
+    run_id: str,
+    settings: Settings,
+    store: RunStore,
+    cache: SolutionCache | None = None,
+    options: SolverOptions | None = None,
+    warm_start: str | None = None,
+    metrics: MetricsRegistry | None = None,
+) -> RunRecord:
+    profile = Profile()
+    with profile.stage("load"):
+        run = load_solvable_run(run_id, store)
+    effective = effective_solver_options(options or run.solver_options, settings)
+    with profile.stage("cache_lookup"):
+        cache_key = solve_cache_key(run.ir, solver_params(effective))
+        cached = lookup_solution(cache, cache_key)
+    if cached is not None:
+        record = record_solution(
+            run_id,
+            cached,
+            store,
+            cache_key=cache_key,
+            cache_hit=True,
+            options=effective,
+            profile=profile,
+            expected_version=run.version,
+        )
+        observe_profile(metrics, "solve", profile, "cache_hit")
+        return record
+    recorder = IncumbentRecorder(
+        store, run_id, persist_seconds=settings.solver_incumbent_persist_seconds
     )
     try:
-        ir_data = provider.generate_ir(run.problem_spec)
-        ir = validate_ir_json(ir_data)
+        with profile.stage("warm_start"):
+            hint, warm_details = resolve_warm_start(run, warm_start, store)
+        recorder.start()
+        result, presolve_stats = solve_model(
+            run.ir,
+            effective.max_seconds,
+            effective,
+            recorder,
+            hint,
+            settings.solver_presolve,
+            profile,
+            settings.solver_decompose,
+        )
+        recorder.flush()
     except Exception as exc:
-        store.update_run_error(run_id, str(exc))
+        record_error(store, run_id, str(exc), run.version)
+        observe_profile(metrics, "solve", profile, "error")
         raise
-    return store.update_run_ir(run_id, ir, settings.provider, settings.provider_model)
+    if cache is not None:
+        cache.put(cache_key, result)
+    record = record_solution(
+        run_id,
+        result,
+        store,
+        cache_key=cache_key,
+        options=effective,
+        warm_start=warm_details,
+        presolve=presolve_stats,
+        profile=profile,
+        expected_version=run.version,
+    )
+    observe_profile(metrics, "solve", profile, "success")
+    return record
 
 
-def solve_run(run_id: str, settings: Settings, store: RunStore) -> RunRecord:
+def load_solvable_run(run_id: str, store: RunStore) -> RunRecord:
     run = store.get_run(run_id)
     if run.ir is None:
         raise ValueError("run has no IR to solve")
-    try:
-        result = solve_ir(run.ir, settings.solver_max_seconds)
-    except Exception as exc:
-        store.update_run_error(run_id, str(exc))
-        raise
+    return run
+
+
+def resolve_warm_start(
+    run: RunRecord, warm_start: str | None, store: RunStore
+) -> tuple[dict[str, int] | None, dict[str, Any] | None]:
+    if warm_start is None:
+        return None, None
+    source_id: str | None = warm_start
+    if warm_start == "auto":
+        source_id = store.find_warm_start_run(run.id)
+    details: dict[str, Any] = {
+        "mode": "auto" if warm_start == "auto" else "run",
+        "source_run_id": source_id,
+    }
+    solution = None
+    if source_id is not None:
+        try:
+            solution = store.get_run(source_id, ["solution"]).solution
+        except KeyError:
+            solution = None
+    if solution is None or not solution.variables:
+        details.update(hint="rejected", hinted_variables=0)
+        return None, details
+    hint, completeness = build_hint(run.ir, solution.variables)
+    details.update(hint=completeness, hinted_variables=len(hint))
+    return hint or None, details
+
+
+def effective_solver_options(options: SolverOptions | None, settings: Settings) -> SolverOptions:
+    requested = options or SolverOptions()
+    max_seconds = min(
+        requested.max_seconds or settings.solver_max_seconds, settings.solver_max_seconds
+    )
+    workers = min(
+        requested.num_search_workers or settings.solver_max_search_workers,
+        settings.solver_max_search_workers,
+    )
+    return requested.model_copy(update={"max_seconds": max_seconds, "num_search_workers": workers})
+
+
+def solver_params(options: SolverOptions) -> dict[str, Any]:
+    return options.model_dump(exclude_none=True)
+
+
+def lookup_solution(cache: SolutionCache | None, cache_key: str) -> SolveResult | None:
+    if cache is None:
+        return None
+    return cache.get(cache_key)
+
+
+def record_solution(
+    run_id: str,
+    result: SolveResult,
+    store: RunStore,
+    cache_key: str | None = None,
+    cache_hit: bool = False,
+    options: SolverOptions | None = None,
+    warm_start: dict[str, Any] | None = None,
+    presolve: dict[str, Any] | None = None,
+    profile: Profile | None = None,
+    expected_version: int | None = None,
+) -> RunRecord:
     status = "solved"
     if result.status == "infeasible":
         status = "infeasible"
     if result.status == "unknown":
         status = "error"
-    return store.update_run_solution(run_id, result, status)
+    details: dict[str, Any] = {"cache_hit": cache_hit, "cache_key": cache_key}
+    if options is not None:
+        details["solver_options"] = solver_params(options)
+    if warm_start is not None:
+        details["warm_start"] = warm_start
+    if presolve is not None:
+        details["presolve"] = presolve
+    if profile is None:
+        return store.update_run_solution(run_id, result, status, details, expected_version)
+    details["timings"] = profile.to_dict()["stages"]
+    if profile.solver is not None:
+        details["solver_stats"] = profile.solver
+    if profile.decomposition is not None:
+        details["decomposition"] = profile.decomposition
+    with profile.stage("persist"):
+        return store.update_run_solution(run_id, result, status, details, expected_version)
+
+
+def record_error(
+    store: RunStore, run_id: str, message: str, expected_version: int | None = None
+) -> None:
+    with contextlib.suppress(RunConflictError):
+        store.update_run_error(run_id, message, expected_version)
+
+
+def observe_profile(
+    metrics: MetricsRegistry | None, operation: str, profile: Profile, outcome: str
+) -> None:
+    if metrics is None:
+        return
+    metrics.observe_profile(operation, profile, outcome)
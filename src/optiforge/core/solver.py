@@ -1,38 +1,86 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
 from ortools.sat.python import cp_model
 
-from optiforge.core.models import OptimizationModelIR, SolveResult
+from optiforge.core.columnar import OPERATOR_CODES, ColumnarIR, ir_to_columnar
+from optiforge.core.metrics import Profile
+from optiforge.core.models import Incumbent, OptimizationModelIR, SolveResult, SolverOptions
 
+IncumbentCallback = Callable[[Incumbent, Callable[[], dict[str, int]]], None]
 
-def solve_ir(ir: OptimizationModelIR, max_seconds: int) -> SolveResult:
-    model = cp_model.CpModel()
-    variables = {}
-    for variable in ir.variables:
-        variables[variable.name] = model.NewIntVar(
-            variable.lower_bound, variable.upper_bound, variable.name
+_LESS_EQUAL = OPERATOR_CODES["<="]
+_GREATER_EQUAL = OPERATOR_CODES[">="]
+
+
+class _IncumbentListener(cp_model.CpSolverSolutionCallback):
+    def __init__(self, var_names: list[str], on_incumbent: IncumbentCallback) -> None:
+        super().__init__()
+        self._var_names = var_names
+        self._on_incumbent = on_incumbent
+
+    def on_solution_callback(self) -> None:
+        incumbent = Incumbent(
+            objective_value=int(self.objective_value),
+            best_bound=self.best_objective_bound,
+            wall_time_seconds=self.wall_time,
         )
-    for constraint in ir.constraints:
-        expr = sum(term.coeff * variables[term.var] for term in constraint.terms)
-        if constraint.operator == "<=":
-            model.Add(expr <= constraint.rhs)
-        if constraint.operator == ">=":
-            model.Add(expr >= constraint.rhs)
-        if constraint.operator == "=":
-            model.Add(expr == constraint.rhs)
-    objective_expr = sum(
-        term.coeff * variables[term.var] for term in ir.objective.terms
-    ) + ir.objective.constant
-    if ir.objective.sense == "minimize":
-        model.Minimize(objective_expr)
-    if ir.objective.sense == "maximize":
-        model.Maximize(objective_expr)
+        self._on_incumbent(incumbent, self._values)
+
+    def _values(self) -> dict[str, int]:
+        return dict(zip(self._var_names, [int(value) for value in self.response_proto.solution]))
+
+
+def solve_ir(
+    ir: OptimizationModelIR | ColumnarIR,
+    max_seconds: int,
+    options: SolverOptions | None = None,
+    on_incumbent: IncumbentCallback | None = None,
+    hint: dict[str, int] | None = None,
+    profile: Profile | None = None,
+) -> SolveResult:
+    profile = profile or Profile()
+    with profile.stage("model_build"):
+        columnar = _as_columnar(ir)
+        model = build_cp_model(columnar)
+    return solve_cp_model(
+        model, columnar.var_names, max_seconds, options, on_incumbent, hint, profile
+    )
+
+
+def solve_cp_model(
+    model: cp_model.CpModel,
+    var_names: list[str],
+    max_seconds: int,
+    options: SolverOptions | None = None,
+    on_incumbent: IncumbentCallback | None = None,
+    hint: dict[str, int] | None = None,
+    profile: Profile | None = None,
+) -> SolveResult:
+    proto = model.Proto()
+    proto.ClearField("solution_hint")
+    if hint:
+        _add_hint(proto, var_names, hint)
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = max_seconds
-    status = solver.Solve(model)
+    if options is not None:
+        _apply_options(solver.parameters, options)
+    listener = None
+    if on_incumbent is not None:
+        listener = _IncumbentListener(var_names, on_incumbent)
+    start = time.perf_counter()
+    status = solver.Solve(model, listener)
     status_name = _status_name(status)
+    if profile is not None:
+        profile.add("solve", time.perf_counter() - start)
+        profile.solver = solver_stats(solver, status_name)
     if status_name in {"optimal", "feasible"}:
-        values = {name: int(solver.Value(var)) for name, var in variables.items()}
+        solution = solver.ResponseProto().solution
+        values = dict(zip(var_names, [int(value) for value in solution]))
         return SolveResult(
             status=status_name,
             objective_value=int(solver.ObjectiveValue()),
@@ -41,6 +89,104 @@ def solve_ir(ir: OptimizationModelIR, max_seconds: int) -> SolveResult:
     return SolveResult(status=status_name, objective_value=None, variables={})
 
 
+def solver_stats(solver: cp_model.CpSolver, status_name: str) -> dict[str, Any]:
+    stats: dict[str, Any] = {
+        "status": status_name,
+        "branches": solver.NumBranches(),
+        "conflicts": solver.NumConflicts(),
+        "wall_time_seconds": solver.WallTime(),
+        "gap": None,
+    }
+    if status_name not in {"optimal", "feasible"}:
+        return stats
+    objective = solver.ObjectiveValue()
+    bound = solver.BestObjectiveBound()
+    stats["gap"] = abs(objective - bound) / max(1.0, abs(objective))
+    return stats
+
+
+def build_cp_model(ir: ColumnarIR) -> cp_model.CpModel:
+    model = cp_model.CpModel()
+    proto = model.Proto()
+    for name, lower, upper in zip(ir.var_names, ir.lower_bounds, ir.upper_bounds):
+        proto.variables.add(name=name, domain=[lower, upper])
+    offsets = ir.row_offsets
+    for row_index, (code, rhs) in enumerate(zip(ir.operators, ir.rhs)):
+        start = offsets[row_index]
+        end = offsets[row_index + 1]
+        linear = proto.constraints.add().linear
+        linear.vars.extend(ir.col_indices[start:end])
+        linear.coeffs.extend(ir.coefficients[start:end])
+        linear.domain.extend(row_domain(code, rhs))
+    _set_objective(proto, ir)
+    return model
+
+
+def build_hint(ir: OptimizationModelIR, values: dict[str, int]) -> tuple[dict[str, int], str]:
+    hint = {}
+    for variable in ir.variables:
+        value = values.get(variable.name)
+        if value is None:
+            continue
+        if value < variable.lower_bound or value > variable.upper_bound:
+            continue
+        hint[variable.name] = value
+    if not hint:
+        return hint, "rejected"
+    if len(hint) == len(ir.variables):
+        return hint, "complete"
+    return hint, "partial"
+
+
+def _add_hint(
+    proto: cp_model_pb2.CpModelProto, var_names: list[str], hint: dict[str, int]
+) -> None:
+    indices = [index for index, name in enumerate(var_names) if name in hint]
+    proto.solution_hint.vars.extend(indices)
+    proto.solution_hint.values.extend([hint[var_names[index]] for index in indices])
+
+
+def _apply_options(
+    parameters: sat_parameters_pb2.SatParameters, options: SolverOptions
+) -> None:
+    if options.num_search_workers is not None:
+        parameters.num_workers = options.num_search_workers
+    if options.relative_gap_limit is not None:
+        parameters.relative_gap_limit = options.relative_gap_limit
+    if options.absolute_gap_limit is not None:
+        parameters.absolute_gap_limit = options.absolute_gap_limit
+    if options.random_seed is not None:
+        parameters.random_seed = options.random_seed
+    if options.linearization_level is not None:
+        parameters.linearization_level = options.linearization_level
+    if options.symmetry_level is not None:
+        parameters.symmetry_level = options.symmetry_level
+
+
+def _as_columnar(ir: OptimizationModelIR | ColumnarIR) -> ColumnarIR:
+    if isinstance(ir, ColumnarIR):
+        return ir
+    return ir_to_columnar(ir)
+
+
+def row_domain(code: int, rhs: int) -> tuple[int, int]:
+    lower = cp_model.INT_MIN if code == _LESS_EQUAL else rhs
+    upper = cp_model.INT_MAX if code == _GREATER_EQUAL else rhs
+    return lower, upper
+
+
+def _set_objective(proto: cp_model_pb2.CpModelProto, ir: ColumnarIR) -> None:
+    objective = proto.objective
+    objective.vars.extend(ir.objective_indices)
+    if ir.objective_sense == "minimize":
+        objective.coeffs.extend(ir.objective_coefficients)
+        objective.offset = ir.objective_constant
+        return
+    objective.coeffs.extend([-coeff for coeff in ir.objective_coefficients])
+    objective.offset = -ir.objective_constant
+    objective.scaling_factor = -1
+
+
 def _status_name(status: int) -> str:
     if status == cp_model.OPTIMAL:
         return "optimal"
@@ -52,4 +198,4 @@ def _status_name(status: int) -> str:
         return "unknown"
     if status == cp_model.UNKNOWN:
         return "unknown"
-    return "unknown"
\ No newline at end of file
+    return "unknown"
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from optiforge.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+_STOP_SECONDS = 5.0
+
+
+class SolverWorkerError(RuntimeError):
+    pass
+
+
+class _Task:
+    def __init__(
+        self, future: Future, fn: Callable[..., Any], args: tuple[Any, ...], timeout: float | None
+    ) -> None:
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.timeout = timeout
+
+
+class _Worker:
+    def __init__(self, context: Any, memory_limit_mb: int) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.completed = 0
+        self.terminated = False
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError, ValueError):
+            self.conn.send(None)
+        self.process.join(_STOP_SECONDS)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(_STOP_SECONDS)
+
+
+class SolverPool:
+    def __init__(
+        self, workers: int, max_tasks_per_worker: int = 0, memory_limit_mb: int = 0
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._max_tasks = max_tasks_per_worker
+        self._memory_limit_mb = memory_limit_mb
+        self._context = multiprocessing.get_context("spawn")
+        self._tasks: queue.SimpleQueue[_Task | None] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._running: dict[Future, _Worker] = {}
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run_slot, name=f"optiforge-solver-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, timeout: float | None = None
+    ) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new solves after shutdown")
+            self._tasks.put(_Task(future, fn, args, timeout))
+        return future
+
+    def terminate(self, future: Future) -> bool:
+        if future.cancel():
+            return True
+        with self._lock:
+            worker = self._running.get(future)
+            if worker is None:
+                return False
+            worker.terminated = True
+            worker.process.kill()
+        return True
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if cancel_futures:
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    task = self._tasks.get_nowait()
+                    if task is not None:
+                        task.future.cancel()
+        for _ in self._threads:
+            self._tasks.put(None)
+        if not wait:
+            return
+        for thread in self._threads:
+            thread.join()
+
+    def _run_slot(self) -> None:
+        worker = self._spawn()
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    return
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+                if not worker.process.is_alive():
+                    worker.stop()
+                    worker = self._spawn()
+                with self._lock:
+                    self._running[task.future] = worker
+                try:
+                    self._execute(worker, task)
+                except Exception as exc:
+                    logger.exception("solver slot failed to run a task")
+                    if not task.future.done():
+                        task.future.set_exception(exc)
+                    worker.kill()
+                finally:
+                    with self._lock:
+                        self._running.pop(task.future, None)
+                worker.completed += 1
+                recycle = self._max_tasks > 0 and worker.completed >= self._max_tasks
+                if recycle or not worker.process.is_alive():
+                    worker.stop()
+                    worker = self._spawn()
+        finally:
+            worker.stop()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self._memory_limit_mb)
+
+    def _execute(self, worker: _Worker, task: _Task) -> None:
+        try:
+            worker.conn.send((task.fn, task.args))
+        except Exception as exc:
+            task.future.set_exception(exc)
+            return
+        ready = wait([worker.conn, worker.process.sentinel], task.timeout)
+        if not ready:
+            worker.kill()
+            message = f"solve exceeded the hard time limit of {task.timeout:g}s"
+            logger.warning("killed solver worker %s: %s", worker.process.pid, message)
+            task.future.set_exception(SolverWorkerError(message))
+            return
+        if worker.conn in ready:
+            reply = self._receive(worker, task)
+            if reply is not None:
+                status, payload = reply
+                if status == "ok":
+                    task.future.set_result(payload)
+                    return
+                task.future.set_exception(payload)
+                return
+        worker.process.join(_STOP_SECONDS)
+        message = self._exit_message(worker)
+        if not worker.terminated:
+            logger.warning("solver worker %s failed: %s", worker.process.pid, message)
+        task.future.set_exception(SolverWorkerError(message))
+
+    def _receive(self, worker: _Worker, task: _Task) -> tuple[str, Any] | None:
+        try:
+            return worker.conn.recv()
+        except (EOFError, OSError):
+            return None
+        except Exception as exc:
+            worker.kill()
+            message = f"could not read the solve result: {exc!r}"
+            return "error", SolverWorkerError(message)
+
+    def _exit_message(self, worker: _Worker) -> str:
+        if worker.terminated:
+            return "solve was terminated"
+        message = f"solver worker exited with code {worker.process.exitcode}"
+        if self._memory_limit_mb > 0:
+            message += f" (memory limit {self._memory_limit_mb} MB)"
+        return message
+
+
+def new_solver_pool(settings: Settings) -> SolverPool:
+    return SolverPool(
+        settings.solver_workers,
+        settings.solver_max_tasks_per_worker,
+        settings.solver_memory_limit_mb,
+    )
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _apply_memory_limit(memory_limit_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            reply: tuple[str, Any] = ("ok", fn(*args))
+        except Exception as exc:
+            reply = ("error", exc)
+        try:
+            conn.send(reply)
+        except Exception as exc:
+            conn.send(("error", SolverWorkerError(f"could not return the solve result: {exc}")))
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    if memory_limit_mb <= 0 or sys.platform == "win32":
+        return
+    import resource
+
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
@@ -1,100 +1,672 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import contextlib
 import json
+import os
 import sqlite3
+import threading
+import time
 import uuid
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from optiforge.core.models import AuditEvent, AuditLog, OptimizationModelIR, ProblemSpec, RunRecord, SolveResult
+from optiforge.core.columnar import (
+    ColumnarIR,
+    columnar_to_ir,
+    decode_columnar,
+    encode_columnar,
+    ir_to_columnar,
+    structure_hash,
+)
+from optiforge.core.models import (
+    AuditEvent,
+    AuditLog,
+    Constraint,
+    Incumbent,
+    LinearTerm,
+    Objective,
+    OptimizationModelIR,
+    ProblemSpec,
+    RunRecord,
+    RunSummary,
+    SolveJob,
+    SolveResult,
+    SolverOptions,
+    Sweep,
+    SweepRequest,
+    SweepScenario,
+    TableRef,
+    TableSpec,
+    Variable,
+)
+
+
+class RunConflictError(RuntimeError):
+    pass
+
+
+class SqliteDatabase:
+    def __init__(self, database_url: str, busy_timeout_ms: int = 5000) -> None:
+        self._path = sqlite_path(database_url)
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = self._open()
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            with contextlib.suppress(sqlite3.Error):
+                conn.close()
+        self._local = threading.local()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
 
 
 class RunStore:
-    def __init__(self, database_url: str) -> None:
-        self._db_path = _db_path(database_url)
-        self._ensure_directory(self._db_path)
+    def __init__(
+        self, database_url: str, busy_timeout_ms: int = 5000, columnar_min_terms: int = 10000
+    ) -> None:
+        self._db = SqliteDatabase(database_url, busy_timeout_ms)
+        self._columnar_min_terms = columnar_min_terms
         self._init_db()
 
+    def close(self) -> None:
+        self._db.close()
+
     def create_run(
         self, problem_spec: ProblemSpec, provider_name: str | None, provider_model: str | None
     ) -> str:
-        run_id = str(uuid.uuid4())
+        return self.create_runs([(problem_spec, None, None)], provider_name, provider_model)[0]
+
+    def create_runs(
+        self,
+        entries: Sequence[tuple[ProblemSpec, OptimizationModelIR | None, SolverOptions | None]],
+        provider_name: str | None,
+        provider_model: str | None,
+    ) -> list[str]:
         created_at = _now_iso()
-        audit = AuditLog(
-            metadata={"provider_name": provider_name, "provider_model": provider_model},
-            events=[AuditEvent(at=created_at, action="created", details={})],
+        audit_json = _serialize(
+            AuditLog(metadata={"provider_name": provider_name, "provider_model": provider_model})
         )
-        payload = {
-            "id": run_id,
-            "status": "created",
-            "created_at": created_at,
-            "updated_at": created_at,
-            "problem_spec_json": _serialize(problem_spec),
-            "ir_json": None,
-            "solution_json": None,
-            "audit_json": _serialize(audit),
-            "error": None,
-            "provider_name": provider_name,
-            "provider_model": provider_model,
-        }
-        with self._connect() as conn:
-            conn.execute(
+        payloads = []
+        events = []
+        for problem_spec, ir, solver_options in entries:
+            run_id = str(uuid.uuid4())
+            payload = {
+                "id": run_id,
+                "status": "created",
+                "created_at": created_at,
+                "updated_at": created_at,
+                "problem_spec_json": _serialize(problem_spec),
+                "ir_json": None,
+                "ir_blob": None,
+                "ir_structure_hash": None,
+                "solution_json": None,
+                "audit_json": audit_json,
+                "error": None,
+                "provider_name": provider_name,
+                "provider_model": provider_model,
+            }
+            events.append((run_id, AuditEvent(at=created_at, action="created", details={})))
+            payload["solver_options_json"] = _options_json(solver_options)
+            if ir is not None:
+                columnar = ir_to_columnar(ir)
+                ir_json, ir_blob = self._encode_ir(ir, columnar)
+                payload.update(
+                    status="ir_generated",
+                    ir_json=ir_json,
+                    ir_blob=ir_blob,
+                    ir_structure_hash=structure_hash(columnar),
+                )
+                details = {
+                    "schema_version": ir.version,
+                    "ir_encoding": "json" if ir_blob is None else "columnar",
+                    "source": "request",
+                }
+                event = AuditEvent(at=created_at, action="ir_generated", details=details)
+                events.append((run_id, event))
+            payloads.append(payload)
+        with self._db.transaction() as conn:
+            conn.executemany(
                 """
                 INSERT INTO runs (
-                    id, status, created_at, updated_at, problem_spec_json, ir_json,
-                    solution_json, audit_json, error, provider_name, provider_model
+                    id, status, created_at, updated_at, problem_spec_json, ir_json, ir_blob,
+                    ir_structure_hash, solution_json, audit_json, error, provider_name,
+                    provider_model, solver_options_json
                 ) VALUES (
                     :id, :status, :created_at, :updated_at, :problem_spec_json, :ir_json,
-                    :solution_json, :audit_json, :error, :provider_name, :provider_model
+                    :ir_blob, :ir_structure_hash, :solution_json, :audit_json, :error,
+                    :provider_name, :provider_model, :solver_options_json
                 )
                 """,
-                payload,
+                payloads,
             )
-        return run_id
+            _insert_events(conn, events)
+        return [payload["id"] for payload in payloads]
 
-    def get_run(self, run_id: str) -> RunRecord:
-        with self._connect() as conn:
-            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+    def get_run(self, run_id: str, fields: Iterable[str] | None = None) -> RunRecord:
+        selected = _select_fields(fields)
+        columns = sorted({column for field in selected for column in _FIELD_COLUMNS[field]})
+        conn = self._db.connection()
+        row = conn.execute(
+            f"SELECT {', '.join(columns)} FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
         if not row:
             raise KeyError("run not found")
-        return _row_to_run_record(row)
+        events = []
+        if "audit" in selected:
+            events = _load_events(conn, run_id)
+        return _row_to_run_record(row, events, selected)
+
+    def list_runs(
+        self,
+        status: str | None = None,
+        provider_name: str | None = None,
+        created_after: str | None = None,
+        created_before: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        full: bool = False,
+    ) -> tuple[list[RunSummary | RunRecord], str | None]:
+        clauses = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if provider_name is not None:
+            clauses.append("provider_name = ?")
+            params.append(provider_name)
+        if created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        if cursor is not None:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        columns = "*" if full else _SUMMARY_COLUMNS
+        where = ""
+        if clauses:
+            where = "WHERE " + " AND ".join(clauses)
+        conn = self._db.connection()
+        rows = conn.execute(
+            f"SELECT {columns} FROM runs {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        if not full:
+            return [_row_to_summary(row) for row in rows], next_cursor
+        events = _load_events_for_runs(conn, [row["id"] for row in rows])
+        records = [_row_to_run_record(row, events.get(row["id"], [])) for row in rows]
+        return records, next_cursor
+
+    def get_columnar_ir(self, run_id: str) -> ColumnarIR | None:
+        conn = self._db.connection()
+        row = conn.execute("SELECT ir_json, ir_blob FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if not row:
+            raise KeyError("run not found")
+        return _row_to_columnar(row)
+
+    def find_warm_start_run(self, run_id: str) -> str | None:
+        conn = self._db.connection()
+        row = conn.execute(
+            """
+            SELECT prior.id FROM runs AS current
+            JOIN runs AS prior ON prior.ir_structure_hash = current.ir_structure_hash
+            WHERE current.id = ? AND prior.id != current.id AND prior.status = 'solved'
+            ORDER BY prior.updated_at DESC LIMIT 1
+            """,
+            (run_id,),
+        ).fetchone()
+        if not row:
+            return None
+        return row["id"]
 
     def update_run_ir(
-        self, run_id: str, ir: OptimizationModelIR, provider_name: str | None, provider_model: str | None
+        self,
+        run_id: str,
+        ir: OptimizationModelIR | ColumnarIR,
+        provider_name: str | None,
+        provider_model: str | None,
+        details: dict[str, Any] | None = None,
+        expected_version: int | None = None,
     ) -> RunRecord:
+        audit_details: dict[str, Any] = {"schema_version": ir.version}
+        if details:
+            audit_details.update(details)
+        columnar = ir if isinstance(ir, ColumnarIR) else ir_to_columnar(ir)
+        ir_json, ir_blob = self._encode_ir(ir, columnar)
+        audit_details["ir_encoding"] = "json" if ir_blob is None else "columnar"
         return self._update_run(
             run_id,
             status="ir_generated",
-            ir_json=_serialize(ir),
+            ir_json=ir_json,
+            ir_blob=ir_blob,
+            ir_structure_hash=structure_hash(columnar),
             provider_name=provider_name,
             provider_model=provider_model,
             audit_action="ir_generated",
-            audit_details={"schema_version": ir.version},
+            audit_details=audit_details,
             error=None,
+            expected_version=expected_version,
         )
 
-    def update_run_solution(self, run_id: str, solution: SolveResult, status: str) -> RunRecord:
+    def update_run_solution(
+        self,
+        run_id: str,
+        solution: SolveResult,
+        status: str,
+        details: dict[str, Any] | None = None,
+        expected_version: int | None = None,
+    ) -> RunRecord:
+        audit_details: dict[str, Any] = {"status": status}
+        if details:
+            audit_details.update(details)
         return self._update_run(
             run_id,
             status=status,
             solution_json=_serialize(solution),
             audit_action="solved",
-            audit_details={"status": status},
+            audit_details=audit_details,
             error=None,
+            expected_version=expected_version,
         )
 
-    def update_run_error(self, run_id: str, message: str) -> RunRecord:
+    def update_run_error(
+        self, run_id: str, message: str, expected_version: int | None = None
+    ) -> RunRecord:
         return self._update_run(
             run_id,
             status="error",
             audit_action="error",
             audit_details={"message": message},
             error=message,
+            expected_version=expected_version,
         )
 
+    def create_job(
+        self,
+        run_id: str,
+        warm_start: str | None = None,
+        options: SolverOptions | None = None,
+    ) -> SolveJob:
+        return self.create_jobs([(run_id, warm_start, options)])[0]
+
+    def create_jobs(
+        self, entries: Sequence[tuple[str, str | None, SolverOptions | None]]
+    ) -> list[SolveJob]:
+        created_at = _now_iso()
+        jobs = [
+            SolveJob(
+                id=str(uuid.uuid4()),
+                run_id=run_id,
+                status="queued",
+                created_at=created_at,
+                updated_at=created_at,
+                warm_start=warm_start,
+                solver_options=options,
+            )
+            for run_id, warm_start, options in entries
+        ]
+        payloads = [
+            {
+                **job.model_dump(exclude={"solver_options"}),
+                "solver_options_json": _options_json(job.solver_options),
+            }
+            for job in jobs
+        ]
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO jobs (
+                    id, run_id, status, created_at, updated_at, error, warm_start,
+                    solver_options_json
+                )
+                VALUES (
+                    :id, :run_id, :status, :created_at, :updated_at, :error, :warm_start,
+                    :solver_options_json
+                )
+                """,
+                payloads,
+            )
+        return jobs
+
+    def get_job(self, job_id: str) -> SolveJob:
+        conn = self._db.connection()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            raise KeyError("job not found")
+        return _row_to_job(row)
+
+    def claim_next_job(self, owner: str, lease_seconds: float) -> SolveJob | None:
+        now = time.time()
+        with self._db.transaction(immediate=True) as conn:
+            updated_at = _now_iso()
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', updated_at = ?, lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                """,
+                (updated_at, now),
+            )
+            row = conn.execute(
+                """
+                SELECT * FROM jobs AS candidate
+                WHERE status = 'queued' AND NOT EXISTS (
+                    SELECT 1 FROM jobs AS active
+                    WHERE active.run_id = candidate.run_id AND active.status = 'running'
+                )
+                ORDER BY created_at, rowid LIMIT 1
+                """
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'running', updated_at = ?, lease_owner = ?,
+                    lease_expires_at = ?
+                WHERE id = ?
+                """,
+                (updated_at, owner, now + lease_seconds, row["id"]),
+            )
+        job = _row_to_job(row)
+        return job.model_copy(update={"status": "running", "updated_at": updated_at})
+
+    def renew_job_leases(
+        self, owner: str, job_ids: Iterable[str], lease_seconds: float
+    ) -> set[str]:
+        return self._renew_leases("jobs", owner, job_ids, lease_seconds)
+
+    def holds_job_lease(self, job_id: str, owner: str) -> bool:
+        conn = self._db.connection()
+        row = conn.execute(
+            "SELECT 1 FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (job_id, owner),
+        ).fetchone()
+        return row is not None
+
+    def finish_job(
+        self, job_id: str, status: str, error: str | None = None, owner: str | None = None
+    ) -> SolveJob:
+        query = """
+            UPDATE jobs SET status = ?, updated_at = ?, error = ?, lease_expires_at = NULL
+            WHERE id = ? AND status = 'running'
+        """
+        params: list[Any] = [status, _now_iso(), error, job_id]
+        if owner is not None:
+            query += " AND lease_owner = ?"
+            params.append(owner)
+        with self._db.transaction() as conn:
+            conn.execute(query, params)
+        return self.get_job(job_id)
+
+    def cancel_job(self, job_id: str) -> SolveJob:
+        with self._db.transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'cancelled', updated_at = ?
+                WHERE id = ? AND status IN ('queued', 'running')
+                """,
+                (_now_iso(), job_id),
+            )
+        return self.get_job(job_id)
+
+    def latest_job(self, run_id: str) -> SolveJob:
+        conn = self._db.connection()
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE run_id = ? ORDER BY created_at DESC, rowid DESC LIMIT 1",
+            (run_id,),
+        ).fetchone()
+        if not row:
+            raise KeyError("job not found")
+        return _row_to_job(row)
+
+    def clear_incumbents(self, run_id: str) -> None:
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM run_incumbents WHERE run_id = ?", (run_id,))
+            conn.execute("UPDATE runs SET incumbent_json = NULL WHERE id = ?", (run_id,))
+
+    def record_incumbents(
+        self,
+        run_id: str,
+        job_id: str | None,
+        incumbents: list[Incumbent],
+        best: Incumbent | None = None,
+    ) -> None:
+        at = _now_iso()
+        rows = [
+            (run_id, job_id, at, item.objective_value, item.best_bound, item.wall_time_seconds)
+            for item in incumbents
+        ]
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO run_incumbents (
+                    run_id, job_id, at, objective_value, best_bound, wall_time_seconds
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            if best is not None:
+                conn.execute(
+                    "UPDATE runs SET incumbent_json = ? WHERE id = ?",
+                    (best.model_dump_json(), run_id),
+                )
+
+    def list_incumbents(
+        self, run_id: str, job_id: str | None = None, after_id: int = 0
+    ) -> list[tuple[int, Incumbent]]:
+        conn = self._db.connection()
+        rows = conn.execute(
+            """
+            SELECT id, objective_value, best_bound, wall_time_seconds FROM run_incumbents
+            WHERE run_id = ? AND job_id IS ? AND id > ? ORDER BY id
+            """,
+            (run_id, job_id, after_id),
+        ).fetchall()
+        return [
+            (
+                row["id"],
+                Incumbent.model_construct(
+                    objective_value=row["objective_value"],
+                    best_bound=row["best_bound"],
+                    wall_time_seconds=row["wall_time_seconds"],
+                    variables=None,
+                ),
+            )
+            for row in rows
+        ]
+
+    def create_sweep(
+        self,
+        run_id: str,
+        request: SweepRequest,
+        scenario_count: int,
+        owner: str | None = None,
+        lease_seconds: float = 0.0,
+    ) -> Sweep:
+        created_at = _now_iso()
+        payload = {
+            "id": str(uuid.uuid4()),
+            "run_id": run_id,
+            "status": "queued",
+            "created_at": created_at,
+            "updated_at": created_at,
+            "scenario_count": scenario_count,
+            "request_json": request.model_dump_json(exclude_none=True),
+            "error": None,
+        }
+        lease = {"lease_owner": owner, "lease_expires_at": None}
+        if owner is not None:
+            lease["lease_expires_at"] = time.time() + lease_seconds
+        with self._db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO sweeps (
+                    id, run_id, status, created_at, updated_at, scenario_count, request_json,
+                    error, lease_owner, lease_expires_at
+                ) VALUES (
+                    :id, :run_id, :status, :created_at, :updated_at, :scenario_count,
+                    :request_json, :error, :lease_owner, :lease_expires_at
+                )
+                """,
+                {**payload, **lease},
+            )
+        del payload["request_json"]
+        return Sweep(**payload)
+
+    def get_sweep(self, sweep_id: str) -> Sweep:
+        conn = self._db.connection()
+        row = conn.execute(
+            """
+            SELECT sweeps.*, (
+                SELECT COUNT(*) FROM sweep_scenarios WHERE sweep_id = sweeps.id
+            ) AS completed
+            FROM sweeps WHERE id = ?
+            """,
+            (sweep_id,),
+        ).fetchone()
+        if not row:
+            raise KeyError("sweep not found")
+        return _row_to_sweep(row)
+
+    def get_sweep_request(self, sweep_id: str) -> SweepRequest:
+        conn = self._db.connection()
+        row = conn.execute("SELECT request_json FROM sweeps WHERE id = ?", (sweep_id,)).fetchone()
+        if not row:
+            raise KeyError("sweep not found")
+        return SweepRequest.model_validate_json(row["request_json"])
+
+    def claim_pending_sweeps(self, owner: str, lease_seconds: float) -> list[str]:
+        now = time.time()
+        with self._db.transaction(immediate=True) as conn:
+            rows = conn.execute(
+                """
+                SELECT id FROM sweeps
+                WHERE status IN ('queued', 'running')
+                    AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                ORDER BY created_at
+                """,
+                (now,),
+            ).fetchall()
+            sweep_ids = [row["id"] for row in rows]
+            conn.executemany(
+                "UPDATE sweeps SET lease_owner = ?, lease_expires_at = ? WHERE id = ?",
+                [(owner, now + lease_seconds, sweep_id) for sweep_id in sweep_ids],
+            )
+        return sweep_ids
+
+    def renew_sweep_leases(
+        self, owner: str, sweep_ids: Iterable[str], lease_seconds: float
+    ) -> set[str]:
+        return self._renew_leases("sweeps", owner, sweep_ids, lease_seconds)
+
+    def set_sweep_status(self, sweep_id: str, status: str, error: str | None = None) -> None:
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE sweeps SET status = ?, updated_at = ?, error = ? WHERE id = ?",
+                (status, _now_iso(), error, sweep_id),
+            )
+
+    def completed_sweep_scenarios(self, sweep_id: str) -> set[int]:
+        conn = self._db.connection()
+        rows = conn.execute(
+            "SELECT idx FROM sweep_scenarios WHERE sweep_id = ?", (sweep_id,)
+        ).fetchall()
+        return {row["idx"] for row in rows}
+
+    def record_sweep_scenarios(self, sweep_id: str, scenarios: list[SweepScenario]) -> None:
+        rows = [
+            (
+                sweep_id,
+                scenario.index,
+                scenario.status,
+                scenario.objective_value,
+                array("q", scenario.values).tobytes(),
+                _pack_values(scenario.variables),
+            )
+            for scenario in scenarios
+        ]
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO sweep_scenarios (
+                    sweep_id, idx, status, objective_value, values_blob, solution_blob
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def list_sweep_scenarios(
+        self,
+        sweep_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        var_names: list[str] | None = None,
+    ) -> list[SweepScenario]:
+        conn = self._db.connection()
+        rows = conn.execute(
+            """
+            SELECT idx, status, objective_value, values_blob, solution_blob FROM sweep_scenarios
+            WHERE sweep_id = ? AND idx >= ? ORDER BY idx LIMIT ?
+            """,
+            (sweep_id, offset, limit),
+        ).fetchall()
+        return [_row_to_scenario(row, var_names) for row in rows]
+
     def _init_db(self) -> None:
-        with self._connect() as conn:
+        with self._db.transaction(immediate=True) as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS runs (
@@ -112,82 +684,117 @@ class RunStore:
                 )
                 """
             )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL REFERENCES runs (id),
+                    status TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    error TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)"
+            )
+            _migrate(conn)
+
+    def _encode_ir(
+        self, ir: OptimizationModelIR | ColumnarIR, columnar: ColumnarIR
+    ) -> tuple[str | None, bytes | None]:
+        if columnar.num_nonzeros >= self._columnar_min_terms:
+            return None, encode_columnar(columnar)
+        if isinstance(ir, ColumnarIR):
+            return _serialize(columnar_to_ir(ir)), None
+        return _serialize(ir), None
 
     def _update_run(
         self,
         run_id: str,
         status: str,
         ir_json: str | None = None,
+        ir_blob: bytes | None = None,
+        ir_structure_hash: str | None = None,
         solution_json: str | None = None,
         provider_name: str | None = None,
         provider_model: str | None = None,
         audit_action: str | None = None,
         audit_details: dict[str, Any] | None = None,
         error: str | None = None,
+        expected_version: int | None = None,
     ) -> RunRecord:
-        run = self.get_run(run_id)
-        audit = run.audit
-        if audit_action:
-            audit.events.append(
-                AuditEvent(at=_now_iso(), action=audit_action, details=audit_details or {})
-            )
-        if provider_name is not None:
-            audit.metadata["provider_name"] = provider_name
-        if provider_model is not None:
-            audit.metadata["provider_model"] = provider_model
-        final_ir_json = ir_json
-        if final_ir_json is None and run.ir:
-            final_ir_json = run.ir.model_dump_json()
-        final_solution_json = solution_json
-        if final_solution_json is None and run.solution:
-            final_solution_json = run.solution.model_dump_json()
-        final_provider_name = provider_name
-        if final_provider_name is None:
-            final_provider_name = run.provider_name
-        final_provider_model = provider_model
-        if final_provider_model is None:
-            final_provider_model = run.provider_model
-        payload = {
-            "id": run_id,
-            "status": status,
-            "updated_at": _now_iso(),
-            "ir_json": final_ir_json,
-            "solution_json": final_solution_json,
-            "audit_json": _serialize(audit),
-            "error": error,
-            "provider_name": final_provider_name,
-            "provider_model": final_provider_model,
-        }
-        with self._connect() as conn:
+        with self._db.transaction(immediate=True) as conn:
+            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if not row:
+                raise KeyError("run not found")
+            if expected_version is not None and row["version"] != expected_version:
+                raise RunConflictError(
+                    f"run was modified concurrently (version {row['version']}, "
+                    f"expected {expected_version})"
+                )
+            if audit_action:
+                event = AuditEvent(at=_now_iso(), action=audit_action, details=audit_details or {})
+                _insert_event(conn, run_id, event)
+            changes: dict[str, Any] = {
+                "status": status,
+                "updated_at": _now_iso(),
+                "error": error,
+                "version": row["version"] + 1,
+            }
+            if provider_name is not None or provider_model is not None:
+                audit = AuditLog.model_validate_json(row["audit_json"])
+                if provider_name is not None:
+                    audit.metadata["provider_name"] = provider_name
+                if provider_model is not None:
+                    audit.metadata["provider_model"] = provider_model
+                changes["audit_json"] = _serialize(audit)
+            if ir_json is not None or ir_blob is not None:
+                changes["ir_json"] = ir_json
+                changes["ir_blob"] = ir_blob
+                changes["ir_structure_hash"] = ir_structure_hash
+            if solution_json is not None:
+                changes["solution_json"] = solution_json
+            if provider_name is not None:
+                changes["provider_name"] = provider_name
+            if provider_model is not None:
+                changes["provider_model"] = provider_model
+            assignments = ", ".join([f"{column} = :{column}" for column in changes])
+            conn.execute(f"UPDATE runs SET {assignments} WHERE id = :id", {**changes, "id": run_id})
+            events = _load_events(conn, run_id)
+        updated = dict(row)
+        updated.update(changes)
+        return _row_to_run_record(updated, events)
+
+    def _renew_leases(
+        self, table: str, owner: str, ids: Iterable[str], lease_seconds: float
+    ) -> set[str]:
+        id_list = list(ids)
+        if not id_list:
+            return set()
+        placeholders = ", ".join("?" for _ in id_list)
+        with self._db.transaction() as conn:
             conn.execute(
-                """
-                UPDATE runs
-                SET status = :status,
-                    updated_at = :updated_at,
-                    ir_json = :ir_json,
-                    solution_json = :solution_json,
-                    audit_json = :audit_json,
-                    error = :error,
-                    provider_name = :provider_name,
-                    provider_model = :provider_model
-                WHERE id = :id
+                f"""
+                UPDATE {table} SET lease_expires_at = ?
+                WHERE lease_owner = ? AND status IN ('queued', 'running')
+                    AND id IN ({placeholders})
                 """,
-                payload,
+                (time.time() + lease_seconds, owner, *id_list),
             )
-        return self.get_run(run_id)
-
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    @staticmethod
-    def _ensure_directory(path: str) -> None:
-        directory = Path(path).parent
-        directory.mkdir(parents=True, exist_ok=True)
+            rows = conn.execute(
+                f"""
+                SELECT id FROM {table}
+                WHERE lease_owner = ? AND status IN ('queued', 'running')
+                    AND id IN ({placeholders})
+                """,
+                (owner, *id_list),
+            ).fetchall()
+        return {row["id"] for row in rows}
 
 
-def _db_path(database_url: str) -> str:
+def sqlite_path(database_url: str) -> str:
     if database_url.startswith("sqlite:///"):
         return database_url.replace("sqlite:///", "", 1)
     if database_url.startswith("sqlite://"):
@@ -206,25 +813,395 @@ def _serialize(obj: Any) -> str:
     return json.dumps(payload, ensure_ascii=True, separators=(",", ":"))
 
 
-def _row_to_run_record(row: sqlite3.Row) -> RunRecord:
-    problem_spec = ProblemSpec.model_validate(json.loads(row["problem_spec_json"]))
-    ir = None
-    if row["ir_json"]:
-        ir = OptimizationModelIR.model_validate(json.loads(row["ir_json"]))
-    solution = None
-    if row["solution_json"]:
-        solution = SolveResult.model_validate(json.loads(row["solution_json"]))
-    audit = AuditLog.model_validate(json.loads(row["audit_json"]))
-    return RunRecord(
+def _options_json(options: SolverOptions | None) -> str | None:
+    if options is None:
+        return None
+    return options.model_dump_json(exclude_none=True)
+
+
+def _options_from_json(options_json: str | None) -> SolverOptions | None:
+    if not options_json:
+        return None
+    return SolverOptions.model_construct(**json.loads(options_json))
+
+
+def _insert_event(conn: sqlite3.Connection, run_id: str, event: AuditEvent) -> None:
+    conn.execute(
+        "INSERT INTO run_events (run_id, at, action, details_json) VALUES (?, ?, ?, ?)",
+        (run_id, event.at, event.action, _serialize(event.details)),
+    )
+
+
+def _insert_events(conn: sqlite3.Connection, events: list[tuple[str, AuditEvent]]) -> None:
+    conn.executemany(
+        "INSERT INTO run_events (run_id, at, action, details_json) VALUES (?, ?, ?, ?)",
+        [
+            (run_id, event.at, event.action, _serialize(event.details))
+            for run_id, event in events
+        ],
+    )
+
+
+def _load_events(conn: sqlite3.Connection, run_id: str) -> list[AuditEvent]:
+    rows = conn.execute(
+        "SELECT at, action, details_json FROM run_events WHERE run_id = ? ORDER BY at, id",
+        (run_id,),
+    ).fetchall()
+    return [_row_to_event(row) for row in rows]
+
+
+def _row_to_event(row: sqlite3.Row) -> AuditEvent:
+    return AuditEvent.model_construct(
+        at=row["at"], action=row["action"], details=json.loads(row["details_json"])
+    )
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, migration in enumerate(_MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {target}")
+
+
+def _migrate_audit_events(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            at TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details_json TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS run_events_run_at ON run_events (run_id, at)")
+    rows = conn.execute("SELECT id, audit_json FROM runs").fetchall()
+    for row in rows:
+        audit = AuditLog.model_validate_json(row["audit_json"])
+        if not audit.events:
+            continue
+        for event in audit.events:
+            _insert_event(conn, row["id"], event)
+        conn.execute(
+            "UPDATE runs SET audit_json = ? WHERE id = ?",
+            (_serialize(AuditLog(metadata=audit.metadata)), row["id"]),
+        )
+
+
+def _migrate_run_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at, id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS runs_status_created ON runs (status, created_at, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS runs_provider_created ON runs (provider_name, created_at, id)"
+    )
+
+
+def _migrate_columnar_ir(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE runs ADD COLUMN ir_blob BLOB")
+
+
+def _migrate_solver_options(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE runs ADD COLUMN solver_options_json TEXT")
+
+
+def _migrate_incumbents(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_incumbents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            job_id TEXT,
+            at TEXT NOT NULL,
+            objective_value INTEGER NOT NULL,
+            best_bound REAL NOT NULL,
+            wall_time_seconds REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS run_incumbents_run ON run_incumbents (run_id, id)")
+    conn.execute("ALTER TABLE runs ADD COLUMN incumbent_json TEXT")
+
+
+def _migrate_warm_start(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE runs ADD COLUMN ir_structure_hash TEXT")
+    conn.execute("ALTER TABLE jobs ADD COLUMN warm_start TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS runs_structure_updated ON runs (ir_structure_hash, updated_at)"
+    )
+    rows = conn.execute(
+        "SELECT id, ir_json, ir_blob FROM runs WHERE ir_json IS NOT NULL OR ir_blob IS NOT NULL"
+    ).fetchall()
+    for row in rows:
+        conn.execute(
+            "UPDATE runs SET ir_structure_hash = ? WHERE id = ?",
+            (structure_hash(_row_to_columnar(row)), row["id"]),
+        )
+
+
+def _migrate_sweeps(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sweeps (
+            id TEXT PRIMARY KEY,
+            run_id TEXT NOT NULL REFERENCES runs (id),
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            scenario_count INTEGER NOT NULL,
+            request_json TEXT NOT NULL,
+            error TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sweep_scenarios (
+            sweep_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            objective_value INTEGER,
+            values_blob BLOB NOT NULL,
+            solution_blob BLOB,
+            PRIMARY KEY (sweep_id, idx)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS sweeps_status_created ON sweeps (status, created_at)")
+
+
+def _migrate_leases(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE runs ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE jobs ADD COLUMN lease_owner TEXT")
+    conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires_at REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_run_status ON jobs (run_id, status)")
+    conn.execute("ALTER TABLE sweeps ADD COLUMN lease_owner TEXT")
+    conn.execute("ALTER TABLE sweeps ADD COLUMN lease_expires_at REAL")
+
+
+def _migrate_job_options(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE jobs ADD COLUMN solver_options_json TEXT")
+
+
+_MIGRATIONS = [
+    _migrate_audit_events,
+    _migrate_run_indexes,
+    _migrate_columnar_ir,
+    _migrate_solver_options,
+    _migrate_incumbents,
+    _migrate_warm_start,
+    _migrate_sweeps,
+    _migrate_leases,
+    _migrate_job_options,
+]
+
+_SUMMARY_COLUMNS = "id, status, created_at, updated_at, error, provider_name, provider_model"
+
+
+def _encode_cursor(created_at: str, run_id: str) -> str:
+    raw = json.dumps([created_at, run_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    return str(created_at), str(run_id)
+
+
+def _load_events_for_runs(
+    conn: sqlite3.Connection, run_ids: list[str]
+) -> dict[str, list[AuditEvent]]:
+    if not run_ids:
+        return {}
+    placeholders = ", ".join(["?"] * len(run_ids))
+    rows = conn.execute(
+        f"""
+        SELECT run_id, at, action, details_json FROM run_events
+        WHERE run_id IN ({placeholders}) ORDER BY run_id, at, id
+        """,
+        run_ids,
+    ).fetchall()
+    events: dict[str, list[AuditEvent]] = {}
+    for row in rows:
+        events.setdefault(row["run_id"], []).append(_row_to_event(row))
+    return events
+
+
+def _row_to_summary(row: sqlite3.Row) -> RunSummary:
+    return RunSummary(
         id=row["id"],
         status=row["status"],
         created_at=row["created_at"],
         updated_at=row["updated_at"],
-        problem_spec=problem_spec,
-        ir=ir,
-        solution=solution,
-        audit=audit,
         error=row["error"],
         provider_name=row["provider_name"],
         provider_model=row["provider_model"],
     )
+
+
+_FIELD_COLUMNS = {
+    "id": ("id",),
+    "status": ("status",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+    "problem_spec": ("problem_spec_json",),
+    "ir": ("ir_json", "ir_blob"),
+    "solution": ("solution_json",),
+    "audit": ("audit_json",),
+    "error": ("error",),
+    "provider_name": ("provider_name",),
+    "provider_model": ("provider_model",),
+    "solver_options": ("solver_options_json",),
+    "incumbent": ("incumbent_json",),
+    "version": ("version",),
+}
+
+
+def _select_fields(fields: Iterable[str] | None) -> frozenset[str]:
+    if fields is None:
+        return frozenset(_FIELD_COLUMNS)
+    selected = set(fields)
+    unknown = selected - _FIELD_COLUMNS.keys()
+    if unknown:
+        raise ValueError(f"unknown run fields: {', '.join(sorted(unknown))}")
+    selected.add("id")
+    return frozenset(selected)
+
+
+def _row_to_run_record(
+    row: sqlite3.Row | dict[str, Any],
+    events: list[AuditEvent],
+    fields: frozenset[str] | None = None,
+) -> RunRecord:
+    selected = fields or frozenset(_FIELD_COLUMNS)
+    values: dict[str, Any] = {}
+    for field in selected:
+        values[field] = _read_field(row, field, events)
+    return RunRecord.model_construct(**values)
+
+
+def _read_field(row: sqlite3.Row | dict[str, Any], field: str, events: list[AuditEvent]) -> Any:
+    if field == "problem_spec":
+        return _trusted_problem_spec(json.loads(row["problem_spec_json"]))
+    if field == "ir":
+        return _trusted_ir_or_none(row["ir_json"], row["ir_blob"])
+    if field == "solution":
+        if not row["solution_json"]:
+            return None
+        return SolveResult.model_construct(**json.loads(row["solution_json"]))
+    if field == "solver_options":
+        return _options_from_json(row["solver_options_json"])
+    if field == "incumbent":
+        if not row["incumbent_json"]:
+            return None
+        return Incumbent.model_construct(**json.loads(row["incumbent_json"]))
+    if field == "audit":
+        metadata = json.loads(row["audit_json"]).get("metadata", {})
+        return AuditLog.model_construct(metadata=metadata, events=events)
+    return row[field]
+
+
+def _trusted_problem_spec(data: dict[str, Any]) -> ProblemSpec:
+    tables = [TableSpec.model_construct(**table) for table in data.get("tables", [])]
+    table_refs = [TableRef.model_construct(**ref) for ref in data.get("table_refs", [])]
+    return ProblemSpec.model_construct(text=data["text"], tables=tables, table_refs=table_refs)
+
+
+def _trusted_ir_or_none(ir_json: str | None, ir_blob: bytes | None) -> OptimizationModelIR | None:
+    if ir_blob:
+        return columnar_to_ir(decode_columnar(ir_blob))
+    if not ir_json:
+        return None
+    return trusted_ir(json.loads(ir_json))
+
+
+def trusted_ir(data: dict[str, Any]) -> OptimizationModelIR:
+    variables = [Variable.model_construct(**variable) for variable in data["variables"]]
+    constraints = [
+        Constraint.model_construct(
+            type=constraint["type"],
+            terms=_trusted_terms(constraint["terms"]),
+            operator=constraint["operator"],
+            rhs=constraint["rhs"],
+        )
+        for constraint in data.get("constraints", [])
+    ]
+    objective = data["objective"]
+    return OptimizationModelIR.model_construct(
+        version=data["version"],
+        name=data["name"],
+        description=data.get("description"),
+        variables=variables,
+        constraints=constraints,
+        objective=Objective.model_construct(
+            sense=objective["sense"],
+            terms=_trusted_terms(objective["terms"]),
+            constant=objective.get("constant", 0),
+        ),
+    )
+
+
+def _trusted_terms(terms: list[dict[str, Any]]) -> list[LinearTerm]:
+    return [LinearTerm.model_construct(var=term["var"], coeff=term["coeff"]) for term in terms]
+
+
+def _row_to_job(row: sqlite3.Row) -> SolveJob:
+    return SolveJob(
+        id=row["id"],
+        run_id=row["run_id"],
+        status=row["status"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        error=row["error"],
+        warm_start=row["warm_start"],
+        solver_options=_options_from_json(row["solver_options_json"]),
+    )
+
+
+def _row_to_sweep(row: sqlite3.Row) -> Sweep:
+    return Sweep(
+        id=row["id"],
+        run_id=row["run_id"],
+        status=row["status"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        scenario_count=row["scenario_count"],
+        completed=row["completed"],
+        error=row["error"],
+    )
+
+
+def _pack_values(variables: dict[str, int] | None) -> bytes | None:
+    if variables is None:
+        return None
+    return array("q", variables.values()).tobytes()
+
+
+def _row_to_scenario(row: sqlite3.Row, var_names: list[str] | None) -> SweepScenario:
+    values = array("q")
+    values.frombytes(row["values_blob"])
+    variables = None
+    if var_names is not None and row["solution_blob"] is not None:
+        solution = array("q")
+        solution.frombytes(row["solution_blob"])
+        variables = dict(zip(var_names, solution))
+    return SweepScenario.model_construct(
+        index=row["idx"],
+        values=values.tolist(),
+        status=row["status"],
+        objective_value=row["objective_value"],
+        variables=variables,
+    )
+
+
+def _row_to_columnar(row: sqlite3.Row) -> ColumnarIR | None:
+    if row["ir_blob"]:
+        return decode_columnar(row["ir_blob"])
+    if not row["ir_json"]:
+        return None
+    return ir_to_columnar(trusted_ir(json.loads(row["ir_json"])))
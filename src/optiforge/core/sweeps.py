@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from concurrent.futures import CancelledError, Future, as_completed
+from typing import Any
+
+from ortools.sat import cp_model_pb2
+
+from optiforge.core.columnar import ColumnarIR, decode_columnar, encode_columnar
+from optiforge.core.config import Settings
+from optiforge.core.jobs import new_lease_owner
+from optiforge.core.models import (
+    SolverOptions,
+    Sweep,
+    SweepParameter,
+    SweepRequest,
+    SweepScenario,
+)
+from optiforge.core.service import effective_solver_options
+from optiforge.core.solver import build_cp_model, row_domain, solve_cp_model
+from optiforge.core.solver_pool import SolverPool, new_solver_pool
+from optiforge.core.storage import RunStore
+
+logger = logging.getLogger(__name__)
+
+
+class SweepRunner:
+    def __init__(
+        self, settings: Settings, store: RunStore, pool: SolverPool | None = None
+    ) -> None:
+        self._settings = settings
+        self._store = store
+        self._pool = pool
+        self._owner = new_lease_owner()
+        self._lease_seconds = settings.solver_job_lease_seconds
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._executor: SolverPool | None = None
+        self._maintainer: threading.Thread | None = None
+        self._threads: dict[str, threading.Thread] = {}
+        self._futures: dict[str, list[Future]] = {}
+        self._lost: set[str] = set()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = self._pool or new_solver_pool(self._settings)
+            self._maintainer = threading.Thread(
+                target=self._maintain_loop, name="optiforge-sweep-leases", daemon=True
+            )
+        self._claim_pending()
+        self._maintainer.start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            maintainer = self._maintainer
+            threads = list(self._threads.values())
+            futures = [future for chunks in self._futures.values() for future in chunks]
+            self._executor = None
+            self._maintainer = None
+        if executor is None:
+            return
+        self._stopping.set()
+        if maintainer is not None:
+            maintainer.join()
+        if executor is self._pool:
+            for future in futures:
+                future.cancel()
+        else:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for thread in threads:
+            thread.join()
+        self._stopping.clear()
+
+    def submit(self, run_id: str, request: SweepRequest) -> Sweep:
+        columnar = self._store.get_columnar_ir(run_id)
+        if columnar is None:
+            raise ValueError("run has no IR to sweep")
+        resolve_targets(columnar, request.parameters)
+        count = math.prod(len(parameter.values) for parameter in request.parameters)
+        if count > self._settings.sweep_max_scenarios:
+            raise ValueError(f"sweep exceeds {self._settings.sweep_max_scenarios} scenarios")
+        sweep = self._store.create_sweep(run_id, request, count, self._owner, self._lease_seconds)
+        self.start()
+        self._spawn(sweep.id)
+        return sweep
+
+    def get(self, sweep_id: str) -> Sweep:
+        return self._store.get_sweep(sweep_id)
+
+    def scenarios(
+        self, sweep_id: str, offset: int, limit: int, include_variables: bool = False
+    ) -> list[SweepScenario]:
+        sweep = self._store.get_sweep(sweep_id)
+        var_names = None
+        if include_variables:
+            columnar = self._store.get_columnar_ir(sweep.run_id)
+            var_names = columnar.var_names if columnar is not None else None
+        return self._store.list_sweep_scenarios(sweep_id, offset, limit, var_names)
+
+    def _maintain_loop(self) -> None:
+        while not self._stopping.wait(timeout=self._lease_seconds / 3):
+            try:
+                self._renew_leases()
+                self._claim_pending()
+            except Exception:
+                logger.exception("sweep lease maintenance failed")
+
+    def _renew_leases(self) -> None:
+        with self._lock:
+            running = list(self._threads)
+        held = self._store.renew_sweep_leases(self._owner, running, self._lease_seconds)
+        for sweep_id in set(running) - held:
+            logger.info("no longer holds the lease on sweep %s", sweep_id)
+            self._abandon(sweep_id)
+
+    def _abandon(self, sweep_id: str) -> None:
+        with self._lock:
+            if sweep_id not in self._threads:
+                return
+            self._lost.add(sweep_id)
+        self._terminate(sweep_id)
+
+    def _terminate(self, sweep_id: str) -> None:
+        with self._lock:
+            futures = list(self._futures.get(sweep_id, []))
+            executor = self._executor
+        for future in futures:
+            if executor is None:
+                future.cancel()
+                continue
+            executor.terminate(future)
+
+    def _is_lost(self, sweep_id: str) -> bool:
+        with self._lock:
+            return sweep_id in self._lost
+
+    def _claim_pending(self) -> None:
+        for sweep_id in self._store.claim_pending_sweeps(self._owner, self._lease_seconds):
+            self._spawn(sweep_id)
+
+    def _spawn(self, sweep_id: str) -> None:
+        with self._lock:
+            if sweep_id in self._threads:
+                return
+            thread = threading.Thread(
+                target=self._run, args=(sweep_id,), name=f"optiforge-sweep-{sweep_id}", daemon=True
+            )
+            self._threads[sweep_id] = thread
+        thread.start()
+
+    def _run(self, sweep_id: str) -> None:
+        try:
+            self._execute(sweep_id)
+        except CancelledError:
+            return
+        except Exception as exc:
+            if self._stopping.is_set() or self._is_lost(sweep_id):
+                return
+            logger.exception("sweep %s failed", sweep_id)
+            self._store.set_sweep_status(sweep_id, "failed", str(exc) or type(exc).__name__)
+        finally:
+            with self._lock:
+                self._threads.pop(sweep_id, None)
+                self._futures.pop(sweep_id, None)
+                self._lost.discard(sweep_id)
+
+    def _execute(self, sweep_id: str) -> None:
+        sweep = self._store.get_sweep(sweep_id)
+        request = self._store.get_sweep_request(sweep_id)
+        columnar = self._store.get_columnar_ir(sweep.run_id)
+        if columnar is None:
+            raise ValueError("run has no IR to sweep")
+        self._store.set_sweep_status(sweep_id, "running")
+        done = self._store.completed_sweep_scenarios(sweep_id)
+        pending = [index for index in range(sweep.scenario_count) if index not in done]
+        size = max(1, self._settings.sweep_chunk_size)
+        chunks = [pending[start : start + size] for start in range(0, len(pending), size)]
+        options = effective_solver_options(request.options, self._settings)
+        solution = self._store.get_run(sweep.run_id, ["solution"]).solution
+        hint = solution.variables if solution is not None and solution.variables else None
+        parameters = [parameter.model_dump() for parameter in request.parameters]
+        blob = encode_columnar(columnar)
+        with self._lock:
+            executor = self._executor
+        if executor is None:
+            return
+        grace = self._settings.solver_kill_grace_seconds
+        futures: list[Future] = []
+        with self._lock:
+            self._futures[sweep_id] = futures
+        try:
+            for chunk in chunks:
+                futures.append(
+                    executor.submit(
+                        _solve_sweep_chunk,
+                        blob,
+                        parameters,
+                        chunk,
+                        options.max_seconds,
+                        options.model_dump(),
+                        hint,
+                        timeout=len(chunk) * options.max_seconds + grace,
+                    )
+                )
+            if self._is_lost(sweep_id):
+                self._abandon(sweep_id)
+            for future in as_completed(futures):
+                if self._is_lost(sweep_id):
+                    return
+                rows = future.result()
+                self._store.record_sweep_scenarios(
+                    sweep_id, [SweepScenario.model_construct(**row) for row in rows]
+                )
+        except BaseException:
+            self._terminate(sweep_id)
+            raise
+        if self._is_lost(sweep_id):
+            return
+        self._store.set_sweep_status(sweep_id, "succeeded")
+
+
+def scenario_values(parameters: list[SweepParameter], index: int) -> list[int]:
+    values = []
+    for parameter in reversed(parameters):
+        index, position = divmod(index, len(parameter.values))
+        values.append(parameter.values[position])
+    return values[::-1]
+
+
+def resolve_targets(ir: ColumnarIR, parameters: list[SweepParameter]) -> list[int]:
+    positions = {name: index for index, name in enumerate(ir.var_names)}
+    targets = []
+    for parameter in parameters:
+        if parameter.kind == "rhs":
+            if not 0 <= parameter.target < ir.num_constraints:
+                raise ValueError(f"constraint index out of range: {parameter.target}")
+            targets.append(parameter.target)
+            continue
+        if parameter.target not in positions:
+            raise ValueError(f"unknown sweep variable: {parameter.target}")
+        targets.append(positions[parameter.target])
+    return targets
+
+
+def apply_scenario(
+    proto: cp_model_pb2.CpModelProto,
+    ir: ColumnarIR,
+    parameters: list[SweepParameter],
+    targets: list[int],
+    values: list[int],
+) -> bool:
+    sign = 1 if ir.objective_sense == "minimize" else -1
+    for parameter, target, value in zip(parameters, targets, values):
+        if parameter.kind == "rhs":
+            proto.constraints[target].linear.domain[:] = row_domain(ir.operators[target], value)
+        if parameter.kind == "lower_bound":
+            proto.variables[target].domain[0] = value
+        if parameter.kind == "upper_bound":
+            proto.variables[target].domain[1] = value
+        if parameter.kind == "objective_coeff":
+            _set_objective_coeff(proto.objective, target, sign * value)
+    return all(
+        proto.variables[target].domain[0] <= proto.variables[target].domain[1]
+        for parameter, target in zip(parameters, targets)
+        if parameter.kind != "rhs"
+    )
+
+
+def _set_objective_coeff(
+    objective: cp_model_pb2.CpObjectiveProto, var_index: int, coeff: int
+) -> None:
+    positions = [position for position, var in enumerate(objective.vars) if var == var_index]
+    if not positions:
+        objective.vars.append(var_index)
+        objective.coeffs.append(coeff)
+        return
+    objective.coeffs[positions[0]] = coeff
+    for position in positions[1:]:
+        objective.coeffs[position] = 0
+
+
+def _solve_sweep_chunk(
+    ir_blob: bytes,
+    parameters: list[dict[str, Any]],
+    indices: list[int],
+    max_seconds: int,
+    options: dict[str, Any],
+    hint: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    ir = decode_columnar(ir_blob)
+    sweep_parameters = [SweepParameter.model_validate(parameter) for parameter in parameters]
+    targets = resolve_targets(ir, sweep_parameters)
+    solver_options = SolverOptions.model_construct(**options)
+    model = build_cp_model(ir)
+    rows = []
+    for index in indices:
+        values = scenario_values(sweep_parameters, index)
+        row: dict[str, Any] = {"index": index, "values": values, "objective_value": None}
+        if not apply_scenario(model.Proto(), ir, sweep_parameters, targets, values):
+            rows.append({**row, "status": "infeasible", "variables": None})
+            continue
+        result = solve_cp_model(model, ir.var_names, max_seconds, solver_options, hint=hint)
+        row.update(status=result.status, objective_value=result.objective_value)
+        row["variables"] = result.variables or None
+        if result.variables:
+            hint = result.variables
+        rows.append(row)
+    return rows
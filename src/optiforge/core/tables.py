@@ -0,0 +1,468 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import math
+import re
+import struct
+import time
+import uuid
+import zlib
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any, BinaryIO
+
+from optiforge.core.columnar import little_endian
+from optiforge.core.models import TableColumn, TableSummary
+from optiforge.core.storage import SqliteDatabase
+
+ColumnBatch = list[list[Any]]
+
+_CHUNK_HEADER = struct.Struct("<I")
+_INT_TEXT = re.compile(r"0|-?[1-9][0-9]*")
+_NUMBER_TEXT = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_EXACT_FLOAT_INT = 2**53
+_STALE_UPLOAD_SECONDS = 24 * 3600
+
+
+class TableStore:
+    def __init__(
+        self,
+        database_url: str,
+        busy_timeout_ms: int = 5000,
+        chunk_rows: int = 65536,
+        sample_rows: int = 20,
+    ) -> None:
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self._db = SqliteDatabase(database_url, busy_timeout_ms)
+        self._chunk_rows = chunk_rows
+        self._sample_rows = sample_rows
+        self._init_db()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def ingest_csv(self, stream: BinaryIO) -> TableSummary:
+        start = stream.tell()
+        columns, batches = csv_batches(stream, self._chunk_rows)
+
+        def rescan() -> Iterator[ColumnBatch]:
+            stream.seek(start)
+            return csv_batches(stream, self._chunk_rows)[1]
+
+        return self.ingest(columns, batches, rescan)
+
+    def ingest_parquet(self, stream: BinaryIO) -> TableSummary:
+        columns, batches = parquet_batches(stream, self._chunk_rows)
+        return self.ingest(
+            columns, batches, lambda: parquet_batches(stream, self._chunk_rows)[1]
+        )
+
+    def ingest(
+        self,
+        columns: list[str],
+        batches: Iterable[ColumnBatch],
+        rescan: Callable[[], Iterable[ColumnBatch]],
+    ) -> TableSummary:
+        _check_columns(columns)
+        kinds = infer_column_types(len(columns), batches)
+        writer = _TableWriter(self._db, columns, kinds, self._chunk_rows, self._sample_rows)
+        try:
+            for batch in rescan():
+                writer.feed(batch)
+            return writer.finish()
+        except BaseException:
+            writer.discard()
+            raise
+
+    def get_summary(self, table_hash: str) -> TableSummary:
+        conn = self._db.connection()
+        row = conn.execute(
+            "SELECT summary_json FROM data_tables WHERE hash = ?", (table_hash,)
+        ).fetchone()
+        if not row:
+            raise KeyError("table not found")
+        return TableSummary.model_validate_json(row["summary_json"])
+
+    def missing(self, table_hashes: Iterable[str]) -> list[str]:
+        wanted = sorted(set(table_hashes))
+        if not wanted:
+            return []
+        placeholders = ", ".join("?" for _ in wanted)
+        conn = self._db.connection()
+        rows = conn.execute(
+            f"SELECT hash FROM data_tables WHERE hash IN ({placeholders})", wanted
+        ).fetchall()
+        found = {row["hash"] for row in rows}
+        return [table_hash for table_hash in wanted if table_hash not in found]
+
+    def read_rows(
+        self, table_hash: str, offset: int, limit: int
+    ) -> tuple[list[str], list[list[Any]]]:
+        conn = self._db.connection()
+        table = conn.execute(
+            "SELECT columns_json, row_count, chunk_rows FROM data_tables WHERE hash = ?",
+            (table_hash,),
+        ).fetchone()
+        if not table:
+            raise KeyError("table not found")
+        columns = json.loads(table["columns_json"])
+        end = min(offset + limit, table["row_count"])
+        rows: list[list[Any]] = []
+        chunk_rows = table["chunk_rows"]
+        for index in range(offset // chunk_rows, (end + chunk_rows - 1) // chunk_rows):
+            chunk = conn.execute(
+                "SELECT data FROM data_table_chunks WHERE table_id = ? AND idx = ?",
+                (table_hash, index),
+            ).fetchone()
+            values = decode_chunk(zlib.decompress(chunk["data"]))
+            first = index * chunk_rows
+            start = max(offset, first) - first
+            stop = min(end, first + len(values[0])) - first
+            rows.extend([list(row) for row in zip(*(column[start:stop] for column in values))])
+        return columns, rows
+
+    def _init_db(self) -> None:
+        with self._db.transaction(immediate=True) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS data_tables (
+                    hash TEXT PRIMARY KEY,
+                    columns_json TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    chunk_rows INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    summary_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS data_table_chunks (
+                    table_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (table_id, idx)
+                )
+                """
+            )
+            conn.execute(
+                """
+                DELETE FROM data_table_chunks
+                WHERE created_at < ? AND table_id NOT IN (SELECT hash FROM data_tables)
+                """,
+                (time.time() - _STALE_UPLOAD_SECONDS,),
+            )
+
+
+class _TableWriter:
+    def __init__(
+        self,
+        db: SqliteDatabase,
+        columns: list[str],
+        kinds: list[str],
+        chunk_rows: int,
+        sample_rows: int,
+    ) -> None:
+        self._db = db
+        self._columns = columns
+        self._kinds = kinds
+        self._chunk_rows = chunk_rows
+        self._sample_rows = sample_rows
+        self._upload_id = f"upload:{uuid.uuid4()}"
+        self._digest = hashlib.sha256(json.dumps([columns, kinds]).encode("utf-8"))
+        self._pending: ColumnBatch = [[] for _ in columns]
+        self._chunks = 0
+        self._rows = 0
+        self._size = 0
+        self._bounds: list[tuple[Any, Any] | None] = [None] * len(columns)
+        self._sample: list[list[Any]] = []
+
+    def feed(self, batch: ColumnBatch) -> None:
+        if len(batch) != len(self._columns):
+            raise ValueError(f"expected {len(self._columns)} columns, got {len(batch)}")
+        for pending, values in zip(self._pending, batch):
+            pending.extend(values)
+        while len(self._pending[0]) >= self._chunk_rows:
+            chunk = [pending[: self._chunk_rows] for pending in self._pending]
+            self._pending = [pending[self._chunk_rows :] for pending in self._pending]
+            self._write(chunk)
+
+    def finish(self) -> TableSummary:
+        if self._pending[0]:
+            self._write(self._pending)
+        table_hash = self._digest.hexdigest()
+        summary = TableSummary(
+            hash=table_hash,
+            columns=[
+                TableColumn(
+                    name=name,
+                    type=kind,
+                    min=None if bounds is None else bounds[0],
+                    max=None if bounds is None else bounds[1],
+                )
+                for name, kind, bounds in zip(self._columns, self._kinds, self._bounds)
+            ],
+            row_count=self._rows,
+            size_bytes=self._size,
+            sample=self._sample,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        with self._db.transaction(immediate=True) as conn:
+            existing = conn.execute(
+                "SELECT summary_json FROM data_tables WHERE hash = ?", (table_hash,)
+            ).fetchone()
+            if existing:
+                conn.execute(
+                    "DELETE FROM data_table_chunks WHERE table_id = ?", (self._upload_id,)
+                )
+                return TableSummary.model_validate_json(existing["summary_json"])
+            conn.execute(
+                "UPDATE data_table_chunks SET table_id = ? WHERE table_id = ?",
+                (table_hash, self._upload_id),
+            )
+            conn.execute(
+                """
+                INSERT INTO data_tables (
+                    hash, columns_json, row_count, chunk_rows, size_bytes, summary_json,
+                    created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    table_hash,
+                    json.dumps(self._columns),
+                    self._rows,
+                    self._chunk_rows,
+                    self._size,
+                    summary.model_dump_json(),
+                    summary.created_at,
+                ),
+            )
+        return summary
+
+    def discard(self) -> None:
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM data_table_chunks WHERE table_id = ?", (self._upload_id,))
+
+    def _write(self, chunk: ColumnBatch) -> None:
+        typed = [(kind, _convert(kind, values)) for kind, values in zip(self._kinds, chunk)]
+        rows = [list(row) for row in zip(*(values for _, values in typed))]
+        self._digest.update(b"".join(_canonical(row) + b"\n" for row in rows))
+        data = zlib.compress(encode_chunk(typed), 1)
+        with self._db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO data_table_chunks (table_id, idx, row_count, data, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (self._upload_id, self._chunks, len(chunk[0]), data, time.time()),
+            )
+        self._chunks += 1
+        self._rows += len(chunk[0])
+        self._size += len(data)
+        for index, (kind, values) in enumerate(typed):
+            if kind != "str":
+                self._bounds[index] = _widen_bounds(self._bounds[index], values)
+        missing = self._sample_rows - len(self._sample)
+        if missing > 0:
+            self._sample.extend(rows[:missing])
+
+
+def csv_batches(stream: BinaryIO, chunk_rows: int) -> tuple[list[str], Iterator[ColumnBatch]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    try:
+        header = next(reader, None)
+    except (csv.Error, UnicodeDecodeError) as exc:
+        text.detach()
+        raise ValueError(f"invalid CSV header: {exc}") from exc
+    if header is None:
+        text.detach()
+        raise ValueError("CSV upload is empty")
+    width = len(header)
+
+    def batches() -> Iterator[ColumnBatch]:
+        rows: list[list[str]] = []
+        try:
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != width:
+                    raise ValueError(
+                        f"CSV line {reader.line_num} has {len(row)} values, expected {width}"
+                    )
+                rows.append(row)
+                if len(rows) == chunk_rows:
+                    yield [list(column) for column in zip(*rows)]
+                    rows = []
+            if rows:
+                yield [list(column) for column in zip(*rows)]
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ValueError(f"invalid CSV near line {reader.line_num}: {exc}") from exc
+        finally:
+            text.detach()
+
+    return header, batches()
+
+
+def parquet_batches(stream: BinaryIO, chunk_rows: int) -> tuple[list[str], Iterator[ColumnBatch]]:
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("Parquet uploads require the optional pyarrow package")
+    import pyarrow.parquet as pq
+
+    try:
+        parquet = pq.ParquetFile(stream)
+    except Exception as exc:
+        raise ValueError(f"invalid Parquet file: {exc}") from exc
+
+    def batches() -> Iterator[ColumnBatch]:
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            yield [batch.column(index).to_pylist() for index in range(batch.num_columns)]
+
+    return list(parquet.schema_arrow.names), batches()
+
+
+def encode_chunk(columns: list[tuple[str, list[Any]]]) -> bytes:
+    header: dict[str, Any] = {"columns": []}
+    payloads = []
+    for kind, values in columns:
+        mask = b""
+        if kind != "str" and None in values:
+            mask = _null_mask(values)
+            values = [0 if value is None else value for value in values]
+        if kind == "int":
+            payload = little_endian(array("q", values)).tobytes()
+        if kind == "float":
+            payload = little_endian(array("d", values)).tobytes()
+        if kind == "str":
+            payload = _canonical(values)
+        header["columns"].append([kind, len(values), len(payload), len(mask)])
+        payloads.append(payload + mask)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return _CHUNK_HEADER.pack(len(header_bytes)) + header_bytes + b"".join(payloads)
+
+
+def decode_chunk(data: bytes) -> list[list[Any]]:
+    (header_length,) = _CHUNK_HEADER.unpack_from(data)
+    offset = _CHUNK_HEADER.size
+    header = json.loads(data[offset : offset + header_length])
+    offset += header_length
+    columns: list[list[Any]] = []
+    for kind, _, size, *extra in header["columns"]:
+        mask_size = extra[0] if extra else 0
+        payload = data[offset : offset + size]
+        mask = data[offset + size : offset + size + mask_size]
+        offset += size + mask_size
+        if kind == "str":
+            columns.append(json.loads(payload))
+            continue
+        values = array("q" if kind == "int" else "d")
+        values.frombytes(payload)
+        decoded = little_endian(values).tolist()
+        if mask:
+            decoded = [
+                None if mask[position >> 3] >> (position & 7) & 1 else value
+                for position, value in enumerate(decoded)
+            ]
+        columns.append(decoded)
+    return columns
+
+
+def _null_mask(values: list[Any]) -> bytes:
+    mask = bytearray((len(values) + 7) // 8)
+    for position, value in enumerate(values):
+        if value is None:
+            mask[position >> 3] |= 1 << (position & 7)
+    return bytes(mask)
+
+
+def _canonical(values: list[Any]) -> bytes:
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _check_columns(columns: list[str]) -> None:
+    if not columns:
+        raise ValueError("tables must include at least one column")
+    if any(not name for name in columns):
+        raise ValueError("table column names must not be empty")
+    if len(set(columns)) != len(columns):
+        raise ValueError("table column names must be unique")
+
+
+def infer_column_types(width: int, batches: Iterable[ColumnBatch]) -> list[str]:
+    seen: list[set[str]] = [set() for _ in range(width)]
+    for batch in batches:
+        if len(batch) != width:
+            raise ValueError(f"expected {width} columns, got {len(batch)}")
+        for kinds, values in zip(seen, batch):
+            if "str" not in kinds:
+                kinds.update(map(_value_type, values))
+    return [_column_type(kinds) for kinds in seen]
+
+
+def _value_type(value: Any) -> str:
+    if value is None or value == "":
+        return "null"
+    if type(value) is str:
+        if _INT_TEXT.fullmatch(value):
+            return _int_type(int(value))
+        if _NUMBER_TEXT.fullmatch(value) and math.isfinite(float(value)):
+            return "float"
+        return "str"
+    if type(value) is int:
+        return _int_type(value)
+    if type(value) is float and math.isfinite(value):
+        return "float"
+    return "str"
+
+
+def _int_type(value: int) -> str:
+    if not _INT64_MIN <= value <= _INT64_MAX:
+        return "str"
+    if abs(value) > _EXACT_FLOAT_INT:
+        return "wide_int"
+    return "int"
+
+
+def _column_type(kinds: set[str]) -> str:
+    kinds = kinds - {"null"}
+    if not kinds or "str" in kinds:
+        return "str"
+    if "float" in kinds:
+        return "str" if "wide_int" in kinds else "float"
+    return "int"
+
+
+def _convert(kind: str, values: list[Any]) -> list[Any]:
+    if kind == "int":
+        return [None if value is None or value == "" else int(value) for value in values]
+    if kind == "float":
+        return [None if value is None or value == "" else float(value) for value in values]
+    return [value if type(value) is str else _text(value) for value in values]
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _widen_bounds(bounds: tuple[Any, Any] | None, values: list[Any]) -> tuple[Any, Any] | None:
+    values = [value for value in values if value is not None]
+    if not values:
+        return bounds
+    low = min(values)
+    high = max(values)
+    if bounds is None:
+        return low, high
+    return min(bounds[0], low), max(bounds[1], high)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import functools
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,8 @@ from pydantic import ValidationError as PydanticValidationError
 
 from optiforge.core.models import OptimizationModelIR
 
+_SCHEMA_VERSION = "1.0"
+
 
 def _schema_path() -> Path:
     return Path(__file__).resolve().parents[3] / "schemas" / "optimization_model_ir.schema.json"
@@ -21,18 +25,50 @@ def load_ir_schema() -> dict[str, Any]:
     return schema
 
 
+class IRValidator:
+    def __init__(self, schema_path: Path | None = None, fast_path: bool = True) -> None:
+        self._schema_path = schema_path or _schema_path()
+        self._fast_path = fast_path
+        self._lock = threading.Lock()
+        self._mtime_ns: int | None = None
+        self._compiled: Draft202012Validator | None = None
+
+    def validate(self, data: dict[str, Any]) -> OptimizationModelIR:
+        if self._fast_path and _covered_by_model(data):
+            try:
+                return OptimizationModelIR.model_validate(data)
+            except PydanticValidationError as exc:
+                self._check_schema(data)
+                raise ValueError(f"IR pydantic validation failed: {exc}") from exc
+        self._check_schema(data)
+        try:
+            return OptimizationModelIR.model_validate(data)
+        except PydanticValidationError as exc:
+            raise ValueError(f"IR pydantic validation failed: {exc}") from exc
+
+    def schema_validator(self) -> Draft202012Validator:
+        mtime_ns = self._schema_path.stat().st_mtime_ns
+        with self._lock:
+            if self._compiled is None or mtime_ns != self._mtime_ns:
+                schema = json.loads(self._schema_path.read_text(encoding="utf-8"))
+                self._compiled = Draft202012Validator(schema)
+                self._mtime_ns = mtime_ns
+            return self._compiled
+
+    def _check_schema(self, data: dict[str, Any]) -> None:
+        errors = sorted(self.schema_validator().iter_errors(data), key=lambda err: err.path)
+        if errors:
+            details = "; ".join([_format_schema_error(error) for error in errors])
+            raise ValueError(f"IR schema validation failed: {details}")
+
+
+@functools.lru_cache(maxsize=1)
+def get_ir_validator() -> IRValidator:
+    return IRValidator()
+
+
 def validate_ir_json(data: dict[str, Any]) -> OptimizationModelIR:
-    schema = load_ir_schema()
-    validator = Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(data), key=lambda err: err.path)
-    if errors:
-        details = "; ".join([_format_schema_error(error) for error in errors])
-        raise ValueError(f"IR schema validation failed: {details}")
-    try:
-        model = OptimizationModelIR.model_validate(data)
-    except PydanticValidationError as exc:
-        raise ValueError(f"IR pydantic validation failed: {exc}") from exc
-    return model
+    return get_ir_validator().validate(data)
 
 
 def parse_ir_json(raw_json: str) -> OptimizationModelIR:
@@ -40,8 +76,16 @@ def parse_ir_json(raw_json: str) -> OptimizationModelIR:
     return validate_ir_json(data)
 
 
+def _covered_by_model(data: Any) -> bool:
+    if not isinstance(data, dict):
+        return False
+    if data.get("version") != _SCHEMA_VERSION or "constraints" not in data:
+        return False
+    return isinstance(data.get("description", ""), str)
+
+
 def _format_schema_error(error: Exception) -> str:
     if not hasattr(error, "message"):
         return "invalid IR"
     path = "./" + "/".join([str(segment) for segment in error.path])
-    return f"{path}: {error.message}"
\ No newline at end of file
+    return f"{path}: {error.message}"
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+from optiforge.core.columnar import columnar_to_ir, decode_columnar, encode_columnar, ir_to_columnar
+from optiforge.core.models import ProblemSpec
+from optiforge.core.solver import solve_ir
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_columnar_round_trip_is_lossless() -> None:
+    data = _load_example_ir()
+    data["constraints"].append(
+        {
+            "type": "linear",
+            "terms": [{"var": "y", "coeff": -2}, {"var": "y", "coeff": 0}],
+            "operator": "=",
+            "rhs": -4,
+        }
+    )
+    ir = validate_ir_json(data)
+    columnar = decode_columnar(encode_columnar(ir_to_columnar(ir)))
+    assert columnar.num_nonzeros == 4
+    assert columnar_to_ir(columnar).model_dump() == ir.model_dump()
+
+
+def test_columnar_ir_solves_like_pydantic_ir() -> None:
+    ir = validate_ir_json(_load_example_ir())
+    assert solve_ir(ir_to_columnar(ir), max_seconds=5) == solve_ir(ir, max_seconds=5)
+
+
+def test_store_persists_large_ir_as_columnar_blob(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}", columnar_min_terms=1)
+    run_id = store.create_run(ProblemSpec(text="columnar"), "stub", "stub-model")
+    ir = validate_ir_json(_load_example_ir())
+    run = store.update_run_ir(run_id, ir, "stub", "stub-model")
+    assert run.audit.events[-1].details["ir_encoding"] == "columnar"
+    assert store.get_run(run_id).ir.model_dump() == ir.model_dump()
+    assert store.get_columnar_ir(run_id).var_names == ["x", "y"]
+    store.close()
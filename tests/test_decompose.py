@@ -0,0 +1,157 @@
+import random
+import time
+
+from optiforge.core import decompose
+from optiforge.core.columnar import ir_to_columnar
+from optiforge.core.decompose import find_components, plan_blocks, split_blocks
+from optiforge.core.metrics import Profile
+from optiforge.core.models import OptimizationModelIR, SolveResult, SolverOptions
+from optiforge.core.presolve import solve_model
+
+
+def _multi_site_ir(sites: int, infeasible_site: int | None = None) -> OptimizationModelIR:
+    variables = []
+    constraints = []
+    objective = []
+    for site in range(sites):
+        x, y = f"x_{site}", f"y_{site}"
+        variables.append({"name": x, "type": "int", "lower_bound": 0, "upper_bound": 4})
+        variables.append({"name": y, "type": "int", "lower_bound": 0, "upper_bound": 20})
+        rhs = -1 if site == infeasible_site else 10 + site
+        constraints.append(
+            {
+                "type": "linear",
+                "terms": [{"var": x, "coeff": 1}, {"var": y, "coeff": 1}],
+                "operator": "<=",
+                "rhs": rhs,
+            }
+        )
+        constraints.append(
+            {
+                "type": "linear",
+                "terms": [{"var": x, "coeff": 2}, {"var": y, "coeff": -1}],
+                "operator": ">=",
+                "rhs": 0,
+            }
+        )
+        objective.extend([{"var": x, "coeff": 3}, {"var": y, "coeff": 2}])
+    return OptimizationModelIR.model_validate(
+        {
+            "version": "1.0",
+            "name": "multi_site",
+            "variables": variables,
+            "constraints": constraints,
+            "objective": {"sense": "maximize", "terms": objective, "constant": 5},
+        }
+    )
+
+
+def test_components_follow_shared_variables() -> None:
+    columnar = ir_to_columnar(_multi_site_ir(3))
+    components = find_components(columnar)
+    assert sorted(cols for cols, _ in components) == [[0, 1], [2, 3], [4, 5]]
+    assert sorted(rows for _, rows in components) == [[0, 1], [2, 3], [4, 5]]
+    blocks = plan_blocks(components, max_blocks=2)
+    assert len(blocks) == 2
+    parts = split_blocks(columnar, blocks)
+    assert sum(part.num_variables for part in parts) == 6
+    assert sum(part.num_constraints for part in parts) == 6
+    assert sum(len(part.objective_indices) for part in parts) == 6
+
+
+def test_decomposed_solve_matches_monolithic_solve() -> None:
+    ir = _multi_site_ir(4)
+    monolithic, _ = solve_model(ir, 5, presolve=False)
+    profile = Profile()
+    incumbents = []
+    decomposed, _ = solve_model(
+        ir,
+        5,
+        on_incumbent=lambda incumbent, values: incumbents.append((incumbent, values())),
+        presolve=False,
+        profile=profile,
+        decompose=True,
+    )
+    assert decomposed.status == "optimal"
+    assert decomposed.objective_value == monolithic.objective_value
+    assert list(decomposed.variables) == [variable.name for variable in ir.variables]
+    assert profile.decomposition["components"] == 4
+    assert len(profile.decomposition["block_stats"]) == 4
+    assert profile.solver["status"] == "optimal"
+    assert "decompose" in profile.stages
+    assert incumbents
+    incumbent, values = incumbents[-1]
+    assert len(values) == 8
+    assert incumbent.objective_value <= decomposed.objective_value
+
+
+def test_one_infeasible_block_makes_the_model_infeasible() -> None:
+    result, _ = solve_model(_multi_site_ir(3, infeasible_site=1), 5, presolve=False, decompose=True)
+    assert result.status == "infeasible"
+
+
+def _knapsacks_ir(blocks: int, items: int, rows: int = 5) -> OptimizationModelIR:
+    rng = random.Random(3)
+    variables = []
+    constraints = []
+    objective = []
+    for block in range(blocks):
+        names = [f"b{block}_{item}" for item in range(items)]
+        variables.extend(
+            {"name": name, "type": "int", "lower_bound": 0, "upper_bound": 1} for name in names
+        )
+        for _ in range(rows):
+            weights = [rng.randint(10**4, 10**6) for _ in names]
+            terms = [{"var": name, "coeff": weight} for name, weight in zip(names, weights)]
+            constraints.append(
+                {"type": "linear", "terms": terms, "operator": "<=", "rhs": sum(weights) // 2}
+            )
+        objective.extend({"var": name, "coeff": rng.randint(10**4, 10**6)} for name in names)
+    return OptimizationModelIR.model_validate(
+        {
+            "version": "1.0",
+            "name": "knapsacks",
+            "variables": variables,
+            "constraints": constraints,
+            "objective": {"sense": "maximize", "terms": objective},
+        }
+    )
+
+
+def test_blocks_queued_behind_earlier_waves_still_get_solve_time() -> None:
+    ir = _knapsacks_ir(12, 100)
+    profile = Profile()
+    result, _ = solve_model(
+        ir, 1, SolverOptions(num_search_workers=2), profile=profile, decompose=True
+    )
+    assert result.status in {"optimal", "feasible"}
+    assert len(result.variables) == len(ir.variables)
+    assert profile.decomposition["parallelism"] == 2
+
+
+def test_unsolved_blocks_fall_back_to_the_whole_model_in_reserved_time(monkeypatch) -> None:
+    ir = _multi_site_ir(4)
+    monolithic, _ = solve_model(ir, 5, presolve=False)
+    solve_ir = decompose.solve_ir
+    delays = []
+
+    def unsolved_blocks(part, max_seconds, *args):
+        if "[" not in part.name:
+            return solve_ir(part, max_seconds, *args)
+        time.sleep(max_seconds + delays[0])
+        return SolveResult(status="unknown", objective_value=None, variables={})
+
+    monkeypatch.setattr(decompose, "solve_ir", unsolved_blocks)
+    delays.append(0.0)
+    profile = Profile()
+    result, _ = solve_model(ir, 1, presolve=False, profile=profile, decompose=True)
+    assert profile.decomposition["fallback"] is True
+    assert result.objective_value == monolithic.objective_value
+    assert profile.solver["status"] == result.status
+    assert "fallback" in profile.stages
+    delays[0] = 0.3
+    profile = Profile()
+    result, _ = solve_model(ir, 1, presolve=False, profile=profile, decompose=True)
+    assert profile.decomposition["fallback"] is False
+    assert result.status == "unknown"
+    assert profile.solver["status"] == "unknown"
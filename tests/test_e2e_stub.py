@@ -1,3 +1,5 @@
+import json
+import time
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -19,7 +21,19 @@ def test_e2e_stub_provider(monkeypatch, tmp_path: Path) -> None:
     from optiforge.api import main
 
     main.get_store.cache_clear()
-    client = TestClient(main.app)
+    main.get_table_store.cache_clear()
+    main.get_ir_cache.cache_clear()
+    main.get_provider_registry.cache_clear()
+    main.get_solution_cache.cache_clear()
+    main.get_metrics.cache_clear()
+    main.get_job_queue.cache_clear()
+    main.get_sweep_runner.cache_clear()
+    main.get_solver_pool.cache_clear()
+    with TestClient(main.app) as client:
+        _run_lifecycle(client)
+
+
+def _run_lifecycle(client: TestClient) -> None:
     payload = {
         "text": "Minimize cost with x and y given constraints.",
         "tables": [],
@@ -30,12 +44,157 @@ def test_e2e_stub_provider(monkeypatch, tmp_path: Path) -> None:
     response = client.post(f"/api/runs/{run_id}/generate")
     assert response.status_code == 200
     assert response.json()["status"] == "ir_generated"
-    response = client.post(f"/api/runs/{run_id}/solve")
-    assert response.status_code == 200
-    assert response.json()["status"] in {"solved", "infeasible"}
+    options = {"num_search_workers": 64, "random_seed": 1}
+    response = client.post(f"/api/runs/{run_id}/solve", json={"options": options})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["run_id"] == run_id
+    assert job["solver_options"]["num_search_workers"] == 64
+    job = _wait_for_job(client, job["id"])
+    assert job["status"] == "succeeded"
     response = client.get(f"/api/runs/{run_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == run_id
     assert data["ir"] is not None
-    assert data["solution"] is not None
\ No newline at end of file
+    assert data["solution"] is not None
+    assert data["status"] in {"solved", "infeasible"}
+    assert data["solver_options"] is None
+    solved = [event for event in data["audit"]["events"] if event["action"] == "solved"]
+    assert solved[-1]["details"]["solver_options"]["num_search_workers"] <= 8
+    assert solved[-1]["details"]["solver_options"]["random_seed"] == 1
+    assert data["incumbent"]["variables"] is not None
+    assert {"load", "model_build", "solve"} <= set(solved[-1]["details"]["timings"])
+    assert solved[-1]["details"]["solver_stats"]["status"] == data["solution"]["status"]
+    generated = [event for event in data["audit"]["events"] if event["action"] == "ir_generated"]
+    assert "provider" in generated[-1]["details"]["timings"]
+    metrics = client.get("/metrics").text
+    assert 'optiforge_stage_duration_seconds_count{operation="solve",stage="solve"} 1' in metrics
+    assert 'optiforge_operations_total{operation="generate",outcome="success"} 1' in metrics
+    assert "optiforge_solver_branches_total" in metrics
+    response = client.get(f"/api/runs/{run_id}/solve/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0].startswith("event: incumbent\nid: ")
+    assert events[-1].startswith("event: done\n")
+    assert '"status":"succeeded"' in events[-1]
+    response = client.post(f"/api/runs/{run_id}/solve")
+    assert response.json()["solver_options"] is None
+    assert _wait_for_job(client, response.json()["id"])["status"] == "succeeded"
+    events = client.get(f"/api/runs/{run_id}").json()["audit"]["events"]
+    assert "random_seed" not in events[-1]["details"]["solver_options"]
+
+
+def _wait_for_job(client: TestClient, job_id: str) -> dict:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] not in {"queued", "running"}:
+            return job
+        time.sleep(0.1)
+    raise AssertionError("solve job did not finish in time")
+
+
+def test_list_runs_paginates_and_filters(monkeypatch, tmp_path: Path) -> None:
+    _set_env(monkeypatch, tmp_path)
+    from optiforge.core.config import get_settings
+
+    get_settings.cache_clear()
+    from optiforge.api import main
+
+    main.get_store.cache_clear()
+    main.get_table_store.cache_clear()
+    client = TestClient(main.app)
+    run_ids = []
+    for index in range(5):
+        response = client.post("/api/runs", json={"text": f"run {index}", "tables": []})
+        run_ids.append(response.json()["id"])
+    client.post(f"/api/runs/{run_ids[0]}/generate")
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/runs", params=params).json()
+        seen.extend([item["id"] for item in page["items"]])
+        assert all("ir" not in item for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(run_ids)
+    page = client.get("/api/runs", params={"status": "ir_generated", "view": "full"}).json()
+    assert [item["id"] for item in page["items"]] == [run_ids[0]]
+    assert page["items"][0]["ir"] is not None
+    assert client.get("/api/runs", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_get_run_returns_only_requested_fields(monkeypatch, tmp_path: Path) -> None:
+    _set_env(monkeypatch, tmp_path)
+    from optiforge.core.config import get_settings
+
+    get_settings.cache_clear()
+    from optiforge.api import main
+
+    main.get_store.cache_clear()
+    main.get_table_store.cache_clear()
+    client = TestClient(main.app)
+    run_id = client.post("/api/runs", json={"text": "fields", "tables": []}).json()["id"]
+    client.post(f"/api/runs/{run_id}/generate")
+    response = client.get(f"/api/runs/{run_id}", params={"fields": "status,ir"})
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"id", "status", "ir"}
+    assert data["ir"]["name"] == "stub_min_cost"
+    response = client.get(f"/api/runs/{run_id}", params={"fields": "status,bogus"})
+    assert response.status_code == 400
+
+
+def test_batch_creates_generates_and_solves_with_per_item_errors(
+    monkeypatch, tmp_path: Path
+) -> None:
+    _set_env(monkeypatch, tmp_path)
+    from optiforge.core.config import get_settings
+
+    get_settings.cache_clear()
+    from optiforge.api import main
+
+    main.get_store.cache_clear()
+    main.get_table_store.cache_clear()
+    main.get_ir_cache.cache_clear()
+    main.get_provider_registry.cache_clear()
+    main.get_solution_cache.cache_clear()
+    main.get_metrics.cache_clear()
+    main.get_job_queue.cache_clear()
+    main.get_sweep_runner.cache_clear()
+    main.get_solver_pool.cache_clear()
+    ir_path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    ir = json.loads(ir_path.read_text(encoding="utf-8"))
+    huge = json.loads(ir_path.read_text(encoding="utf-8"))
+    huge["constraints"][0]["rhs"] = 2**70
+    items = [
+        {"problem_spec": {"text": "batch spec", "tables": []}},
+        {"ir": ir, "options": {"random_seed": 3}},
+        {"ir": {**ir, "variables": []}},
+        {"problem_spec": {"text": "generate only", "tables": []}, "solve": False},
+        {"ir": huge},
+    ]
+    with TestClient(main.app) as client:
+        response = client.post("/api/runs/batch", json={"items": items})
+        assert response.status_code == 200
+        results = response.json()["items"]
+        assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+        assert results[2]["run_id"] is None
+        assert results[2]["error"].startswith("IR schema validation failed")
+        assert results[3]["status"] == "ir_generated"
+        assert results[3]["job"] is None
+        assert results[4]["run_id"] is None
+        assert "64 bits" in results[4]["error"]
+        for result in results[:2]:
+            assert result["status"] == "ir_generated"
+            assert _wait_for_job(client, result["job"]["id"])["status"] == "succeeded"
+        run = client.get(f"/api/runs/{results[1]['run_id']}").json()
+        assert run["solution"]["objective_value"] == 10
+        assert run["solver_options"]["random_seed"] == 3
+        assert client.post("/api/runs/batch", json={"items": []}).status_code == 422
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+from optiforge.core.ir_cache import IRCache, ir_cache_key
+from optiforge.core.models import ProblemSpec
+from optiforge.core.provider import StubProvider
+from optiforge.core.validation import validate_ir_json
+
+
+def _stub_ir():
+    return validate_ir_json(StubProvider().generate_ir(ProblemSpec(text="cache")))
+
+
+def test_concurrent_identical_requests_share_one_generation() -> None:
+    cache = IRCache(max_entries=4, ttl_seconds=60)
+    key = ir_cache_key("stub", "stub-model", ProblemSpec(text="same spec"))
+    calls = []
+
+    def generate():
+        calls.append(1)
+        time.sleep(0.2)
+        return _stub_ir()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_generate(key, generate)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(hit for _, hit in results) == [False, True, True, True]
+    assert cache.get_or_generate(key, generate)[1] is True
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    cache = IRCache(max_entries=2, ttl_seconds=60)
+    ir = _stub_ir()
+    cache.put("a", ir)
+    cache.put("b", ir)
+    assert cache.get("a") is ir
+    cache.put("c", ir)
+    assert cache.get("b") is None
+    assert cache.get("a") is ir
+    expiring = IRCache(max_entries=2, ttl_seconds=0)
+    expiring.put("a", ir)
+    time.sleep(0.01)
+    assert expiring.get("a") is None
+
+
+def test_async_single_flight_shares_one_generation() -> None:
+    cache = IRCache(max_entries=4, ttl_seconds=60)
+    key = ir_cache_key("stub", "stub-model", ProblemSpec(text="async spec"))
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return _stub_ir()
+
+    async def run_all():
+        return await asyncio.gather(*[cache.get_or_generate_async(key, generate) for _ in range(5)])
+
+    results = asyncio.run(run_all())
+    assert len(calls) == 1
+    assert sorted(hit for _, hit in results) == [False, True, True, True, True]
+
+
+def test_async_followers_take_over_when_the_leader_is_cancelled() -> None:
+    cache = IRCache(max_entries=4, ttl_seconds=60)
+    key = ir_cache_key("stub", "stub-model", ProblemSpec(text="cancelled leader"))
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return _stub_ir()
+
+    async def run_all():
+        leader = asyncio.create_task(cache.get_or_generate_async(key, generate))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(cache.get_or_generate_async(key, generate)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results
+
+    leader, results = asyncio.run(run_all())
+    assert leader.cancelled()
+    assert len(calls) == 2
+    assert sorted(hit for _, hit in results) == [False, True, True]
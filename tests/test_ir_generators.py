@@ -0,0 +1,35 @@
+import pytest
+
+from bench_lifecycle import compare
+from ir_generators import GENERATORS, generate_ir
+from optiforge.core.presolve import solve_model
+from optiforge.core.validation import validate_ir_json
+
+
+@pytest.mark.parametrize("problem", sorted(GENERATORS))
+def test_generators_produce_valid_solvable_irs(problem: str) -> None:
+    ir = validate_ir_json(generate_ir(problem, 8))
+    result, _ = solve_model(ir, 5)
+    assert result.status in {"optimal", "feasible"}
+
+
+def test_generators_are_deterministic_per_seed() -> None:
+    assert generate_ir("knapsack", 30, seed=3) == generate_ir("knapsack", 30, seed=3)
+    assert generate_ir("knapsack", 30, seed=3) != generate_ir("knapsack", 30, seed=4)
+    with pytest.raises(ValueError):
+        generate_ir("unknown", 10)
+
+
+def test_compare_flags_only_significant_regressions() -> None:
+    baseline = [
+        {"benchmark": "solve", "problem": "knapsack", "size": 10, "seconds": 0.1},
+        {"benchmark": "store_get", "problem": "knapsack", "size": 10, "seconds": 0.001},
+    ]
+    results = [
+        {"benchmark": "solve", "problem": "knapsack", "size": 10, "seconds": 0.2},
+        {"benchmark": "store_get", "problem": "knapsack", "size": 10, "seconds": 0.003},
+        {"benchmark": "solve", "problem": "knapsack", "size": 50, "seconds": 1.0},
+    ]
+    rows = compare(results, baseline, tolerance=0.25, min_seconds=0.005)
+    assert [row["regression"] for row in rows] == [True, False]
+    assert rows[0]["ratio"] == 2.0
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from optiforge.core.ir_stream import IRStreamParser, parse_ir_chunks
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+def test_stream_matches_batch_validation_for_any_chunking() -> None:
+    data = _load_example_ir()
+    data["description"] = 'quoted "text" with \\ and {[ brackets ``` inline'
+    expected = validate_ir_json(data).model_dump()
+    text = f"```json\n{json.dumps(data, indent=2)}\n```\n"
+    for size in (1, 2, 3, 7, len(text)):
+        assert parse_ir_chunks(_chunks(text, size)).model_dump() == expected
+
+
+def test_references_before_variables_are_resolved_on_close() -> None:
+    data = _load_example_ir()
+    reordered = {key: data[key] for key in ("objective", "constraints", "name", "version")}
+    reordered["variables"] = data["variables"]
+    assert parse_ir_chunks([json.dumps(reordered)]).objective.sense == "minimize"
+    reordered["variables"] = data["variables"][:1]
+    with pytest.raises(ValueError, match="unknown variable: y"):
+        parse_ir_chunks([json.dumps(reordered)])
+
+
+def test_first_invalid_element_fails_before_stream_ends() -> None:
+    data = _load_example_ir()
+    parser = IRStreamParser()
+    variables = json.dumps(data["variables"])
+    parser.feed(f'{{"version": "1.0", "name": "n", "variables": {variables}, "constraints": [')
+    with pytest.raises(ValueError, match=r"constraints\[0\]: unknown variable: z"):
+        parser.feed('{"type": "linear", "terms": [{"var": "z", "coeff": 1}], ')
+        parser.feed('"operator": "<=", "rhs": 1}, ')
+    for text in ('{"version": "2.0"', '{"name": "n", "extra": 1', '{"name": "n",,'):
+        with pytest.raises(ValueError):
+            IRStreamParser().feed(text)
+    with pytest.raises(ValueError, match="ended before"):
+        parse_ir_chunks(['{"version": "1.0"'])
@@ -1,7 +1,10 @@
 import json
+import os
 from pathlib import Path
 
-from optiforge.core.validation import validate_ir_json
+import pytest
+
+from optiforge.core.validation import IRValidator, validate_ir_json
 
 
 def _load_example_ir() -> dict:
@@ -23,4 +26,40 @@ def test_invalid_ir_rejected() -> None:
     except ValueError as exc:
         assert "schema validation" in str(exc)
         return
-    raise AssertionError("invalid IR should raise")
\ No newline at end of file
+    raise AssertionError("invalid IR should raise")
+
+
+def test_fast_path_skips_schema_but_keeps_schema_rules(monkeypatch) -> None:
+    validator = IRValidator()
+
+    def fail(_: dict) -> None:
+        raise AssertionError("schema should not run for valid IR")
+
+    monkeypatch.setattr(validator, "_check_schema", fail)
+    assert validator.validate(_load_example_ir()).name == "simple_min_cost"
+    monkeypatch.undo()
+    for change in ({"version": "2.0"}, {"description": None}):
+        data = {**_load_example_ir(), **change}
+        with pytest.raises(ValueError, match="schema validation"):
+            validator.validate(data)
+    data = _load_example_ir()
+    del data["constraints"]
+    with pytest.raises(ValueError, match="schema validation"):
+        validator.validate(data)
+    data = _load_example_ir()
+    data["objective"]["terms"][0]["var"] = "missing"
+    with pytest.raises(ValueError, match="unknown variable: missing"):
+        validator.validate(data)
+
+
+def test_compiled_schema_reloads_when_file_changes(tmp_path: Path) -> None:
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+    validator = IRValidator(schema_path, fast_path=False)
+    compiled = validator.schema_validator()
+    assert validator.schema_validator() is compiled
+    schema_path.write_text(json.dumps({"type": "object", "required": ["x"]}), encoding="utf-8")
+    stat = schema_path.stat()
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    with pytest.raises(ValueError, match="schema validation"):
+        validator.validate(_load_example_ir())
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from optiforge.core import jobs
+from optiforge.core.config import Settings
+from optiforge.core.jobs import SolveJobQueue
+from optiforge.core.models import ProblemSpec
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _store(tmp_path: Path) -> RunStore:
+    return RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+
+
+def test_jobs_are_claimed_in_order_and_expired_leases_are_reclaimed(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    run_id = store.create_run(ProblemSpec(text="queue test"), "stub", "stub-model")
+    first = store.create_job(run_id)
+    second = store.create_job(run_id)
+    claimed = store.claim_next_job("worker-a", 0.0)
+    assert claimed is not None
+    assert claimed.id == first.id
+    assert claimed.status == "running"
+    other = _store(tmp_path)
+    reclaimed = other.claim_next_job("worker-b", 30.0)
+    assert reclaimed is not None
+    assert reclaimed.id == first.id
+    assert not store.holds_job_lease(first.id, "worker-a")
+    assert store.finish_job(first.id, "succeeded", owner="worker-a").status == "running"
+    assert other.get_job(second.id).status == "queued"
+
+
+def test_only_one_job_per_run_holds_a_lease(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    spec = ProblemSpec(text="queue test")
+    busy_run = store.create_run(spec, "stub", "stub-model")
+    idle_run = store.create_run(spec, "stub", "stub-model")
+    first = store.create_job(busy_run)
+    store.create_job(busy_run)
+    third = store.create_job(idle_run)
+    assert store.claim_next_job("worker-a", 30.0).id == first.id
+    assert store.claim_next_job("worker-b", 30.0).id == third.id
+    assert store.claim_next_job("worker-b", 30.0) is None
+    assert store.renew_job_leases("worker-a", [first.id, third.id], 30.0) == {first.id}
+    assert store.finish_job(first.id, "succeeded", owner="worker-a").status == "succeeded"
+    assert store.claim_next_job("worker-b", 30.0) is not None
+
+
+def test_cancelled_job_is_not_claimed(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    run_id = store.create_run(ProblemSpec(text="queue test"), "stub", "stub-model")
+    job = store.create_job(run_id)
+    assert store.cancel_job(job.id).status == "cancelled"
+    assert store.claim_next_job("worker-a", 30.0) is None
+    assert store.finish_job(job.id, "succeeded").status == "cancelled"
+
+
+def test_launch_errors_fail_the_job_and_record_the_run_error(
+    monkeypatch, tmp_path: Path
+) -> None:
+    store = _store(tmp_path)
+    run_id = store.create_runs(
+        [(ProblemSpec(text="launch"), validate_ir_json(_load_example_ir()), None)],
+        "stub",
+        "stub-model",
+    )[0]
+    job = store.create_job(run_id)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("warm start exploded")
+
+    monkeypatch.setattr(jobs, "resolve_warm_start", broken)
+    queue = SolveJobQueue(Settings(solution_cache_enabled=False), store)
+    queue._executor = object()
+    queue._fill_slots()
+    assert store.get_job(job.id).status == "failed"
+    assert store.get_job(job.id).error == "warm start exploded"
+    assert store.get_run(run_id).error == "warm start exploded"
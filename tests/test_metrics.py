@@ -0,0 +1,49 @@
+from optiforge.core.metrics import MetricsRegistry, Profile
+from optiforge.core.models import OptimizationModelIR
+from optiforge.core.presolve import solve_model
+
+
+def test_registry_renders_prometheus_histograms_and_counters() -> None:
+    registry = MetricsRegistry()
+    profile = Profile()
+    profile.add("provider", 0.2)
+    profile.add("validation", 0.003)
+    registry.observe_profile("generate", profile, "success")
+    registry.observe_profile("generate", profile, "success")
+    text = registry.render()
+    assert "# TYPE optiforge_stage_duration_seconds histogram" in text
+    assert 'optiforge_operations_total{operation="generate",outcome="success"} 2' in text
+    bucket = "optiforge_stage_duration_seconds_bucket"
+    assert f'{bucket}{{operation="generate",stage="provider",le="0.25"}} 2' in text
+    assert f'{bucket}{{operation="generate",stage="provider",le="0.1"}} 0' in text
+    assert f'{bucket}{{operation="generate",stage="validation",le="+Inf"}} 2' in text
+    assert 'optiforge_stage_duration_seconds_sum{operation="generate",stage="provider"} 0.4' in text
+
+
+def test_solve_profile_records_stages_and_solver_stats() -> None:
+    ir = OptimizationModelIR.model_validate(
+        {
+            "version": "1.0",
+            "name": "profile",
+            "variables": [
+                {"name": "x", "type": "int", "lower_bound": 0, "upper_bound": 10},
+                {"name": "y", "type": "int", "lower_bound": 0, "upper_bound": 10},
+            ],
+            "constraints": [
+                {
+                    "type": "linear",
+                    "terms": [{"var": "x", "coeff": 1}, {"var": "y", "coeff": 1}],
+                    "operator": ">=",
+                    "rhs": 5,
+                }
+            ],
+            "objective": {"sense": "minimize", "terms": [{"var": "x", "coeff": 3}]},
+        }
+    )
+    profile = Profile()
+    result, _ = solve_model(ir, 5, profile=profile)
+    assert result.status == "optimal"
+    assert {"presolve", "model_build", "solve", "postsolve"} <= set(profile.stages)
+    assert profile.solver["status"] == "optimal"
+    assert profile.solver["gap"] == 0
+    assert profile.solver["branches"] >= 0
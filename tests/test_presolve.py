@@ -0,0 +1,84 @@
+import random
+
+from optiforge.core.columnar import ir_to_columnar
+from optiforge.core.presolve import presolve_ir, solve_model
+from optiforge.core.solver import solve_ir
+from optiforge.core.validation import validate_ir_json
+
+
+def _ir(constraints: list[dict], sense: str = "minimize", objective=None) -> dict:
+    return {
+        "version": "1.0",
+        "name": "presolve",
+        "variables": [
+            {"name": name, "type": "int", "lower_bound": 0, "upper_bound": 10}
+            for name in ("x", "y", "z", "unused")
+        ],
+        "constraints": constraints,
+        "objective": {
+            "sense": sense,
+            "terms": objective or [{"var": "x", "coeff": 3}, {"var": "y", "coeff": 2}],
+            "constant": 1,
+        },
+    }
+
+
+def _row(terms: dict[str, int], operator: str, rhs: int) -> dict:
+    return {
+        "type": "linear",
+        "terms": [{"var": var, "coeff": coeff} for var, coeff in terms.items()],
+        "operator": operator,
+        "rhs": rhs,
+    }
+
+
+def test_presolve_reduces_redundant_rows_and_maps_solution_back() -> None:
+    data = _ir(
+        [
+            _row({"x": 1, "y": 1}, ">=", 5),
+            _row({"x": 1, "y": 1}, ">=", 6),
+            _row({"z": 2}, "=", 8),
+            _row({"x": 1, "y": 1, "z": 0}, "<=", 40),
+        ]
+    )
+    data["constraints"][0]["terms"].append({"var": "y", "coeff": 0})
+    ir = validate_ir_json(data)
+    reduction = presolve_ir(ir_to_columnar(ir))
+    assert reduction.stats["merged_terms"] == 1
+    assert reduction.stats["dropped_zero_terms"] == 1
+    assert reduction.stats["duplicate_rows"] == 1
+    assert reduction.stats["singleton_rows"] == 1
+    assert reduction.stats["redundant_rows"] == 1
+    assert reduction.stats["rows_after"] == 1
+    assert reduction.fixed_values == {"z": 4, "unused": 0}
+    result, stats = solve_model(ir, max_seconds=5)
+    assert stats["variables_after"] == 2
+    assert result.variables == {"x": 0, "y": 6, "z": 4, "unused": 0}
+    assert result.objective_value == solve_ir(ir, max_seconds=5).objective_value == 13
+
+
+def test_presolve_detects_infeasibility_without_solving() -> None:
+    ir = validate_ir_json(_ir([_row({"x": 1}, ">=", 4), _row({"x": 2}, "<=", 5)]))
+    result, stats = solve_model(ir, max_seconds=5)
+    assert result.status == "infeasible"
+    assert stats["infeasible"] is True
+    assert "empty domain" in stats["reason"]
+    ir = validate_ir_json(_ir([_row({"x": 1, "y": 1}, "=", 3), _row({"y": 1, "x": 1}, "=", 4)]))
+    assert solve_model(ir, max_seconds=5)[1]["reason"].endswith("are contradictory")
+
+
+def test_presolve_matches_direct_solve_on_random_models() -> None:
+    rng = random.Random(11)
+    names = ["x", "y", "z", "unused"]
+    for _ in range(25):
+        rows = []
+        for _ in range(rng.randint(1, 5)):
+            terms = {name: rng.randint(-3, 3) for name in rng.sample(names, rng.randint(1, 3))}
+            rows.append(_row(terms, rng.choice(["<=", ">=", "="]), rng.randint(-5, 15)))
+        objective = [{"var": name, "coeff": rng.randint(-4, 4)} for name in names]
+        sense = rng.choice(["minimize", "maximize"])
+        ir = validate_ir_json(_ir(rows, sense, objective))
+        direct = solve_ir(ir, max_seconds=5)
+        presolved, _ = solve_model(ir, max_seconds=5)
+        assert presolved.status == direct.status
+        assert presolved.objective_value == direct.objective_value
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from optiforge.core.config import Settings
+from optiforge.core.models import OptimizationModelIR, ProblemSpec
+from optiforge.core.provider import (
+    AsyncOpenAIChatProvider,
+    OpenAIChatProvider,
+    ProviderRegistry,
+    StubProvider,
+)
+from optiforge.core.validation import validate_ir_json
+
+
+def _completion(content: str) -> dict:
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def test_openai_provider_retries_rate_limits_and_server_errors() -> None:
+    statuses = [429, 503]
+    ir_json = '{"version": "1.0"}'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, json=_completion(f"```json\n{ir_json}\n```"))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    provider = OpenAIChatProvider(
+        "https://example.test", "key", "model", client=client, max_retries=2, retry_backoff_seconds=0
+    )
+    assert provider.generate_ir(ProblemSpec(text="retry")) == {"version": "1.0"}
+    assert statuses == []
+
+
+def test_openai_provider_gives_up_after_max_retries() -> None:
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    provider = OpenAIChatProvider(
+        "https://example.test", "key", "model", client=client, max_retries=1, retry_backoff_seconds=0
+    )
+    try:
+        provider.generate_ir(ProblemSpec(text="retry"))
+    except ValueError as exc:
+        assert "provider error: 500" in str(exc)
+        return
+    raise AssertionError("persistent 5xx should raise")
+
+
+def test_openai_provider_caps_retry_after_at_max_backoff(monkeypatch) -> None:
+    statuses = [429]
+    sleeps = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers={"Retry-After": "86400"})
+        return httpx.Response(200, json=_completion('{"version": "1.0"}'))
+
+    monkeypatch.setattr("optiforge.core.provider.time.sleep", sleeps.append)
+    provider = OpenAIChatProvider(
+        "https://example.test",
+        "key",
+        "model",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        max_retries=1,
+        retry_backoff_seconds=0.5,
+        retry_max_backoff_seconds=2.0,
+    )
+    assert provider.generate_ir(ProblemSpec(text="retry")) == {"version": "1.0"}
+    assert sleeps == [2.0]
+
+
+def test_registry_reuses_one_provider_per_process() -> None:
+    registry = ProviderRegistry(Settings(provider="stub"))
+    provider = registry.get()
+    assert isinstance(provider, StubProvider)
+    assert registry.get() is provider
+    registry.close()
+
+
+def test_async_openai_provider_retries_and_parses() -> None:
+    statuses = [502]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, json=_completion('{"version": "1.0"}'))
+
+    async def generate() -> dict:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = AsyncOpenAIChatProvider(
+                "https://example.test",
+                "key",
+                "model",
+                client=client,
+                max_retries=1,
+                retry_backoff_seconds=0,
+            )
+            return await provider.generate_ir(ProblemSpec(text="async"))
+
+    assert asyncio.run(generate()) == {"version": "1.0"}
+
+
+def _sse(contents: list[str]) -> list[bytes]:
+    lines = [
+        f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n"
+        for content in contents
+    ]
+    return [line.encode() for line in lines + ["data: [DONE]\n\n"]]
+
+
+def _example_ir_text() -> str:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return path.read_text(encoding="utf-8")
+
+
+def test_openai_provider_streams_and_parses_ir() -> None:
+    text = f"```json\n{_example_ir_text()}\n```"
+    chunks = [text[start : start + 5] for start in range(0, len(text), 5)]
+    payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, content=iter(_sse(chunks)))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    provider = OpenAIChatProvider(
+        "https://example.test", "key", "model", client=client, stream=True
+    )
+    ir = provider.generate_ir(ProblemSpec(text="stream"))
+    assert isinstance(ir, OptimizationModelIR)
+    assert ir.model_dump() == validate_ir_json(json.loads(_example_ir_text())).model_dump()
+    assert payloads[0]["stream"] is True
+
+
+def test_streaming_stops_reading_at_first_invalid_element() -> None:
+    pieces = ['{"version": "1.0", "name": "bad", "variables": [']
+    pieces.append('{"name": "x", "type": "int", "lower_bound": 5, "upper_bound": 1}')
+    pieces.extend([', {"name": "y", "type": "int", "lower_bound": 0, "upper_bound": 1}'] * 50)
+    sent = []
+
+    def body():
+        for line in _sse(pieces):
+            sent.append(line)
+            yield line
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+    client = httpx.Client(transport=transport)
+    provider = OpenAIChatProvider(
+        "https://example.test", "key", "model", client=client, stream=True
+    )
+    with pytest.raises(ValueError, match=r"variables\[0\]"):
+        provider.generate_ir(ProblemSpec(text="stream"))
+    assert len(sent) < 5
+
+
+def test_async_openai_provider_streams_with_retry() -> None:
+    statuses = [503]
+
+    async def body():
+        for line in _sse([_example_ir_text()]):
+            yield line
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop(0))
+        return httpx.Response(200, content=body())
+
+    async def generate() -> OptimizationModelIR:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = AsyncOpenAIChatProvider(
+                "https://example.test",
+                "key",
+                "model",
+                client=client,
+                max_retries=1,
+                retry_backoff_seconds=0,
+                stream=True,
+            )
+            return await provider.generate_ir(ProblemSpec(text="async"))
+
+    assert asyncio.run(generate()).name == "simple_min_cost"
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from optiforge.core.cache import SolutionCache, solve_cache_key
+from optiforge.core.config import Settings
+from optiforge.core.models import ProblemSpec
+from optiforge.core.service import solve_run
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_cache_key_ignores_ordering_duplicates_and_zero_terms() -> None:
+    data = _load_example_ir()
+    reordered = _load_example_ir()
+    reordered["name"] = "renamed"
+    reordered["variables"].reverse()
+    reordered["constraints"][0]["terms"] = [
+        {"var": "y", "coeff": 1},
+        {"var": "x", "coeff": 0},
+        {"var": "x", "coeff": 1},
+    ]
+    params = {"max_seconds": 5}
+    base_key = solve_cache_key(validate_ir_json(data), params)
+    assert solve_cache_key(validate_ir_json(reordered), params) == base_key
+    assert solve_cache_key(validate_ir_json(data), {"max_seconds": 6}) != base_key
+
+
+def test_solve_run_reuses_cached_optimal_result(tmp_path: Path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'optiforge.db'}"
+    settings = Settings(database_url=database_url)
+    store = RunStore(database_url)
+    cache = SolutionCache(database_url, max_entries=10, max_age_seconds=60)
+    ir = validate_ir_json(_load_example_ir())
+    run_ids = []
+    for _ in range(2):
+        run_id = store.create_run(ProblemSpec(text="cache test"), "stub", "stub-model")
+        store.update_run_ir(run_id, ir, "stub", "stub-model")
+        run_ids.append(run_id)
+    first = solve_run(run_ids[0], settings, store, cache)
+    second = solve_run(run_ids[1], settings, store, cache)
+    assert first.audit.events[-1].details["cache_hit"] is False
+    assert second.audit.events[-1].details["cache_hit"] is True
+    assert second.solution == first.solution
@@ -16,4 +16,23 @@ def test_ir_to_solver_solution() -> None:
     assert result.status in {"optimal", "feasible"}
     assert result.variables["x"] == 0
     assert result.variables["y"] == 5
-    assert result.objective_value == 10
\ No newline at end of file
+    assert result.objective_value == 10
+
+
+def test_maximize_with_duplicate_terms_and_equality() -> None:
+    data = _load_example_ir()
+    data["objective"]["sense"] = "maximize"
+    data["objective"]["constant"] = 5
+    data["constraints"] = [
+        {
+            "type": "linear",
+            "terms": [{"var": "x", "coeff": 1}, {"var": "x", "coeff": 1}, {"var": "y", "coeff": 1}],
+            "operator": "=",
+            "rhs": 12,
+        },
+        {"type": "linear", "terms": [{"var": "y", "coeff": 1}], "operator": "<=", "rhs": 4},
+    ]
+    result = solve_ir(validate_ir_json(data), max_seconds=5)
+    assert result.status == "optimal"
+    assert result.variables == {"x": 4, "y": 4}
+    assert result.objective_value == 25
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from optiforge.core.config import Settings
+from optiforge.core.models import ProblemSpec, SolverOptions
+from optiforge.core.service import effective_solver_options, solver_params
+from optiforge.core.solver import solve_ir
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _example_ir():
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return validate_ir_json(json.loads(path.read_text(encoding="utf-8")))
+
+
+def test_effective_options_are_capped_by_settings() -> None:
+    settings = Settings(solver_max_seconds=10, solver_max_search_workers=4)
+    defaults = effective_solver_options(None, settings)
+    assert defaults.max_seconds == 10
+    assert defaults.num_search_workers == 4
+    requested = SolverOptions(max_seconds=60, num_search_workers=32, random_seed=3)
+    capped = effective_solver_options(requested, settings)
+    assert capped.max_seconds == 10
+    assert capped.num_search_workers == 4
+    assert solver_params(capped) == {"max_seconds": 10, "num_search_workers": 4, "random_seed": 3}
+
+
+def test_options_reject_unknown_and_out_of_range_values() -> None:
+    with pytest.raises(ValidationError):
+        SolverOptions(num_workers=2)
+    with pytest.raises(ValidationError):
+        SolverOptions(linearization_level=5)
+
+
+def test_solve_with_options_and_store_round_trip(tmp_path: Path) -> None:
+    options = SolverOptions(num_search_workers=1, random_seed=7, relative_gap_limit=0.0)
+    result = solve_ir(_example_ir(), max_seconds=5, options=options)
+    assert result.status == "optimal"
+    assert result.objective_value == 10
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="options"), "stub", "stub-model")
+    assert store.get_run(run_id).solver_options is None
+    job = store.create_job(run_id, options=options)
+    assert store.get_job(job.id).solver_options == options
+    assert store.create_job(run_id).solver_options is None
+    assert store.get_run(run_id).solver_options is None
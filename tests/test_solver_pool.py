@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+
+from optiforge.core.solver_pool import SolverPool, SolverWorkerError
+
+
+class _TwoArgumentError(Exception):
+    def __init__(self, first: int, second: int) -> None:
+        super().__init__(f"{first}:{second}")
+
+
+def _raise_unpicklable() -> None:
+    raise _TwoArgumentError(1, 2)
+
+
+def test_pool_returns_results_and_worker_exceptions() -> None:
+    pool = SolverPool(1)
+    try:
+        assert pool.submit(sum, [1, 2, 3]).result(timeout=30) == 6
+        with pytest.raises(ValueError):
+            pool.submit(int, "not a number").result(timeout=30)
+    finally:
+        pool.shutdown()
+
+
+def test_unreadable_results_fail_the_task_and_the_pool_recovers() -> None:
+    pool = SolverPool(1)
+    try:
+        with pytest.raises(SolverWorkerError, match="could not read"):
+            pool.submit(_raise_unpicklable).result(timeout=30)
+        assert pool.submit(sum, [1]).result(timeout=30) == 1
+    finally:
+        pool.shutdown()
+
+
+def test_hard_time_limit_kills_the_worker_and_the_pool_recovers() -> None:
+    pool = SolverPool(1)
+    try:
+        first_pid = pool.submit(os.getpid).result(timeout=30)
+        with pytest.raises(SolverWorkerError, match="hard time limit"):
+            pool.submit(time.sleep, 30, timeout=0.5).result(timeout=30)
+        assert pool.submit(os.getpid).result(timeout=30) != first_pid
+    finally:
+        pool.shutdown()
+
+
+def test_workers_are_recycled_after_max_tasks() -> None:
+    pool = SolverPool(1, max_tasks_per_worker=2)
+    try:
+        pids = [pool.submit(os.getpid).result(timeout=30) for _ in range(3)]
+    finally:
+        pool.shutdown()
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[0]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="rlimits are not available on Windows")
+def test_memory_limit_is_enforced_in_the_worker() -> None:
+    pool = SolverPool(1, memory_limit_mb=1024)
+    try:
+        with pytest.raises(MemoryError):
+            pool.submit(bytearray, 2 * 1024**3).result(timeout=30)
+        assert pool.submit(sum, [1]).result(timeout=30) == 1
+    finally:
+        pool.shutdown()
+
+
+def test_terminate_kills_a_running_solve() -> None:
+    pool = SolverPool(1)
+    try:
+        future = pool.submit(time.sleep, 30)
+        deadline = time.monotonic() + 30
+        while not future.running() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.terminate(future)
+        with pytest.raises(SolverWorkerError, match="terminated"):
+            future.result(timeout=30)
+    finally:
+        pool.shutdown()
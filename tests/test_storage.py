@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from optiforge.core.config import Settings
+from optiforge.core.incumbents import IncumbentRecorder
+from optiforge.core.models import Incumbent, ProblemSpec, SolveResult, SweepRequest
+from optiforge.core.provider import StubProvider
+from optiforge.core.service import generate_ir
+from optiforge.core.storage import RunConflictError, RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_store_uses_wal_journal(tmp_path: Path) -> None:
+    db_path = tmp_path / "optiforge.db"
+    RunStore(f"sqlite:///{db_path}")
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_updates_keep_unchanged_columns_and_serialize_audit_writes(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="storage test"), "stub", "stub-model")
+    ir = validate_ir_json(_load_example_ir())
+    updated = store.update_run_ir(run_id, ir, "stub", "stub-model")
+    assert updated.ir == ir
+    threads = [
+        threading.Thread(target=store.update_run_error, args=(run_id, f"error {index}"))
+        for index in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    run = store.get_run(run_id)
+    assert run.ir == ir
+    assert run.provider_name == "stub"
+    assert len(run.audit.events) == 10
+    store.close()
+
+
+def test_legacy_audit_json_events_are_migrated(tmp_path: Path) -> None:
+    db_path = tmp_path / "optiforge.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE runs (
+            id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL, problem_spec_json TEXT NOT NULL, ir_json TEXT,
+            solution_json TEXT, audit_json TEXT NOT NULL, error TEXT, provider_name TEXT,
+            provider_model TEXT
+        )
+        """
+    )
+    audit = {
+        "metadata": {"provider_name": "stub"},
+        "events": [
+            {"at": "2026-01-01T00:00:00+00:00", "action": "created", "details": {}},
+            {"at": "2026-01-01T00:00:01+00:00", "action": "error", "details": {"message": "x"}},
+        ],
+    }
+    conn.execute(
+        "INSERT INTO runs VALUES (?, 'error', ?, ?, ?, NULL, NULL, ?, 'x', 'stub', 'stub-model')",
+        (
+            "legacy",
+            audit["events"][0]["at"],
+            audit["events"][1]["at"],
+            json.dumps({"text": "legacy", "tables": []}),
+            json.dumps(audit),
+        ),
+    )
+    conn.commit()
+    conn.close()
+    store = RunStore(f"sqlite:///{db_path}")
+    run = store.get_run("legacy")
+    assert [event.action for event in run.audit.events] == ["created", "error"]
+    assert run.audit.metadata == {"provider_name": "stub"}
+    store.update_run_error("legacy", "again")
+    assert [event.action for event in store.get_run("legacy").audit.events][-1] == "error"
+    assert len(store.get_run("legacy").audit.events) == 3
+    store.close()
+
+
+def test_incumbents_are_throttled_and_scoped_to_job(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="incumbents"), "stub", "stub-model")
+    job = store.create_job(run_id)
+    assert store.latest_job(run_id).id == job.id
+    recorder = IncumbentRecorder(store, run_id, job.id, persist_seconds=3600)
+    recorder.start()
+    for value in (3, 5, 8):
+        incumbent = Incumbent(objective_value=value, best_bound=10.0, wall_time_seconds=0.1)
+        recorder(incumbent, lambda value=value: {"x": value})
+    assert [item.objective_value for _, item in store.list_incumbents(run_id, job.id)] == [3]
+    recorder.flush()
+    listed = store.list_incumbents(run_id, job.id)
+    assert [item.objective_value for _, item in listed] == [3, 5, 8]
+    assert store.list_incumbents(run_id, job.id, after_id=listed[1][0])[0][1].objective_value == 8
+    assert store.list_incumbents(run_id, None) == []
+    assert store.get_run(run_id).incumbent.variables == {"x": 8}
+    recorder.start()
+    assert store.list_incumbents(run_id, job.id) == []
+    assert store.get_run(run_id).incumbent is None
+
+
+def test_run_updates_compare_and_swap_on_version(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="version test"), "stub", "stub-model")
+    assert store.get_run(run_id).version == 0
+    result = SolveResult(status="optimal", objective_value=1, variables={"x": 1})
+    updated = store.update_run_solution(run_id, result, "solved", expected_version=0)
+    assert updated.version == 1
+    with pytest.raises(RunConflictError):
+        store.update_run_error(run_id, "stale writer", expected_version=0)
+    assert store.get_run(run_id, ["status", "version"]).status == "solved"
+    assert store.update_run_error(run_id, "unconditional").version == 2
+
+
+def test_generate_does_not_overwrite_a_concurrent_update(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="race"), "stub", "stub-model")
+
+    class RacingProvider:
+        def get(self) -> "RacingProvider":
+            return self
+
+        def generate_ir(self, spec: ProblemSpec) -> dict:
+            store.update_run_error(run_id, "written by another worker")
+            return StubProvider().generate_ir(spec)
+
+    with pytest.raises(RunConflictError):
+        generate_ir(run_id, Settings(), store, providers=RacingProvider())
+    run = store.get_run(run_id)
+    assert run.error == "written by another worker"
+    assert run.ir is None
+
+
+def test_pending_sweeps_are_claimed_by_one_owner(tmp_path: Path) -> None:
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    run_id = store.create_run(ProblemSpec(text="sweep lease"), "stub", "stub-model")
+    request = SweepRequest.model_validate(
+        {"parameters": [{"kind": "rhs", "target": 0, "values": [1, 2]}]}
+    )
+    owned = store.create_sweep(run_id, request, 2, "worker-a", 30.0)
+    orphan = store.create_sweep(run_id, request, 2)
+    assert store.claim_pending_sweeps("worker-b", 30.0) == [orphan.id]
+    assert store.claim_pending_sweeps("worker-c", 30.0) == []
+    assert store.renew_sweep_leases("worker-a", [owned.id, orphan.id], 30.0) == {owned.id}
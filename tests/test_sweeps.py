@@ -0,0 +1,176 @@
+import json
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from ir_generators import generate_ir
+from optiforge.core.columnar import encode_columnar, ir_to_columnar
+from optiforge.core.config import Settings
+from optiforge.core.models import ProblemSpec, SweepParameter, SweepRequest
+from optiforge.core.solver import solve_ir
+from optiforge.core.storage import RunStore
+from optiforge.core.sweeps import SweepRunner, _solve_sweep_chunk, scenario_values
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _parameters() -> list[dict]:
+    return [
+        {"kind": "rhs", "target": 0, "values": [4, 7, 30]},
+        {"kind": "upper_bound", "target": "y", "values": [2, 10]},
+        {"kind": "objective_coeff", "target": "x", "values": [1, 5]},
+    ]
+
+
+def test_scenario_values_enumerate_the_grid_in_order() -> None:
+    parameters = [SweepParameter.model_validate(item) for item in _parameters()]
+    assert scenario_values(parameters, 0) == [4, 2, 1]
+    assert scenario_values(parameters, 1) == [4, 2, 5]
+    assert scenario_values(parameters, 2) == [4, 10, 1]
+    assert scenario_values(parameters, 11) == [30, 10, 5]
+
+
+def test_sweep_chunk_matches_rebuilt_models() -> None:
+    base = _load_example_ir()
+    ir = validate_ir_json(base)
+    rows = _solve_sweep_chunk(
+        encode_columnar(ir_to_columnar(ir)),
+        _parameters(),
+        list(range(12)),
+        5,
+        {"num_search_workers": 1},
+    )
+    parameters = [SweepParameter.model_validate(item) for item in _parameters()]
+    for row in rows:
+        rhs, upper, coeff = scenario_values(parameters, row["index"])
+        data = json.loads(json.dumps(base))
+        data["constraints"][0]["rhs"] = rhs
+        data["variables"][1]["upper_bound"] = upper
+        data["objective"]["terms"][0]["coeff"] = coeff
+        expected = solve_ir(validate_ir_json(data), max_seconds=5)
+        assert row["status"] == expected.status
+        assert row["objective_value"] == expected.objective_value
+
+
+def test_sweep_api_stores_scenarios_under_parent_run(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("OPTIFORGE_DATABASE_URL", f"sqlite:///{tmp_path / 'optiforge.db'}")
+    monkeypatch.setenv("OPTIFORGE_PROVIDER", "stub")
+    monkeypatch.setenv("OPTIFORGE_SWEEP_CHUNK_SIZE", "4")
+    from optiforge.core.config import get_settings
+
+    get_settings.cache_clear()
+    from optiforge.api import main
+
+    main.get_store.cache_clear()
+    main.get_table_store.cache_clear()
+    main.get_solution_cache.cache_clear()
+    main.get_metrics.cache_clear()
+    main.get_job_queue.cache_clear()
+    main.get_sweep_runner.cache_clear()
+    main.get_solver_pool.cache_clear()
+    with TestClient(main.app) as client:
+        assert main.get_sweep_runner()._executor is main.get_job_queue()._executor
+        run_id = client.post("/api/runs", json={"text": "sweep", "tables": []}).json()["id"]
+        bad = {"parameters": [{"kind": "rhs", "target": 0, "values": [1]}]}
+        assert client.post(f"/api/runs/{run_id}/sweeps", json=bad).status_code == 400
+        client.post(f"/api/runs/{run_id}/generate")
+        bad["parameters"][0]["target"] = 9
+        assert client.post(f"/api/runs/{run_id}/sweeps", json=bad).status_code == 400
+        response = client.post(
+            f"/api/runs/{run_id}/sweeps", json={"parameters": _parameters()[:2]}
+        )
+        assert response.status_code == 202
+        sweep = response.json()
+        assert sweep["scenario_count"] == 6
+        deadline = time.monotonic() + 60
+        while sweep["status"] in {"queued", "running"} and time.monotonic() < deadline:
+            time.sleep(0.1)
+            sweep = client.get(f"/api/sweeps/{sweep['id']}").json()
+        assert sweep["status"] == "succeeded"
+        assert sweep["completed"] == 6
+        page = client.get(
+            f"/api/sweeps/{sweep['id']}/scenarios",
+            params={"limit": 4, "include_variables": True},
+        ).json()
+        assert [item["index"] for item in page["items"]] == [0, 1, 2, 3]
+        assert page["next_offset"] == 4
+        assert page["items"][0]["values"] == [4, 2]
+        assert set(page["items"][0]["variables"]) == {"x", "y"}
+
+
+def test_sweep_stops_when_its_lease_is_lost(tmp_path: Path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'optiforge.db'}"
+    settings = Settings(
+        database_url=database_url, solver_workers=1, solver_max_seconds=1, sweep_chunk_size=1
+    )
+    store = RunStore(database_url)
+    ir = validate_ir_json(generate_ir("set_cover", 200, 7))
+    run_id = store.create_runs([(ProblemSpec(text="lease"), ir, None)], "stub", "stub-model")[0]
+    runner = SweepRunner(settings, store)
+    target = ir.variables[0].name
+    request = SweepRequest.model_validate(
+        {
+            "parameters": [
+                {"kind": "objective_coeff", "target": target, "values": list(range(1, 9))}
+            ],
+            "options": {"num_search_workers": 1},
+        }
+    )
+    sweep = runner.submit(run_id, request)
+    deadline = time.monotonic() + 30
+    while store.get_sweep(sweep.id).status != "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    with runner._lock:
+        thread = runner._threads[sweep.id]
+    store._db.connection().execute(
+        "UPDATE sweeps SET lease_owner = 'other' WHERE id = ?", (sweep.id,)
+    )
+    runner._renew_leases()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    sweep = store.get_sweep(sweep.id)
+    assert sweep.status == "running"
+    assert sweep.completed < 8
+    runner.shutdown()
+    store.close()
+
+
+def test_sweep_terminates_remaining_chunks_when_one_fails(monkeypatch, tmp_path: Path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'optiforge.db'}"
+    settings = Settings(
+        database_url=database_url, solver_workers=1, solver_max_seconds=1, sweep_chunk_size=1
+    )
+    store = RunStore(database_url)
+    ir = validate_ir_json(generate_ir("set_cover", 200, 7))
+    run_id = store.create_runs([(ProblemSpec(text="fail"), ir, None)], "stub", "stub-model")[0]
+    runner = SweepRunner(settings, store)
+    futures = []
+
+    def broken(sweep_id, scenarios):
+        futures.extend(runner._futures[sweep_id])
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(store, "record_sweep_scenarios", broken)
+    target = ir.variables[0].name
+    request = SweepRequest.model_validate(
+        {
+            "parameters": [
+                {"kind": "objective_coeff", "target": target, "values": list(range(1, 9))}
+            ],
+            "options": {"num_search_workers": 1},
+        }
+    )
+    sweep = runner.submit(run_id, request)
+    deadline = time.monotonic() + 30
+    while store.get_sweep(sweep.id).status != "failed" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert store.get_sweep(sweep.id).error == "disk full"
+    assert len(futures) == 8
+    assert sum(future.cancelled() for future in futures) >= 6
+    runner.shutdown()
+    store.close()
@@ -0,0 +1,161 @@
+import io
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from optiforge.core.config import Settings
+from optiforge.core.models import ProblemSpec, TableRef
+from optiforge.core.provider import StubProvider
+from optiforge.core.service import create_run, generate_ir
+from optiforge.core.storage import RunStore
+from optiforge.core.tables import TableStore
+
+CSV = "item,weight,value,label\n" + "".join(
+    f"{index},{index * 2},{index * 0.5},item-{index}\n" for index in range(25)
+)
+
+
+def _store(tmp_path: Path, **kwargs) -> TableStore:
+    return TableStore(f"sqlite:///{tmp_path / 'optiforge.db'}", **kwargs)
+
+
+def test_csv_ingest_infers_types_and_deduplicates(tmp_path: Path) -> None:
+    store = _store(tmp_path, chunk_rows=10, sample_rows=3)
+    summary = store.ingest_csv(io.BytesIO(CSV.encode("utf-8")))
+    assert summary.row_count == 25
+    assert [(column.name, column.type) for column in summary.columns] == [
+        ("item", "int"),
+        ("weight", "int"),
+        ("value", "float"),
+        ("label", "str"),
+    ]
+    assert (summary.columns[1].min, summary.columns[1].max) == (0, 48)
+    assert summary.columns[3].min is None
+    assert summary.sample == [[0, 0, 0.0, "item-0"], [1, 2, 0.5, "item-1"], [2, 4, 1.0, "item-2"]]
+    again = store.ingest_csv(io.BytesIO(("\ufeff" + CSV.replace("\n", "\r\n")).encode("utf-8")))
+    assert again == summary
+    columns, rows = store.read_rows(summary.hash, 8, 5)
+    assert columns == ["item", "weight", "value", "label"]
+    assert [row[0] for row in rows] == [8, 9, 10, 11, 12]
+    assert store.read_rows(summary.hash, 24, 10)[1] == [[24, 48, 12.0, "item-24"]]
+    assert store.missing([summary.hash, "0" * 64]) == ["0" * 64]
+    with pytest.raises(KeyError):
+        store.get_summary("0" * 64)
+    store.close()
+
+
+def test_csv_values_that_do_not_round_trip_stay_text(tmp_path: Path) -> None:
+    store = _store(tmp_path, chunk_rows=2)
+    body = (
+        "code,qty,ratio,mixed,wide\n"
+        "01234,1_000,nan,1,9007199254740993\n"
+        "007,5,inf,2,0.5\n"
+        "42,6,Infinity,x,1\n"
+    )
+    summary = store.ingest_csv(io.BytesIO(body.encode("utf-8")))
+    assert [column.type for column in summary.columns] == ["str"] * 5
+    rows = store.read_rows(summary.hash, 0, 10)[1]
+    assert rows[0] == ["01234", "1_000", "nan", "1", "9007199254740993"]
+    assert [row[3] for row in rows] == ["1", "2", "x"]
+    summary = store.ingest_csv(io.BytesIO(b"n,f\n1,2\n3,4\n5,6.5\n"))
+    assert [column.type for column in summary.columns] == ["int", "float"]
+    assert store.read_rows(summary.hash, 0, 10)[1] == [[1, 2.0], [3, 4.0], [5, 6.5]]
+    store.close()
+
+
+def test_empty_cells_are_nulls_and_hashes_ignore_chunk_size(tmp_path: Path) -> None:
+    store = _store(tmp_path, chunk_rows=2)
+    body = "n,f,s,blank\n1,0.5,a,\n,,,\n3,,c,\n"
+    summary = store.ingest_csv(io.BytesIO(body.encode("utf-8")))
+    assert [column.type for column in summary.columns] == ["int", "float", "str", "str"]
+    assert (summary.columns[0].min, summary.columns[0].max) == (1, 3)
+    assert summary.sample[1] == [None, None, "", ""]
+    rows = store.read_rows(summary.hash, 0, 10)[1]
+    assert rows == [[1, 0.5, "a", ""], [None, None, "", ""], [3, None, "c", ""]]
+    expected = store.ingest_csv(io.BytesIO(CSV.encode("utf-8"))).hash
+    for chunk_rows in (1, 10):
+        other = _store(tmp_path, chunk_rows=chunk_rows)
+        assert other.ingest_csv(io.BytesIO(CSV.encode("utf-8"))).hash == expected
+        other.close()
+    store.close()
+
+
+def test_csv_ingest_rejects_ragged_rows_and_discards_chunks(tmp_path: Path) -> None:
+    store = _store(tmp_path, chunk_rows=2)
+    with pytest.raises(ValueError, match="line 5"):
+        store.ingest_csv(io.BytesIO(b"a,b\n1,2\n3,4\n5,6\n7\n"))
+    with pytest.raises(ValueError, match="unique"):
+        store.ingest_csv(io.BytesIO(b"a,a\n1,2\n"))
+    conn = store._db.connection()
+    assert conn.execute("SELECT COUNT(*) FROM data_table_chunks").fetchone()[0] == 0
+    store.close()
+
+
+def test_runs_reference_tables_and_send_summaries_to_provider(tmp_path: Path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'optiforge.db'}"
+    settings = Settings(database_url=database_url)
+    runs = RunStore(database_url)
+    tables = TableStore(database_url, sample_rows=2)
+    summary = tables.ingest_csv(io.BytesIO(CSV.encode("utf-8")))
+    unknown = ProblemSpec(text="pack", table_refs=[TableRef(name="items", hash="f" * 64)])
+    with pytest.raises(ValueError, match="unknown tables"):
+        create_run(unknown, settings, runs, tables)
+    spec = ProblemSpec(
+        text="pack", table_refs=[TableRef(name="items", hash=summary.hash, summary=summary)]
+    )
+    run = create_run(spec, settings, runs, tables)
+    assert run.problem_spec.table_refs[0].summary is None
+    seen = []
+
+    class RecordingProvider:
+        def get(self) -> "RecordingProvider":
+            return self
+
+        def generate_ir(self, spec: ProblemSpec) -> dict:
+            seen.append(spec)
+            return StubProvider().generate_ir(spec)
+
+    generate_ir(run.id, settings, runs, providers=RecordingProvider(), tables=tables)
+    assert seen[0].table_refs[0].summary.row_count == 25
+    assert len(seen[0].table_refs[0].summary.sample) == 2
+    tables.close()
+    runs.close()
+
+
+def test_table_upload_api(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("OPTIFORGE_DATABASE_URL", f"sqlite:///{tmp_path / 'optiforge.db'}")
+    monkeypatch.setenv("OPTIFORGE_PROVIDER", "stub")
+    monkeypatch.setenv("OPTIFORGE_TABLE_UPLOAD_MAX_BYTES", "1000")
+    from optiforge.core.config import get_settings
+
+    get_settings.cache_clear()
+    from optiforge.api import main
+
+    main.get_store.cache_clear()
+    main.get_table_store.cache_clear()
+    main.get_solution_cache.cache_clear()
+    main.get_metrics.cache_clear()
+    main.get_job_queue.cache_clear()
+    main.get_sweep_runner.cache_clear()
+    main.get_solver_pool.cache_clear()
+    with TestClient(main.app) as client:
+        response = client.post("/api/tables", content=CSV.encode("utf-8"))
+        assert response.status_code == 200
+        table_hash = response.json()["hash"]
+        assert client.get(f"/api/tables/{table_hash}").json()["row_count"] == 25
+        page = client.get(f"/api/tables/{table_hash}/rows", params={"limit": 10}).json()
+        assert len(page["rows"]) == 10
+        assert page["next_offset"] == 10
+        assert client.get(f"/api/tables/{'0' * 64}").status_code == 404
+        assert client.post("/api/tables", content=b"a,b\n1\n").status_code == 400
+        response = client.post("/api/tables", content=b"a,b\nnan,1\ninf,2\n")
+        assert response.status_code == 200
+        rows = client.get(f"/api/tables/{response.json()['hash']}/rows").json()["rows"]
+        assert rows == [["nan", 1], ["inf", 2]]
+        assert client.post("/api/tables", content=b"x" * 2000).status_code == 413
+        spec = {"text": "pack", "table_refs": [{"name": "items", "hash": table_hash}]}
+        assert client.post("/api/runs", json=spec).status_code == 200
+        spec["table_refs"][0]["hash"] = "a" * 64
+        assert client.post("/api/runs", json=spec).status_code == 400
+    get_settings.cache_clear()
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from optiforge.core.columnar import ir_to_columnar, structure_hash
+from optiforge.core.config import Settings
+from optiforge.core.models import ProblemSpec
+from optiforge.core.service import solve_run
+from optiforge.core.storage import RunStore
+from optiforge.core.validation import validate_ir_json
+
+
+def _load_example_ir() -> dict:
+    path = Path(__file__).resolve().parents[1] / "examples" / "ir.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _solved_run(store: RunStore, settings: Settings, data: dict, warm_start=None):
+    run_id = store.create_run(ProblemSpec(text="warm start"), "stub", "stub-model")
+    store.update_run_ir(run_id, validate_ir_json(data), "stub", "stub-model")
+    run = solve_run(run_id, settings, store, warm_start=warm_start)
+    solved = [event for event in run.audit.events if event.action == "solved"]
+    return run, solved[-1].details.get("warm_start")
+
+
+def test_structure_hash_ignores_rhs_and_bounds() -> None:
+    data = _load_example_ir()
+    base = structure_hash(ir_to_columnar(validate_ir_json(data)))
+    data["constraints"][0]["rhs"] = 7
+    data["variables"][0]["upper_bound"] = 3
+    assert structure_hash(ir_to_columnar(validate_ir_json(data))) == base
+    data["variables"][1]["name"] = "z"
+    data["constraints"][0]["terms"][1]["var"] = "z"
+    data["objective"]["terms"][1]["var"] = "z"
+    assert structure_hash(ir_to_columnar(validate_ir_json(data))) != base
+
+
+def test_warm_start_hint_is_complete_partial_or_rejected(tmp_path: Path) -> None:
+    settings = Settings(solver_max_seconds=5)
+    store = RunStore(f"sqlite:///{tmp_path / 'optiforge.db'}")
+    _, details = _solved_run(store, settings, _load_example_ir(), warm_start="auto")
+    assert details == {
+        "mode": "auto",
+        "source_run_id": None,
+        "hint": "rejected",
+        "hinted_variables": 0,
+    }
+    first, _ = _solved_run(store, settings, _load_example_ir())
+    data = _load_example_ir()
+    data["constraints"][0]["rhs"] = 6
+    second, details = _solved_run(store, settings, data, warm_start="auto")
+    assert details["source_run_id"] == first.id
+    assert details["hint"] == "complete"
+    assert second.solution.objective_value == 12
+    data["variables"].append({"name": "z", "type": "int", "lower_bound": 0, "upper_bound": 1})
+    _, details = _solved_run(store, settings, data, warm_start=second.id)
+    assert details["mode"] == "run"
+    assert details["hint"] == "partial"
+    assert details["hinted_variables"] == 2